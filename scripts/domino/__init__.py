@@ -3,8 +3,7 @@ import sys
 import os
 
 # domino
-from .lib import log, menu
-from .lib.rigging import quick_menu
+from .lib import log
 
 __version__ = [1, 0, 0]
 __version_str__ = ". ".join([str(x) for x in __version__])
@@ -52,6 +51,10 @@ def install():
 
 
 def menu_install():
+    # menu modules need maya ui. domino itself imports without it (the stand-in of scripts/tests)
+    from .lib import menu
+    from .lib.rigging import quick_menu
+
     menu.create()
 
     # quick menu checkbox
@@ -88,6 +91,12 @@ selected = mc.ls(selection=True)
 if selected:
     assembler.create_rig(guide=selected[0])"""
 
+cb_update_from_selection_guide = """import domino.assembler as assembler
+from maya import cmds as mc
+selected = mc.ls(selection=True)
+if selected:
+    assembler.create_rig(guide=selected[0], incremental=True)"""
+
 cb_build_from_selection_rig = """import domino.assembler as assembler
 from maya import cmds as mc
 selected = mc.ls(selection=True)
@@ -111,12 +120,15 @@ assembler_io.load(guide=True, rig=False)"""
 
 
 def manager_menu():
+    from .lib import menu
+
     commands = (
         ("Manager", cb_manager, ""),
         ("Settings", cb_settings, ""),
         ("Extract ctl shapes", cb_extract_ctl_shapes, ""),
         ("---", None),
         ("Build from selection(Guide)", cb_build_from_selection_guide, ""),
+        ("Update from selection(Guide)", cb_update_from_selection_guide, ""),
         ("Build from selection(Rig)", cb_build_from_selection_rig, ""),
         ("Extract Guide from Rig", cb_extract_guide_from_rig, ""),
         ("---", None),
@@ -133,12 +145,14 @@ domino.assembler.io.load(r"{path}", True, False)"""
 
 
 def templates_menu(parent_menu_id):
-    template_dir = os.getenv(DOMINO_RIG_TEMPLATE_DIR, None)
-    template_list = os.listdir(template_dir)
-    template_path_list = [os.path.normpath(os.path.join(template_dir, x)) for x in template_list]
+    from .lib import menu
+
+    from .assembler import catalog
+
+    template_catalog = catalog.get_template_catalog(os.getenv(DOMINO_RIG_TEMPLATE_DIR, None))
     commands = []
-    for i, name in enumerate(template_list):
-        commands.append((name.split(".")[0], cb_load_template.format(path=template_path_list[i])))
+    for name in template_catalog.names():
+        commands.append((name.split(".")[0], cb_load_template.format(path=template_catalog.path(name))))
     menu.add("Templates", commands, parent_menu_id)
 
 
@@ -147,6 +161,8 @@ assembler_ui.open_pose_manager()"""
 
 
 def rigging_menu():
+    from .lib import menu
+
     command = (
         ("Pose Manager", cb_pose_manager_ui, ""),
     )
@@ -158,6 +174,8 @@ domino.copycat.ui.open_ui()"""
 
 
 def motion_capture_menu():
+    from .lib import menu
+
     commands = (
         ("CopyCat UI", cb_copycat_ui, ""),
     )
@@ -172,6 +190,8 @@ domino.menu_install()"""
 
 
 def utils_menu():
+    from .lib import menu
+
     commands = (
         ("Reload Domino", cb_reload_domino, ""),
         ("ReInstall Menu", cb_reinstall_menu, ""),
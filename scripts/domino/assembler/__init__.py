@@ -6,15 +6,20 @@ from maya.api import OpenMaya as om2
 import json
 import uuid
 import os
+import sys
+import time
+import hashlib
 import inspect
 from importlib import import_module, reload
 from importlib.util import spec_from_loader, module_from_spec
 from importlib.machinery import SourceFileLoader
 
 # domino
-from ..lib import attribute, hierarchy, color, icon, vector, matrix, log, utils
+from ..lib import attribute, hierarchy, color, icon, vector, matrix, log, utils, modifier
+from ..lib import name as naming
 from ..lib.rigging import joint, controller, nurbs, container, callback
-from ..lib.animation import fcurve
+from ..lib.animation import fcurve, pose, mirror
+from . import profiler, rebuild
 from domino import DOMINO_CUSTOM_COMPONENT, DOMINO_DEFAULT_COMPONENT, DOMINO_CUSTOM_STEP_DIR
 
 
@@ -62,6 +67,8 @@ def common_component_preset():
 
 
 class Component:
+    # add_child count. cached roots and identifier indices older than this are rebuilt
+    _tree_version = 0
 
     def __eq__(self, other):
         return tuple(other) == self.identifier
@@ -73,6 +80,11 @@ class Component:
         self.data = {k: data[k] for k in data.keys() if not k.startswith("_")} if data else common_component_preset()
         self.children = []
         self.parent = None
+        self._root = None
+        self._root_version = -1
+        # {identifier string: component}. the root of the tree holds it
+        self._index = None
+        self._index_version = -1
 
     @property
     def identifier(self):
@@ -87,8 +99,44 @@ class Component:
     def add_child(self, data):
         self.children.append(data if isinstance(data, Component) else Component(data))
         self.children[-1].parent = self
+        Component._tree_version += 1
+
+    def get_root(self):
+        if self._root_version != Component._tree_version:
+            root = self
+            while root.parent:
+                root = root.parent
+            self._root = root
+            self._root_version = Component._tree_version
+        return self._root
+
+    def get_component_index(self, rebuild=False):
+        """{identifier string: component} of the whole tree. ex) {"arm_L_0": Component}"""
+        root = self.get_root()
+        if rebuild or root._index_version != Component._tree_version:
+            index = {}
+
+            def _recursive(component):
+                index.setdefault("_".join([str(x) for x in component.identifier if x is not None]), component)
+                for child in component.children:
+                    _recursive(child)
+
+            _recursive(root)
+            root._index = index
+            root._index_version = Component._tree_version
+        return root._index
+
+    def find_component(self, identifier):
+        component = self.get_component_index().get(identifier)
+        # identifiers follow the data. the index is rebuilt when a name, side or index was edited
+        if component is None or "_".join([str(x) for x in component.identifier if x is not None]) != identifier:
+            component = self.get_component_index(rebuild=True).get(identifier)
+        return component
 
     def get_parent(self, generations=1):
+        if generations < 0:
+            root = self.get_root()
+            return None if root.identifier == self.identifier else root
         component = self
         while component.parent:
             if generations == 0:
@@ -101,80 +149,30 @@ class Component:
 
     def pull_data_from_node(self, node):
         def _nurbs_curve(__attr):
+            # one query for every element. [destination plug, source curve, ...]
+            connections = mc.listConnections(node + "." + __attr, destination=False, source=True,
+                                             connections=True) or []
             curve_data = {}
-            if "multi" in attributes[attr]:
-                for child_attr in mc.listAttr(node + "." + attr, multi=True) or []:
-                    selection_list = om2.MSelectionList()
-                    selection_list.add(node + "." + child_attr)
-                    plug = selection_list.getPlug(0)
-
-                    crv = mc.listConnections(node + "." + child_attr, destination=False, source=True)
-                    if crv:
-                        curve_data[str(plug.logicalIndex())] = nurbs.data(crv[0])
-            else:
-                crv = mc.listConnections(node + "." + __attr, destination=False, source=True)
-                if crv:
-                    curve_data["0"] = nurbs.data(crv[0])
+            for plug, crv in zip(connections[::2], connections[1::2]):
+                index = attribute.get_index(plug.split(".", 1)[1])
+                curve_data[str(index or 0)] = nurbs.data(crv)
             return curve_data
 
-        def _enum(__attr):
-            return mc.getAttr(node + "." + __attr, asString=True)
-
-        def _string(__attr):
-            if __attr == "parent_anchor" and mc.nodeType(node) == "dagContainer":
-                parent = hierarchy.get_parent(node)
-                plug = None
-                while not plug and parent:
-                    plug = mc.listConnections(parent + ".worldMatrix[0]",
-                                              source=False,
-                                              destination=True,
-                                              plugs=True,
-                                              type="dagContainer")
-                    parent = hierarchy.get_parent(parent)
-                if plug:
-                    selection_list = om2.MSelectionList()
-                    selection_list.add(plug[0])
-                    plug = selection_list.getPlug(0)
-                    return str(plug.logicalIndex())
-            return mc.getAttr(node + "." + __attr) or ""
+        def _parent_anchor():
+            parent = hierarchy.get_parent(node)
+            plug = None
+            while not plug and parent:
+                plug = mc.listConnections(parent + ".worldMatrix[0]",
+                                          source=False,
+                                          destination=True,
+                                          plugs=True,
+                                          type="dagContainer")
+                parent = hierarchy.get_parent(parent)
+            return str(attribute.get_index(plug[0])) if plug else None
 
         def _anim(__attr):
-            anim_curve = mc.listConnections(node + "." + __attr, source=True, destination=False, type="animCurve")
-            return fcurve.get_fcurve(anim_curve[0])
-
-        def pull():
-            def _get_attr(_attr):
-                if attributes[attr]["type"] == "string":
-                    return _string(_attr)
-                elif attributes[attr]["type"] == "enum":
-                    return _enum(_attr)
-                elif attributes[attr]["type"] == "float3":
-                    return mc.getAttr(node + "." + _attr)[0]
-                else:
-                    return mc.getAttr(node + "." + _attr)
-
-            if attr in nurbs_curve:
-                data = _nurbs_curve(attr)
-            elif "multi" in attributes[attr]:
-                data = []
-                for i, child_attr in enumerate(mc.listAttr(node + "." + attr, multi=True) or []):
-                    data.append(_get_attr(child_attr))
-            elif attr in anim:
-                data = _anim(attr)
-            elif attr in _json:
-                data = json.loads(_get_attr(attr))
-            else:
-                data = _get_attr(attr)
-
-            # self.data update
-            if attr in anim:
-                anim[attr] = data
-            elif attr in nurbs_curve:
-                nurbs_curve[attr] = data
-            elif attr in _json:
-                _json[attr] = data
-            else:
-                value[attr] = data
+            source = fn_node.findPlug(__attr, False).source()
+            return fcurve.get_fcurve(om2.MFnDependencyNode(source.node()).name())
 
         component_name = mc.getAttr(node + ".component")
         component_mod = import_component_module(component_name)
@@ -184,9 +182,22 @@ class Component:
         anim = component_preset["anim"]
         nurbs_curve = component_preset["nurbs_curve"]
         _json = component_preset["json"]
-        for attr in attributes.keys():
-            if mc.attributeQuery(attr, node=node, exists=True):
-                pull()
+
+        fn_node = om2.MFnDependencyNode(modifier.get_node(node))
+        plug_attributes = {k: v for k, v in attributes.items() if k not in nurbs_curve and k not in anim}
+        for attr, data in attribute.read_attrs(node, plug_attributes).items():
+            if attr == "parent_anchor" and fn_node.typeName == "dagContainer":
+                data = _parent_anchor() or data
+            if attr in _json:
+                _json[attr] = json.loads(data)
+            else:
+                value[attr] = data
+        for attr in nurbs_curve:
+            if attr in attributes and fn_node.hasAttribute(attr):
+                nurbs_curve[attr] = _nurbs_curve(attr)
+        for attr in anim:
+            if attr in attributes and fn_node.hasAttribute(attr):
+                anim[attr] = _anim(attr)
         self.data = component_preset
 
     def push_data_to_node(self, node):
@@ -216,57 +227,31 @@ class Component:
                     mc.setAttr(crv + ".overrideEnabled", 1)
                     mc.setAttr(crv + ".overrideDisplayType", 2)
 
-        def _enum(__attr, __value):
-            enum_name = mc.attributeQuery(__attr, node=node, listEnum=True)[0]
-            mc.setAttr(node + "." + __attr, enum_name.split(":").index(str(__value)))
-
-        def _matrix(__attr, __value):
-            inputs = mc.listConnections(node + "." + __attr, source=True, destination=False)
-            if inputs:
-                mc.xform(inputs[0], matrix=__value, worldSpace=True)
-            else:
-                mc.setAttr(node + "." + __attr, __value, type="matrix")
-
-        def _string(__attr, __value):
-            mc.setAttr(node + "." + __attr, __value, type="string")
-
         def _anim(__attr, __value):
             fcurve.set_fcurve(__value, driven=[node + "." + __attr])
 
-        def push():
-            def _set_attr(_attr, _value):
-                if attributes[attr]["type"] == "matrix":
-                    _matrix(_attr, _value)
-                elif attributes[attr]["type"] == "string":
-                    _string(_attr, _value)
-                elif attributes[attr]["type"] == "enum":
-                    _enum(_attr, _value)
-                elif isinstance(_value, (tuple, list)):
-                    mc.setAttr(node + "." + _attr, *_value)
-                else:
-                    mc.setAttr(node + "." + _attr, _value)
-
-            if attr in nurbs_curve:
-                _nurbs_curve(attr, nurbs_curve[attr])
-            elif "multi" in attributes[attr]:
-                if attr in value:
-                    for i, v in enumerate(value[attr]):
-                        _set_attr(attr + "[{}]".format(i), v)
-            elif attr in value:
-                _set_attr(attr, value[attr])
-            elif attr in anim:
-                _anim(attr, anim[attr])
-            elif attr in _json:
-                _set_attr(attr, json.dumps(_json[attr], ensure_ascii=False))
-
         attributes = self.data["attributes"]
         value = self.data["value"]
         anim = self.data["anim"]
         nurbs_curve = self.data["nurbs_curve"]
         _json = self.data["json"]
+
+        # plain values go in with the attributes. curves and fcurves are nodes, they are made after
+        values = {}
+        for attr in attributes.keys():
+            if attr in nurbs_curve:
+                continue
+            elif attr in value:
+                values[attr] = value[attr]
+            elif "multi" not in attributes[attr] and attr not in anim and attr in _json:
+                values[attr] = json.dumps(_json[attr], ensure_ascii=False)
+        attribute.get_schema(attributes).add(node, values)
+
         for attr in attributes.keys():
-            attribute.add_attr(node, longName=attr, **attributes[attr])
-            push()
+            if attr in nurbs_curve:
+                _nurbs_curve(attr, nurbs_curve[attr])
+            elif attr not in value and "multi" not in attributes[attr] and attr in anim:
+                _anim(attr, anim[attr])
 
 
 class Guide:
@@ -277,11 +262,22 @@ class Guide:
             self.component.pull_data_from_node(root)
         self.root = root
         self.guide_recipe = recipe
+        # {(node, attr): next element index}
+        self._multi_counts = {}
 
     @property
     def identifier(self):
         return "_".join([str(x) for x in self.component.identifier if x is not None])
 
+    def next_multi_index(self, node, attr):
+        """next element of a multi attribute this guide connects to. counted once per node"""
+        key = (node, attr)
+        if key not in self._multi_counts:
+            self._multi_counts[key] = len(mc.listConnections(node + "." + attr, source=True, destination=False) or [])
+        index = self._multi_counts[key]
+        self._multi_counts[key] += 1
+        return index
+
     def create(self):
         def _root(_parent, _m, name="guide"):
             ctr = mc.container(name=self.identifier + "_" + name, type="dagContainer")
@@ -300,7 +296,7 @@ class Guide:
             guide_container = _parent
             if mc.nodeType(guide_container) != "dagContainer":
                 guide_container = mc.container(query=True, findContainer=_parent)
-            index = len(mc.listConnections(guide_container + ".anchors", source=True, destination=False))
+            index = self.next_multi_index(guide_container, "anchors")
             _pos = mc.rename(_pos, self.identifier + "_" + _extension)
             mc.setAttr(_pos + ".displayHandle", True)
             attribute.add_attr(_pos, longName="is_guide", type="bool", keyable=False)
@@ -390,7 +386,7 @@ class Guide:
             attribute.add_attr(display_curve, longName="is_guide", type="bool", keyable=False)
             attribute.add_attr(display_curve, longName="_extension", type="string")
             mc.setAttr(display_curve + "._extension", _extension, type="string")
-            index = len(mc.listAttr(_parent + "._display_curve", multi=True) or [])
+            index = self.next_multi_index(_parent, "_display_curve")
             mc.connectAttr(display_curve + ".message", _parent + "._display_curve[{0}]".format(index))
 
         attributes = self.component.data["attributes"]
@@ -557,6 +553,38 @@ class Guide:
         return index
 
 
+# {"index | identifier,...": [(index, identifier), ...]}
+_ctl_references = {}
+
+
+def parse_ctl_references(data):
+    """space switch array string to [(ctl index, identifier), ...]"""
+    if data not in _ctl_references:
+        _ctl_references[data] = [(int(index), identifier)
+                                 for index, identifier in [x.split(" | ") for x in data.split(",")]]
+    return _ctl_references[data]
+
+
+def find_name_collisions(rig):
+    """{name: [identifier, ...]} of components that generate the same names. see Rig.generate_name.
+    every component of the tree is checked, restored ones too. the names are formatted with a probe description,
+    so it runs before any node is created. `name` is the name of the component without description"""
+    # {probe name: [(identifier, name)]}
+    names = {}
+
+    def _recursive(_rig):
+        probes = {}
+        for rule in ["ctl", "jnt"]:
+            probes.setdefault(_rig.format_name("probe", "_probe", rule), _rig.format_name("", "", rule))
+        for probe, name in probes.items():
+            names.setdefault(probe, []).append((_rig.identifier, name))
+        for child in _rig.children:
+            _recursive(child)
+
+    _recursive(rig)
+    return {v[0][1]: sorted(x for x, _ in v) for v in names.values() if len(v) > 1}
+
+
 class Rig:
 
     def __init__(self, component):
@@ -565,6 +593,10 @@ class Rig:
         self.host = None
         self.children = []
         self.parent = None
+        # {attr: [MObject, ...]} nodes connected to the multi message attributes of the root
+        self._multi_nodes = {}
+        # {(description, extension, rule, negate): name}
+        self._names = {}
 
     @property
     def identifier(self):
@@ -578,84 +610,33 @@ class Rig:
         return color.solve(self.component.data["value"], self.component.get_parent(-1).data["value"], color_type)
 
     def generate_name(self, description="", extension="", rule="ctl" or "jnt", negate=False):
+        key = (description, extension, rule, negate)
+        if key not in self._names:
+            self._names[key] = self.format_name(description, extension, rule, negate)
+        return self._names[key]
+
+    def format_name(self, description="", extension="", rule="ctl" or "jnt", negate=False):
+        """generate_name without the memo"""
         component_data = self.component.data["value"]
         assembly_component = self.component.get_parent(generations=-1)
         if assembly_component is None:
             assembly_component = self.component
-        assembly_data = assembly_component.data["value"]
-
-        name_rule = assembly_data["{0}_name_rule".format(rule)]
-        padding = assembly_data["{0}_index_padding".format(rule)]
-        description_letter_case = assembly_data["{0}_description_letter_case".format(rule)]
-        side_set = [assembly_data["{0}_center_name".format(rule)],
-                    assembly_data["{0}_left_name".format(rule)],
-                    assembly_data["{0}_right_name".format(rule)]]
-        if not extension:
-            extension = assembly_data["{0}_name_ext".format(rule)]
-
-        if description_letter_case == "lower":
-            description = description.lower()
-        elif description_letter_case == "upper":
-            description = description.upper()
-        elif description_letter_case == "capitalize":
-            description = description.capitalize()
-
-        index_filter = ["C", "L", "R"]
-        if None in self.component.identifier:
-            args = {
-                "name": component_data["name"],
-                "side": "",
-                "index": "",
-                "description": description,
-                "extension": extension
-            }
-        else:
-            side = component_data["side"]
-            if negate and component_data["side"] != "C":
-                side = "R" if component_data["side"] == "L" else "L"
-            args = {
-                "name": component_data["name"],
-                "side": side_set[index_filter.index(side)],
-                "index": str(component_data["index"]).zfill(int(padding)),
-                "description": description,
-                "extension": extension
-            }
-        for k in args.copy():
-            if k not in name_rule:
-                del args[k]
-        name = name_rule.format(**args)
-        name = "_".join([x for x in name.split("_") if x])
-        return name
+        formatter = naming.get_formatter(assembly_component.data["value"], rule)
+        side, index = (None, None) if None in self.component.identifier \
+            else (component_data["side"], component_data["index"])
+        return formatter.format(component_data["name"], side, index, description, extension, negate)
 
     def find_ctls(self, context, data):
-        data = [x.split(" | ") for x in data.split(",")]
         ctls = []
-        for index, identifier in data:
+        for index, identifier in parse_ctl_references(data):
             if identifier not in context:
                 log.Logger.warning(identifier + " don't exists")
                 continue
-            ctls.append(context[identifier]["ctls"][int(index)].fullPathName())
+            ctls.append(context[identifier]["ctls"][index].fullPathName())
         return ctls
 
     def find_component(self, identifier):
-        assembly_comp = self.component.get_parent(generations=-1)
-
-        target_comp = None
-
-        def _find(comp):
-            nonlocal target_comp
-
-            if target_comp is not None:
-                return
-
-            if "_".join([str(x) for x in comp.identifier if x is not None]) == identifier:
-                target_comp = comp
-
-            for child_comp in comp.children:
-                _find(child_comp)
-
-        _find(assembly_comp)
-        return target_comp
+        return self.component.find_component(identifier)
 
     def create_root(self, context):
         name = self.generate_name(description="", extension="_root", rule="ctl")
@@ -681,32 +662,8 @@ class Rig:
             attribute.add_attr(rig_grp, longName="assembly_node", type="message")
             attribute.add_attr(self.root, longName="rig_grp", type="message")
             mc.connectAttr(rig_grp + ".assembly_node", self.root + ".rig_grp")
-        elif parent_rig and None in parent_rig.component.identifier and None not in self.component.identifier:
-            ref = mc.listConnections(parent_rig.root + ".refs[0]", destination=False, source=True)[0]
-        elif parent_rig and None not in parent_rig.component.identifier and None not in self.component.identifier:
-            ref_anchor = int(value["parent_anchor"])
-            custom_ref_index = value["custom_ref_index"]
-
-            refs_element = mc.listAttr(parent_rig.root + ".refs", multi=True)
-            ref_anchors_element = mc.listAttr(parent_rig.root + ".ref_anchors", multi=True)
-
-            refs_index = None
-            ref_anchors_index = None
-            if -1 < custom_ref_index < len(refs_element):
-                refs_index = custom_ref_index
-            elif custom_ref_index >= len(refs_element):
-                refs_index = -1
-            elif custom_ref_index == -1:
-                if ref_anchor >= len(ref_anchors_element):
-                    ref_anchors_index = -1
-                else:
-                    ref_anchors_index = ref_anchor
-            if refs_index is not None:
-                attr = refs_element[refs_index]
-                ref = mc.listConnections(parent_rig.root + "." + attr, destination=False, source=True)[0]
-            if ref_anchors_index is not None:
-                attr = ref_anchors_element[ref_anchors_index]
-                ref = mc.listConnections(parent_rig.root + "." + attr, destination=False, source=True)[0]
+        else:
+            ref = context.references.resolve_ref(self)
 
         if ref:
             mc.connectAttr(parent_rig.root + ".__children", self.root + ".__parent")
@@ -720,12 +677,8 @@ class Rig:
         [mc.setAttr(self.root + "." + attr, lock=True) for attr in attrs + cb_attrs]
         [mc.setAttr(self.root + "." + attr, keyable=False) for attr in attrs + cb_attrs + ["v"]]
 
-        context[self.identifier] = {
-            "root": self.root,
-            "ctls": [],
-            "refs": [],
-            "jnts": []
-        }
+        self._multi_nodes = {"ctls": [], "refs": [], "ref_anchors": [], "jnts": []}
+        context.add_component(self.identifier, self.root)
         root_container = mc.container(query=True, findContainer=self.root)
         if not mc.container(root_container, query=True, publishAsRoot=True):
             mc.container(root_container, edit=True, publishAsRoot=(self.root, 1))
@@ -733,16 +686,51 @@ class Rig:
             mc.container(root_container, edit=True, publishAsParent=(self.root, name))
         return self.root
 
+    def get_ctl_shape(self, index):
+        """stored shape data of the `index` th ctl. None when the ctl keeps its default shape"""
+        return (self.component.data["nurbs_curve"]["ctl_shapes"] or {}).get(str(index))
+
+    def get_multi_nodes(self, attr):
+        """nodes connected to the `attr` multi of the root in element order.
+        queried once for a restored root, connect_multi keeps it in sync"""
+        if attr not in self._multi_nodes:
+            nodes = []
+            for element in mc.listAttr(self.root + "." + attr, multi=True) or []:
+                node = mc.listConnections(self.root + "." + element, source=True, destination=False)
+                nodes.append(modifier.get_node(node[0]) if node else None)
+            self._multi_nodes[attr] = nodes
+        return self._multi_nodes[attr]
+
+    def get_multi_count(self, attr):
+        return len(self.get_multi_nodes(attr))
+
+    def get_multi_node(self, attr, index):
+        return modifier.get_node_name(self.get_multi_nodes(attr)[index])
+
+    def connect_multi(self, node, attr):
+        nodes = self.get_multi_nodes(attr)
+        index = len(nodes)
+        modifier.connect_attr(node + ".message", self.root + ".{0}[{1}]".format(attr, index))
+        nodes.append(modifier.get_node(node))
+        return index
+
+    def get_ctl_count(self):
+        return self.get_multi_count("ctls")
+
     def finalize_ctl_setup(self, ctl):
-        index = len(mc.listAttr(self.root + ".ctls", multi=True) or [])
-        mc.connectAttr(ctl + ".message", self.root + ".ctls[{0}]".format(index))
-        if str(index) in self.component.data["nurbs_curve"]["ctl_shapes"]:
-            nurbs.build(self.component.data["nurbs_curve"]["ctl_shapes"][str(index)], replace=ctl)
+        index = self.connect_multi(ctl, "ctls")
+        curve_data = self.get_ctl_shape(index)
+        if curve_data:
+            nurbs.build(curve_data, replace=ctl)
             mc.connectAttr(ctl + ".message", self.root + ".ctl_shapes[{0}]".format(index), force=True)
             for s in mc.listRelatives(ctl, shapes=True, fullPath=True) or []:
                 mc.setAttr(s + ".isHistoricallyInteresting", 0)
 
     def create_host(self, context):
+        with modifier.batch(context.get("batch", False)):
+            return self._create_host(context)
+
+    def _create_host(self, context):
         name = self.generate_name(description="", extension="_host", rule="ctl")
         negate_name = self.generate_name(description="", extension="_host", rule="ctl", negate=True)
         parent_ctl = controller.get_parent(context[self.identifier]["ctls"][0])
@@ -750,13 +738,18 @@ class Rig:
         config = {"identifier": self.identifier, "mirror_ctl_name": negate_name}
         self.host = controller.add_ctl(self.root, name, om2.MMatrix(), parent_ctl, shape_args=shape_args, **config)
         self.finalize_ctl_setup(self.host)
-        mc.connectAttr(self.host + ".message", self.root + ".host")
+        modifier.connect_attr(self.host + ".message", self.root + ".host")
         context[self.identifier]["host"] = self.host
-        mc.setAttr(self.host + ".useOutlinerColor", True)
-        mc.setAttr(self.host + ".outlinerColor", 0.85, 0.85, 0.2)
+        modifier.set_attr(self.host, "useOutlinerColor", True)
+        modifier.set_attr(self.host, "outlinerColor", 0.85, 0.85, 0.2)
         return self.host
 
     def create_ctl(self, context, parent, name, m, parent_ctl, attrs, mirror_config, shape_args, cns=False, **config):
+        with modifier.batch(context.get("batch", False)):
+            return self._create_ctl(context, parent, name, m, parent_ctl, attrs, mirror_config, shape_args, cns,
+                                    **config)
+
+    def _create_ctl(self, context, parent, name, m, parent_ctl, attrs, mirror_config, shape_args, cns=False, **config):
         config.update(identifier=self.identifier)
         assembly_component = self.component.get_parent(generations=-1)
         if assembly_component is None:
@@ -790,6 +783,11 @@ class Rig:
         if "ro" not in shape_args:
             shape_args.update(ro=(0, 0, 0))
 
+        # ctls with a stored shape skip the default shape. finalize_ctl_setup builds the stored one
+        index = self.get_ctl_count()
+        ctl_shape_args = dict(shape_args, shape=None) if self.get_ctl_shape(index + 1 if cns else index) \
+            else shape_args
+
         # create
         cns_ctl = None
         if cns:
@@ -797,28 +795,30 @@ class Rig:
             cns_name = name.replace(assembly_component_data["ctl_name_ext"], "cns")
             cns_config.update(
                 mirror_ctl_name=config["mirror_ctl_name"].replace(assembly_component_data["ctl_name_ext"], "cns"))
+            cns_shape_args = dict(shape_args, shape=None) if self.get_ctl_shape(index) else shape_args
             cns_ctl = controller.add_ctl(parent, cns_name, m, parent_ctl, ("tx", "ty", "tz", "rx", "ry", "rz"),
-                                         mirror_config, shape_args=shape_args, **cns_config)
+                                         mirror_config, shape_args=cns_shape_args, **cns_config)
             parent_ctl = cns_ctl
 
-        ctl = controller.add_ctl(parent, name, m, parent_ctl, attrs, mirror_config, shape_args=shape_args, **config)
+        ctl = controller.add_ctl(parent, name, m, parent_ctl, attrs, mirror_config, shape_args=ctl_shape_args,
+                                 **config)
         npo, ctl = controller.add_npo(ctl, npo_name, offset_parent_matrix=True)
         if cns_ctl:
             cns_ctl = mc.parent(cns_ctl, npo)[0]
             ctl = mc.parent(ctl, cns_ctl)[0]
-            mc.addAttr(ctl, longName="cns_vis", attributeType="bool", keyable=True)
-            mc.setAttr(ctl + ".cns_vis", False)
+            attribute.add_attr(ctl, longName="cns_vis", type="bool", keyable=True)
+            modifier.set_attr(ctl, "cns_vis", False)
         ph = controller.add_placeholder(ctl, ph_name)
         npo_opm = matrix.get_matrix(npo, offset_parent_matrix=True)
         npo_scale_z = om2.MTransformationMatrix(npo_opm).scale(om2.MSpace.kObject)[2]
         if npo_scale_z < 0:
-            mc.setAttr(ph + ".sz", -1)
+            modifier.set_attr(ph, "sz", -1)
 
         # finalize setup
         if cns:
             self.finalize_ctl_setup(cns_ctl)
             for shape in mc.listRelatives(cns_ctl, shapes=True, fullPath=True):
-                mc.connectAttr(ctl + ".cns_vis", shape + ".v")
+                modifier.connect_attr(ctl + ".cns_vis", shape + ".v")
         self.finalize_ctl_setup(ctl)
 
         if cns:
@@ -831,29 +831,34 @@ class Rig:
         return ctl, ph
 
     def create_ref(self, context, name, anchor, m):
+        with modifier.batch(context.get("batch", False)):
+            return self._create_ref(context, name, anchor, m)
+
+    def _create_ref(self, context, name, anchor, m):
         value = self.component.data["value"]
         offset_rotate = (0, 0, 0)
         if None not in self.component.identifier:
             offset_rotate = (value["offset_orient_x"], value["offset_orient_y"], value["offset_orient_z"])
         ref = controller.add_placeholder(self.root, name, offset_rotate)
         if m:
-            mc.setAttr(ref + ".inheritsTransform", False)
-            mc.connectAttr(m + ".worldMatrix[0]", ref + ".offsetParentMatrix")
-        index = len(mc.listAttr(self.root + ".refs", multi=True) or [])
-        mc.connectAttr(ref + ".message", self.root + ".refs[{0}]".format(index))
+            modifier.set_attr(ref, "inheritsTransform", False)
+            modifier.connect_attr(m + ".worldMatrix[0]", ref + ".offsetParentMatrix")
+        self.connect_multi(ref, "refs")
         lock_hide_attrs = ["tx", "ty", "tz", "sx", "sy", "sz", "v"]
-        [mc.setAttr(ref + "." + attr, lock=True) for attr in lock_hide_attrs]
-        [mc.setAttr(ref + "." + attr, keyable=False) for attr in lock_hide_attrs]
+        modifier.set_flags(ref, lock_hide_attrs, lock=True, keyable=False)
         if anchor:
-            index = len(mc.listAttr(self.root + ".ref_anchors", multi=True) or [])
-            mc.connectAttr(ref + ".message", self.root + ".ref_anchors[{0}]".format(index))
+            self.connect_multi(ref, "ref_anchors")
         context[self.identifier]["refs"].append(ref)
         return ref
 
     def create_jnt(self, context, parent, name, description, ref, m, leaf=False, uni_scale=False):
+        with modifier.batch(context.get("batch", False)):
+            return self._create_jnt(context, parent, name, description, ref, m, leaf, uni_scale)
+
+    def _create_jnt(self, context, parent, name, description, ref, m, leaf=False, uni_scale=False):
         value = self.component.data["value"]
 
-        index = len(mc.listAttr(self.root + ".jnts", multi=True) or [])
+        index = self.get_multi_count("jnts")
         # joint name
         if "jnt_names" in value and value["jnt_names"]:
             jnt_name = value["jnt_names"].split(",")
@@ -863,73 +868,26 @@ class Rig:
 
         # get parent piece joint
         skeleton_grp = context["skeleton"]
-        parent_rig = self.parent
         parent_is_none = False
         if not parent:
             parent_is_none = True
             if None in self.component.identifier:
                 parent = skeleton_grp
-            elif parent_rig and (None in parent_rig.component.identifier):
-                parent = mc.listConnections(parent_rig.root + ".jnts[0]", destination=False, source=True)[0]
-
-        if not parent:
-            ref_anchor = int(value["parent_anchor"])
-            custom_ref_index = value["custom_ref_index"]
-            rig = self
-            attr = None
-            while not parent:
-                rig = rig.parent
-                # Infinite Loop Prevention
-                if rig is None:
-                    break
-                if not len(mc.listAttr(rig.root + ".jnts", multi=True) or []):
-                    ref_anchor = -1
-                    continue
-
-                refs_element = mc.listAttr(rig.root + ".refs", multi=True)
-                ref_anchors_element = mc.listAttr(rig.root + ".ref_anchors", multi=True)
-
-                refs_index = None
-                ref_anchors_index = None
-                if -1 < custom_ref_index < len(refs_element):
-                    refs_index = custom_ref_index
-                elif custom_ref_index >= len(refs_element):
-                    refs_index = -1
-                elif custom_ref_index == -1:
-                    if ref_anchor >= len(ref_anchors_element):
-                        ref_anchors_index = -1
-                    else:
-                        ref_anchors_index = ref_anchor
-                if ref_anchors_index is not None:
-                    _ref = mc.listConnections(rig.root + ".ref_anchors",
-                                              source=True,
-                                              destination=False)[ref_anchors_index]
-                    plugs = mc.listConnections(_ref + ".message", source=False, destination=True, plugs=True)
-                    for plug in plugs:
-                        if "refs" not in plug:
-                            continue
-                        attr_name, index_str = plug.split(".")[-1].split("[")
-                        if attr_name == "refs":
-                            refs_index = int(index_str.split("]")[0])
-                if refs_index is not None:
-                    if refs_index >= len(mc.listAttr(rig.root + ".jnts", multi=True) or []):
-                        refs_index = -1
-                    attr = mc.listAttr(rig.root + ".jnts", multi=True)[refs_index]
-                parent = mc.listConnections(rig.root + "." + attr, destination=False, source=True)[0]
+            else:
+                parent = context.references.resolve_jnt(self)
 
         # create joint
         jnt = joint.add_joint(parent, name, m)
         if parent_is_none:
-            mc.setAttr(jnt + ".useOutlinerColor", True)
-            mc.setAttr(jnt + ".outlinerColor", 0.9, 0.35, 0.55)
+            modifier.set_attr(jnt, "useOutlinerColor", True)
+            modifier.set_attr(jnt, "outlinerColor", 0.9, 0.35, 0.55)
         else:
-            mc.setAttr(jnt + ".useOutlinerColor", True)
-            mc.setAttr(jnt + ".outlinerColor", 1, 0.55, 0.75)
+            modifier.set_attr(jnt, "useOutlinerColor", True)
+            modifier.set_attr(jnt, "outlinerColor", 1, 0.55, 0.75)
         container.remove_node_from_asset(jnt)
         nonkeyable_attrs = ["tx", "ty", "tz", "rx", "ry", "rz", "ro", "sx", "sy", "sz"]
-        [mc.setAttr(jnt + "." + attr, channelBox=True) for attr in nonkeyable_attrs]
-        mc.setAttr(jnt + ".v", lock=True)
-        mc.setAttr(jnt + ".v", keyable=False)
+        modifier.set_flags(jnt, nonkeyable_attrs, channel_box=True)
+        modifier.set_flags(jnt, ["v"], lock=True, keyable=False)
 
         # connect ref to jnt
         if ref:
@@ -943,12 +901,11 @@ class Rig:
         joint.labeling(jnt, value["name"], value["side"], value["index"], description)
 
         # jnts connect
-        mc.connectAttr(jnt + ".message", self.root + ".jnts[{0}]".format(index))
+        self.connect_multi(jnt, "jnts")
         context[self.identifier]["jnts"].append(jnt)
 
         if leaf:
-            index = len(mc.listAttr(self.root + ".refs", multi=True) or [])
-            mc.connectAttr(jnt + ".message", self.root + ".refs[{0}".format(index))
+            self.connect_multi(jnt, "refs")
             context[self.identifier]["refs"].append(jnt)
         return jnt
 
@@ -1007,35 +964,236 @@ class CustomStep:
         ...
 
 
+class BuildContext(dict):
+    """build state shared by components and custom steps. a dict.
+
+    component entries {"root", "ctls", "refs", "jnts", "host", ...} are indexed by identifier when they are set,
+    so finalize reads them without testing every value of the context.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super(BuildContext, self).__init__()
+        # {identifier: component entry}
+        self.components = {}
+        self.references = ReferenceTable()
+        self.update(*args, **kwargs)
+
+    @staticmethod
+    def is_component_entry(value):
+        return isinstance(value, dict) and "root" in value and "ctls" in value
+
+    def __setitem__(self, key, value):
+        super(BuildContext, self).__setitem__(key, value)
+        if self.is_component_entry(value):
+            self.components[key] = value
+        else:
+            self.components.pop(key, None)
+
+    def __delitem__(self, key):
+        super(BuildContext, self).__delitem__(key)
+        self.components.pop(key, None)
+
+    def update(self, *args, **kwargs):
+        for key, value in dict(*args, **kwargs).items():
+            self[key] = value
+
+    def setdefault(self, key, default=None):
+        if key not in self:
+            self[key] = default
+        return self[key]
+
+    def pop(self, key, *default):
+        self.components.pop(key, None)
+        return super(BuildContext, self).pop(key, *default)
+
+    def clear(self):
+        super(BuildContext, self).clear()
+        self.components.clear()
+
+    def add_component(self, identifier, root):
+        self[identifier] = {"root": root, "ctls": [], "refs": [], "jnts": []}
+        return self[identifier]
+
+    def entries(self, identifiers=None):
+        if identifiers is None:
+            return list(self.components.values())
+        return [self.components[x] for x in identifiers if x in self.components]
+
+    def roots(self, identifiers=None):
+        return [x["root"] for x in self.entries(identifiers)]
+
+    def ctls(self, identifiers=None):
+        return [ctl for x in self.entries(identifiers) for ctl in x["ctls"]]
+
+    def refs(self, identifiers=None):
+        return [ref for x in self.entries(identifiers) for ref in x["refs"]]
+
+    def jnts(self, identifiers=None):
+        return [jnt for x in self.entries(identifiers) for jnt in x["jnts"]]
+
+    def hosts(self, identifiers=None):
+        return [x["host"] for x in self.entries(identifiers) if "host" in x]
+
+
+class ReferenceTable:
+    """parent ref(create_root) and parent joint(create_jnt) of each component.
+
+    resolved once per component from parent_anchor, custom_ref_index and what the parent rigs registered.
+    custom steps read it from context.references. ex) context.references.to_dict()
+    """
+
+    def __init__(self):
+        # {identifier: {"ref": {"identifier", "attr", "index", "node"}, "jnt": {...}}}
+        self.entries = {}
+        # {(identifier, "ref" or "jnt"): MObject}
+        self._nodes = {}
+
+    @staticmethod
+    def select(refs_count, ref_anchors_count, parent_anchor, custom_ref_index):
+        """("refs" or "ref_anchors", index) of the parent rig. (None, None) when nothing is selected"""
+        if -1 < custom_ref_index < refs_count:
+            return "refs", custom_ref_index
+        if custom_ref_index >= refs_count:
+            return "refs", refs_count - 1
+        if custom_ref_index == -1:
+            if parent_anchor >= ref_anchors_count:
+                return "ref_anchors", ref_anchors_count - 1
+            return "ref_anchors", parent_anchor
+        return None, None
+
+    def _add(self, rig, key, source_rig, attr, index):
+        obj = source_rig.get_multi_nodes(attr)[index]
+        self._nodes[(rig.identifier, key)] = obj
+        self.entries.setdefault(rig.identifier, {})[key] = {"identifier": source_rig.identifier,
+                                                           "attr": attr,
+                                                           "index": index,
+                                                           "node": modifier.get_node_name(obj)}
+        return modifier.get_node_name(obj)
+
+    def _get(self, rig, key):
+        if key not in self.entries.get(rig.identifier, {}):
+            return False
+        obj = self._nodes.get((rig.identifier, key))
+        return None if obj is None else modifier.get_node_name(obj)
+
+    def resolve_ref(self, rig):
+        """ref node the root of `rig` follows. None for the assembly and its missing parents"""
+        node = self._get(rig, "ref")
+        if node is not False:
+            return node
+        parent_rig = rig.parent
+        if None in rig.component.identifier or parent_rig is None:
+            self.entries.setdefault(rig.identifier, {})["ref"] = None
+            return None
+        if None in parent_rig.component.identifier:
+            return self._add(rig, "ref", parent_rig, "refs", 0)
+
+        value = rig.component.data["value"]
+        attr, index = self.select(parent_rig.get_multi_count("refs"),
+                                  parent_rig.get_multi_count("ref_anchors"),
+                                  int(value["parent_anchor"]),
+                                  value["custom_ref_index"])
+        if attr is None:
+            self.entries.setdefault(rig.identifier, {})["ref"] = None
+            return None
+        return self._add(rig, "ref", parent_rig, attr, index)
+
+    def resolve_jnt(self, rig):
+        """parent joint of the joints `rig` creates without a parent. the nearest parent rig having joints"""
+        node = self._get(rig, "jnt")
+        if node is not False:
+            return node
+        parent_rig = rig.parent
+        if parent_rig is not None and None in parent_rig.component.identifier:
+            return self._add(rig, "jnt", parent_rig, "jnts", 0)
+
+        value = rig.component.data["value"]
+        parent_anchor = int(value["parent_anchor"])
+        custom_ref_index = value["custom_ref_index"]
+        while parent_rig is not None:
+            jnts_count = parent_rig.get_multi_count("jnts")
+            if not jnts_count:
+                parent_anchor = -1
+                parent_rig = parent_rig.parent
+                continue
+            attr, index = self.select(parent_rig.get_multi_count("refs"),
+                                      parent_rig.get_multi_count("ref_anchors"),
+                                      parent_anchor,
+                                      custom_ref_index)
+            if attr == "ref_anchors":
+                # refs index of the anchor. an anchor is connected to refs too
+                anchor = parent_rig.get_multi_nodes("ref_anchors")[index]
+                refs = parent_rig.get_multi_nodes("refs")
+                index = refs.index(anchor) if anchor in refs else None
+            if index is None:
+                break
+            if index >= jnts_count or index < 0:
+                index = jnts_count - 1
+            return self._add(rig, "jnt", parent_rig, "jnts", index)
+        self.entries.setdefault(rig.identifier, {})["jnt"] = None
+        return None
+
+    def ref(self, identifier):
+        """resolved parent ref node of the component. None when it is not resolved or has no parent ref"""
+        obj = self._nodes.get((identifier, "ref"))
+        return None if obj is None else modifier.get_node_name(obj)
+
+    def jnt(self, identifier):
+        """resolved parent joint of the component. None when it is not resolved or has no parent joint"""
+        obj = self._nodes.get((identifier, "jnt"))
+        return None if obj is None else modifier.get_node_name(obj)
+
+    def to_dict(self):
+        return {k: dict(v) for k, v in self.entries.items()}
+
+    def write(self, file_path):
+        log.Logger.info("Save Reference Table : `{0}`".format(file_path))
+        with open(file_path, "w", encoding="UTF-8") as f:
+            json.dump(self.to_dict(), f, indent=2, ensure_ascii=False)
+        return file_path
+
+
 def get_rig_hierarchy(node):
-    def _recursive(_node, _data):
-        data[_node] = {}
-        for child in mc.listConnections(_node + ".__children", source=False, destination=True, type="transform") or []:
-            _data[_node][child] = {}
-            _recursive(child, _data[_node])
-
-    data = {}
-    _recursive(node, data)
+    """{assembly node: {child component root: {...}}}. follows the `__children` message connections"""
+
+    def _recursive(obj, _data):
+        plug = om2.MFnDependencyNode(obj).findPlug("__children", False)
+        for child in [x.node() for x in plug.destinations() if x.node().hasFn(om2.MFn.kTransform)]:
+            child_data = _data[om2.MDagPath.getAPathTo(child).partialPathName()] = {}
+            _recursive(child, child_data)
+
+    data = {node: {}}
+    _recursive(modifier.get_node(node), data[node])
     return data
 
 
 def get_guide_hierarchy(node, node_type="dagContainer", full_path=False):
-    def _recursive(_node, _data, parent):
-        __data = _data
-        if mc.nodeType(_node) == node_type and _node != parent:
-            if parent not in _data:
-                _data[parent] = {}
-            _data[parent].update({_node: {}})
-            __data = _data[parent]
-        children = mc.listRelatives(_node, children=True, fullPath=full_path) or []
-        for child in children:
-            _recursive(child, __data, _node if mc.nodeType(_node) == node_type else parent)
-
-    node = mc.ls(node, long=full_path)[0]
+    """{guide root: {child container: {...}}}. containers are nested under the nearest container above them"""
+    root = om2.MDagPath.getAPathTo(modifier.get_node(node))
+    # only containers are visited. display curves, locators and shapes are walked through by the iterator
+    filter_type = om2.MFn.kDagContainer if node_type == "dagContainer" else om2.MFn.kTransform
+    it = om2.MItDag(om2.MItDag.kDepthFirst, filter_type)
+    it.reset(root, om2.MItDag.kDepthFirst, filter_type)
+
+    # {full path: children dict}
+    found = {}
     hierarchy_data = {}
-    if mc.nodeType(node) == node_type:
-        hierarchy_data[node] = {}
-    _recursive(node, hierarchy_data, node if mc.nodeType(node) == node_type else None)
+    root_path = root.fullPathName()
+    while not it.isDone():
+        if om2.MFnDependencyNode(it.currentItem()).typeName != node_type:
+            it.next()
+            continue
+        path = it.fullPathName()
+        key = path if full_path else it.partialPathName()
+        parent_path = path
+        parent_data = None
+        while parent_path != root_path and parent_data is None:
+            parent_path = parent_path.rsplit("|", 1)[0]
+            parent_data = found.get(parent_path)
+        if parent_data is None:
+            parent_data = hierarchy_data if path == root_path else hierarchy_data.setdefault(None, {})
+        found[path] = parent_data[key] = {}
+        it.next()
 
     if mc.getAttr(list(hierarchy_data.keys())[0] + ".component") != "assembly":
         hierarchy_data = {hierarchy.get_parent(node, generations=-1): hierarchy_data}
@@ -1081,15 +1239,31 @@ def convert_component_to_data(component):
     return data
 
 
-def import_component_module(name, ui=False):
+# {(name, ui): (module, mtime)}
+_component_modules = {}
+
+
+def get_module_mtime(module):
+    file_path = getattr(module, "__file__", None)
+    return os.stat(file_path).st_mtime_ns if file_path and os.path.exists(file_path) else None
+
+
+def find_component_module(name, ui=False):
+    def _import(_module_name):
+        is_loaded = _module_name in sys.modules
+        _module = import_module(_module_name)
+        # loaded before this registry. ex) after reload_domino
+        if is_loaded:
+            _module = reload(_module)
+        return _module
+
     default_dir = os.getenv(DOMINO_DEFAULT_COMPONENT, None)
     custom_dir = os.getenv(DOMINO_CUSTOM_COMPONENT, None)
     try:
         module_name = default_dir + "." + name
         if ui:
             module_name += ".settings"
-        module = import_module(module_name)
-        reload(module)
+        module = _import(module_name)
     except ModuleNotFoundError:
         base_dir = None
         if custom_dir is None:
@@ -1105,13 +1279,33 @@ def import_component_module(name, ui=False):
             module_name = base_dir + "." + name
             if ui:
                 module_name += ".settings"
-            module = import_module(module_name)
-            reload(module)
-        except ModuleNotFoundError:
+            module = _import(module_name)
+        except (ModuleNotFoundError, TypeError):
             raise ModuleNotFoundError(name + " don't exists")
     return module
 
 
+def import_component_module(name, ui=False):
+    key = (name, ui)
+    if key in _component_modules:
+        module, mtime = _component_modules[key]
+        if get_module_mtime(module) == mtime:
+            return module
+        log.Logger.info("Reload Component Module : `{0}`".format(module.__name__))
+        module = reload(module)
+    else:
+        module = find_component_module(name, ui)
+    _component_modules[key] = (module, get_module_mtime(module))
+    return module
+
+
+def clear_component_modules():
+    for module, _ in _component_modules.values():
+        if module.__name__ in sys.modules:
+            del sys.modules[module.__name__]
+    _component_modules.clear()
+
+
 def create_guide(data):
     def _create(_component, _parent):
         if _parent:
@@ -1271,28 +1465,80 @@ def mirror_guide(guide):
     mc.select(sel_list.getDagPath(0))
 
 
-def run_script(context, name, path):
+# {path: {"hash", "code", "module", "cls", "time", "count"}}
+_custom_steps = {}
+# {(path, custom step dir): resolved path}
+_custom_step_paths = {}
+
+
+def resolve_custom_step_path(path):
+    custom_scripts_dir = os.getenv(DOMINO_CUSTOM_STEP_DIR, None)
+    key = (path, custom_scripts_dir)
+    if key not in _custom_step_paths:
+        resolved = path
+        if not os.path.exists(path) and custom_scripts_dir:
+            resolved = os.path.join(os.path.abspath(custom_scripts_dir), path[1:])
+        if not os.path.isfile(resolved):
+            return resolved
+        _custom_step_paths[key] = resolved
+    return _custom_step_paths[key]
+
+
+def load_custom_step(name, path):
+    """CustomStep class of the script. the script is compiled and executed again only when its content changed"""
+    with open(path, "rb") as f:
+        source = f.read()
+    source_hash = hashlib.sha1(source).hexdigest()
+    cached = _custom_steps.get(path)
+    if cached and cached["hash"] == source_hash:
+        return cached["cls"]
+
     n = "domino.custom_step." + name
-    spec = spec_from_loader(n, SourceFileLoader(n, path))
-    module = None
-    if spec:
-        module = module_from_spec(spec)
-        spec.loader.exec_module(module)
-        utils.reload_module(module)
-    _cls = False
-    if module:
-        log.Logger.info(f"Run CUSTOM STEP [{name} {path}]...")
-        for a in dir(module):
-            custom_step_cls = getattr(module, a)
-            if inspect.isclass(custom_step_cls) and issubclass(custom_step_cls, CustomStep):
-                _cls = custom_step_cls()
-                _cls.run(context)
-                break
-    if not _cls:
-        log.Logger.error(f"CUSTOM STEP [{name} {path}]...")
+    code = compile(source, path, "exec")
+    module = module_from_spec(spec_from_loader(n, SourceFileLoader(n, path)))
+    exec(code, module.__dict__)
+    utils.reload_module(module)
+    _cls = None
+    for a in dir(module):
+        custom_step_cls = getattr(module, a)
+        if inspect.isclass(custom_step_cls) and issubclass(custom_step_cls, CustomStep) \
+                and custom_step_cls is not CustomStep:
+            _cls = custom_step_cls
+            break
+    _custom_steps[path] = {"hash": source_hash, "code": code, "module": module, "cls": _cls, "time": 0, "count": 0}
+    return _cls
+
+
+def clear_custom_steps():
+    for cached in _custom_steps.values():
+        if cached["module"].__name__ in sys.modules:
+            del sys.modules[cached["module"].__name__]
+    _custom_steps.clear()
+    _custom_step_paths.clear()
+
+
+def get_custom_step_times():
+    """{path: {"time": last run seconds, "count": run count}}"""
+    return {k: {"time": v["time"], "count": v["count"]} for k, v in _custom_steps.items()}
 
 
-def create_rig(guide=None, rig=None, data=None, context=None):
+def run_script(context, name, path):
+    custom_step_cls = load_custom_step(name, path)
+    if custom_step_cls is None:
+        log.Logger.error(f"CUSTOM STEP [{name} {path}]...")
+        return None
+    log.Logger.info(f"Run CUSTOM STEP [{name} {path}]...")
+    start_time = time.perf_counter()
+    custom_step_cls().run(context)
+    cached = _custom_steps[path]
+    cached["time"] = time.perf_counter() - start_time
+    cached["count"] += 1
+    log.Logger.info(f"CUSTOM STEP [{name}] {cached['time']:.4f}s")
+    return cached["time"]
+
+
+def create_rig(guide=None, rig=None, data=None, context=None, profile=False, report_path=None, batch=False,
+               incremental=False, plan=False):
     def rig_grp():
         name = comp.data["value"]["name"]
         rig_icon = comp.data["value"]["icon_name"]
@@ -1392,10 +1638,7 @@ def create_rig(guide=None, rig=None, data=None, context=None):
             if _p in ["objects", "attributes", "operators", "connections", "finalize"]:
                 break
             name, path = _p.split(" | ")
-            if not os.path.exists(path):
-                custom_scripts_dir = os.path.abspath(os.getenv(DOMINO_CUSTOM_STEP_DIR, None))
-                if custom_scripts_dir:
-                    path = os.path.join(custom_scripts_dir, path[1:])
+            path = resolve_custom_step_path(path)
             if name.startswith("*"):
                 log.Logger.info(f"Skip Custom Step [{name[1:]} {path}]...")
                 custom_step_scripts.pop(0)
@@ -1404,7 +1647,8 @@ def create_rig(guide=None, rig=None, data=None, context=None):
                 log.Logger.info(f"Plz confirm [{name[1:]} {path}]...")
                 custom_step_scripts.pop(0)
                 continue
-            run_script(context, name, path)
+            with build_profiler.record(name, "custom_step"):
+                run_script(context, name, path)
             custom_step_scripts.pop(0)
         if custom_step_scripts:
             custom_step_scripts.pop(0)
@@ -1421,12 +1665,26 @@ def create_rig(guide=None, rig=None, data=None, context=None):
             return rig_instance
 
         def _build(_rig, step):
-            _rig.build(context, step)
+            if _rig.identifier in build_identifiers:
+                with build_profiler.record(_rig.identifier, ["objects", "attributes", "operators", "connections"][step]):
+                    with node_recorder.record(_rig.identifier), modifier.batch(context.get("batch", False)):
+                        _rig.build(context, step)
             for child in _rig.children:
                 _build(child, step)
 
+        def _restore(_rig):
+            if _rig.identifier not in build_identifiers:
+                _rig.root = context[_rig.identifier]["root"]
+                _rig.host = context[_rig.identifier].get("host")
+            for child in _rig.children:
+                _restore(child)
+
         _rig = convert_component_to_rig(comp)
+        _restore(_rig)
         context["mode"] = _rig.component.data["value"]["mode"]
+        # maya renames duplicated names. ex) arm_L0_fk0_ctl -> arm_L0_fk0_ctl1
+        for name, identifiers in find_name_collisions(_rig).items():
+            log.Logger.warning("Name collision `{0}` : {1}".format(name, ", ".join(identifiers)))
         _build(_rig, 0)
         if comp.data["value"]["end_point"] == "objects":
             return False
@@ -1446,9 +1704,92 @@ def create_rig(guide=None, rig=None, data=None, context=None):
         custom_step()
         return True
 
-    def finalize():
+    def finalize_components(identifiers, root_sets, skeleton_sets, controller_sets):
+        roots, ctls, jnts, hosts = [], [], [], []
+        with modifier.batch(context.get("batch", False)):
+            for entry in context.entries(identifiers):
+                roots.append(entry["root"])
+                ctl_names = [x.fullPathName() for x in entry["ctls"]]
+                for ctl_name in ctl_names:
+                    modifier.connect_attr(entry["root"] + ".message", ctl_name + ".component_root")
+                    modifier.connect_attr(entry["host"] + ".message", ctl_name + ".component_host")
+                container.publish_nodes(ctl_names)
+                shapes = mc.listRelatives(ctl_names, shapes=True, fullPath=True) if ctl_names else None
+                for shape in shapes or []:
+                    modifier.connect_attr(context["asset"][1] + ".ctl_x_ray", shape + ".alwaysDrawOnTop")
+                ctls.extend(ctl_names)
+                jnts.extend(entry["jnts"])
+                if "host" in entry:
+                    modifier.connect_attr(entry["root"] + ".message", entry["host"] + ".component_root")
+                    modifier.connect_attr(entry["host"] + ".message", entry["host"] + ".component_host")
+                    container.publish_node(entry["host"])
+                    container.publish_attribute(entry["host"])
+                    hosts.append(entry["host"])
+
+            for jnt in jnts:
+                modifier.set_attr(jnt, "segmentScaleCompensate", False)
+            # [destination, source, ...]
+            inverse_scales = mc.listConnections([x + ".inverseScale" for x in jnts],
+                                                source=True,
+                                                destination=False,
+                                                plugs=True,
+                                                connections=True) if jnts else None
+            inverse_scales = inverse_scales or []
+            for destination, source in zip(inverse_scales[0::2], inverse_scales[1::2]):
+                modifier.disconnect_attr(source, destination)
+
+        # one sets edit per category
+        if roots:
+            mc.sets(roots, edit=True, addElement=root_sets)
+        if ctls or hosts:
+            mc.sets(ctls + hosts, edit=True, addElement=controller_sets)
+        if jnts:
+            mc.sets(jnts, edit=True, addElement=skeleton_sets)
+
+    def create_callback_root(assembly_root):
+        component_id = mc.getAttr(assembly_root + ".component_id")
+
+        callback_root = mc.createNode("script")
+        mc.setAttr(callback_root + ".sourceType", 1)
+        mc.setAttr(callback_root + ".scriptType", 1)
+        attribute.add_attr(callback_root, longName="callbacks", type="message")
+        mc.connectAttr(assembly_root + ".message", callback_root + ".callbacks")
+        for callback_node in context["callbacks"]:
+            mc.connectAttr(callback_root + ".callbacks", callback_node + ".root")
+
+        before_script_code = callback.base_callback.format(component_id=component_id)
+        mc.scriptNode(callback_root, edit=True, beforeScript=before_script_code)
+        mc.scriptNode(callback_root, executeBefore=True)
+        context["callbacks"].append(callback_root)
+
+    def finalize(identifiers=None):
         container.set_current_asset(context["asset"][0])
-        values = context.values()
+        assembly_root = mc.listConnections(context["asset"][1] + ".assembly_node", source=False, destination=True)[0]
+
+        # incremental build. only rebuilt components are added to existing sets
+        if identifiers is not None:
+            root_sets = mc.listConnections(context["asset"][1] + ".root_sets", source=True, destination=False)[0]
+            skeleton_sets = mc.listConnections(context["asset"][1] + ".jnt_sets", source=True, destination=False)[0]
+            controller_sets = mc.listConnections(context["asset"][1] + ".ctl_sets", source=True, destination=False)[0]
+            rig_sets = mc.listSets(object=root_sets)[0]
+            finalize_components(identifiers, root_sets, skeleton_sets, controller_sets)
+            mirror.write_table(context["asset"][1])
+            if "specific_sets" in context:
+                specific_sets = [x for x in context["specific_sets"] if mc.objExists(x)]
+                if specific_sets:
+                    mc.sets(specific_sets, edit=True, addElement=rig_sets)
+            if context["callbacks"]:
+                callback_root = mc.listConnections(assembly_root + ".message",
+                                                   source=False,
+                                                   destination=True,
+                                                   type="script")
+                if callback_root:
+                    for callback_node in context["callbacks"]:
+                        mc.connectAttr(callback_root[0] + ".callbacks", callback_node + ".root")
+                    mc.scriptNode(callback_root[0], executeBefore=True)
+                else:
+                    create_callback_root(assembly_root)
+            return None
 
         # create sets
         name = comp.data["value"]["name"]
@@ -1462,63 +1803,11 @@ def create_rig(guide=None, rig=None, data=None, context=None):
         # rig convenience func
         mc.connectAttr(context["asset"][1] + ".ctl_on_playback", context["roots"] + ".hideOnPlayback")
         mc.connectAttr(context["asset"][1] + ".ctl_vis", context["roots"] + ".v")
-        assembly_root = mc.listConnections(context["asset"][1] + ".assembly_node", source=False, destination=True)[0]
-        pose_data = json.loads(mc.getAttr(assembly_root + ".pose_json").replace("'", "\""))
-        if not pose_data["neutral"]:
-            neutral_pose_data = {}
-            for v in context.values():
-                if type(v) is bool:
-                    continue
-                if "ctls" in v:
-                    neutral_pose_data.update(**attribute.collect_attr([x.fullPathName() for x in v["ctls"]]))
-            pose_data["neutral"] = neutral_pose_data
-            mc.setAttr(assembly_root + ".pose_json", json.dumps(pose_data), type="string")
-
-        # root setup
-        for v in values:
-            if type(v) is bool:
-                continue
-            if "root" in v and isinstance(v, dict):
-                mc.sets(v["root"], edit=True, addElement=root_sets)
+        if pose.is_empty(assembly_root):
+            pose.write_neutral(assembly_root, attribute.collect_attr([x.fullPathName() for x in context.ctls()]))
 
-        # ctls setup
-        for v in values:
-            if type(v) is bool:
-                continue
-            if "ctls" in v:
-                for ctl in v["ctls"]:
-                    ctl_name = ctl.fullPathName()
-                    mc.connectAttr(v["root"] + ".message", ctl_name + ".component_root")
-                    mc.connectAttr(v["host"] + ".message", ctl_name + ".component_host")
-                    container.publish_node(ctl_name)
-
-                    for shape in mc.listRelatives(ctl_name, shapes=True, fullPath=True) or []:
-                        mc.connectAttr(context["asset"][1] + ".ctl_x_ray", shape + ".alwaysDrawOnTop")
-                mc.sets(v["ctls"], edit=True, addElement=controller_sets)
-
-        # jnts setup
-        for v in values:
-            if type(v) is bool:
-                continue
-            if "jnts" in v:
-                for jnt in v["jnts"]:
-                    mc.setAttr(jnt + ".segmentScaleCompensate", False)
-                    target = mc.listConnections(jnt + ".inverseScale", source=True, destination=False, plugs=True)
-                    if target:
-                        mc.disconnectAttr(target[0], jnt + ".inverseScale")
-                if v["jnts"]:
-                    mc.sets(v["jnts"], edit=True, addElement=skeleton_sets)
-
-        # host setup
-        for v in values:
-            if type(v) is bool:
-                continue
-            if "host" in v:
-                mc.connectAttr(v["root"] + ".message", v["host"] + ".component_root")
-                mc.connectAttr(v["host"] + ".message", v["host"] + ".component_host")
-                container.publish_node(v["host"])
-                container.publish_attribute(v["host"])
-                mc.sets(v["host"], edit=True, addElement=controller_sets)
+        finalize_components(None, root_sets, skeleton_sets, controller_sets)
+        mirror.write_table(context["asset"][1])
 
         # -- sets final --#
 
@@ -1548,23 +1837,38 @@ def create_rig(guide=None, rig=None, data=None, context=None):
 
         # callback
         if context["callbacks"]:
-            component_id = mc.getAttr(assembly_root + ".component_id")
+            create_callback_root(assembly_root)
 
-            callback_root = mc.createNode("script")
-            mc.setAttr(callback_root + ".sourceType", 1)
-            mc.setAttr(callback_root + ".scriptType", 1)
-            attribute.add_attr(callback_root, longName="callbacks", type="message")
-            mc.connectAttr(assembly_root + ".message", callback_root + ".callbacks")
-            for callback_node in context["callbacks"]:
-                mc.connectAttr(callback_root + ".callbacks", callback_node + ".root")
+    def incremental_setup():
+        old_rig_grp = rebuild.find_rig(comp)
+        if old_rig_grp is None:
+            return False
+        old_stamps = rebuild.read_stamps(old_rig_grp)
+        dirty, removed = rebuild.dirty_identifiers(stamps, old_stamps) if old_stamps is not None else (None, None)
+        if dirty is None \
+                or rebuild.get_identifier(comp) in dirty \
+                or context["run_custom_step"] \
+                or comp.data["value"]["end_point"] not in ["all", "finalize"] \
+                or not mc.container(query=True, findContainer=old_rig_grp):
+            log.Logger.info("Incremental build is not available. Remove `{0}`".format(old_rig_grp))
+            rebuild.remove_rig(old_rig_grp)
+            return False
 
-            before_script_code = callback.base_callback.format(component_id=component_id)
-            mc.scriptNode(callback_root, edit=True, beforeScript=before_script_code)
-            mc.scriptNode(callback_root, executeBefore=True)
-            context["callbacks"].append(callback_root)
+        rebuild.remove_components(old_stamps, [x for x in dirty if x in old_stamps] + list(removed))
+        rebuild.restore_context(old_rig_grp, context, old_stamps, [x for x in stamps if x not in dirty])
+        context.update({"name": comp.data["value"]["name"], "mode": comp.data["value"]["mode"]})
+        build_identifiers.clear()
+        build_identifiers.update(dirty)
+        log.Logger.info("Incremental Build : [{0}]".format(", ".join(sorted(dirty))))
+        return True
 
+    # a plain dict of the caller gets the build state back when the build ends
+    caller_context = None
     if context is None:
-        context = dict()
+        context = BuildContext()
+    elif not isinstance(context, BuildContext):
+        caller_context = context
+        context = BuildContext(context)
 
     comp = None
 
@@ -1584,21 +1888,54 @@ def create_rig(guide=None, rig=None, data=None, context=None):
     if data:
         comp = convert_data_to_component(data)
 
+    # plan. build against the stand-in and return the recorded graph instead of a rig.
+    # the stand-in is a test and development package (scripts/tests/standin), it has to be on sys.path
+    if plan:
+        import standin
+
+        build_profiler = profiler.Profiler()
+        with standin.patch() as graph:
+            create_rig(data=convert_component_to_data(comp), context=context, profile=build_profiler, batch=batch)
+        if caller_context is not None:
+            caller_context.update(context)
+        return {"statistics": dict(graph.statistics(), components=build_profiler.report()["components"]),
+                "references": context.references.to_dict(),
+                "graph": graph.serialize()}
+
     # create
+    build_profiler = profile if isinstance(profile, profiler.Profiler) else profiler.Profiler(enabled=profile)
+    node_recorder = rebuild.NodeRecorder()
     try:
         log.Logger.info("{: ^50}".format("- domino -"))
         mc.undoInfo(openChunk=True)
+        build_profiler.start()
+        node_recorder.start()
         custom_step_scripts = comp.data["value"]["custom_step"].split(",")
         context["run_custom_step"] = comp.data["value"]["run_custom_step"]
+        context["batch"] = batch
+        stamps = rebuild.collect(comp)
+        build_identifiers = set(stamps)
+        is_incremental = incremental and incremental_setup()
         custom_step()
-        rig_grp()
+        if not is_incremental:
+            with build_profiler.record(comp.data["value"]["name"], "rig_grp"):
+                rig_grp()
         end_point_check = build()
         if not end_point_check:
             return None
-        finalize()
+        with build_profiler.record(comp.data["value"]["name"], "finalize"):
+            finalize(build_identifiers if is_incremental else None)
+        rebuild.write_stamps(context, node_recorder, stamps, build_identifiers)
         container.set_current_asset(None)
         custom_step()
     finally:
+        build_profiler.stop()
+        node_recorder.stop()
+        if profile is True:
+            if report_path is None:
+                report_path = os.path.join(os.path.expanduser("~"), ".domino_profile.json")
+            build_profiler.log_table()
+            build_profiler.write(report_path)
         if context["mode"] == "DEBUG":
             log.Logger.info("Debug mode. all contents remove from asset")
             for c in context["container"]:
@@ -1615,6 +1952,8 @@ def create_rig(guide=None, rig=None, data=None, context=None):
         for key, value in context.items():
             log.Logger.info(f"{key}: {value}")
         log.Logger.info("{:-^50}".format("-"))
+        if caller_context is not None:
+            caller_context.update(context)
         del context
         container.set_current_asset(None)
         mc.undoInfo(closeChunk=True)
@@ -0,0 +1,329 @@
+# built-ins
+import sys
+import json
+import zlib
+import array
+import struct
+
+# Binary .dominob container. converts to and from .domino json without loss.
+#
+# header  | magic(4s) version(H) index size(I)
+# index   | json. {"strings": [offset, size], "components": [{parent, keys, meta, sections}, ...]}
+# blob    | zlib compressed sections. the string table and one section per component data key
+#
+# components are stored depth first with the parent position, "__children" is rebuilt from it.
+# float lists (matrices, cvs, knots) are packed as double arrays, strings are indices to the string table.
+# the index is enough to list components, a section is decoded when it is read.
+
+EXTENSION = ".dominob"
+MAGIC = b"DMNB"
+VERSION = 1
+HEADER = struct.Struct("<4sHI")
+META_KEYS = ["component", "component_version", "component_id", "name", "side", "index"]
+
+NONE = 0
+FALSE = 1
+TRUE = 2
+INT = 3
+BIG_INT = 4
+FLOAT = 5
+STRING = 6
+LIST = 7
+DICT = 8
+FLOAT_ARRAY = 9
+FLOAT_TABLE = 10
+
+UINT = struct.Struct("<I")
+INT64 = struct.Struct("<q")
+DOUBLE = struct.Struct("<d")
+SHAPE = struct.Struct("<II")
+
+
+def _is_float_list(value):
+    return bool(value) and all(type(x) is float for x in value)
+
+
+def _is_float_table(value):
+    if not value or not all(type(x) is list and _is_float_list(x) for x in value):
+        return False
+    return len(set(len(x) for x in value)) == 1
+
+
+def _pack_doubles(values):
+    packed = array.array("d", values)
+    if sys.byteorder == "big":
+        packed.byteswap()
+    return packed.tobytes()
+
+
+def _unpack_doubles(buffer, offset, count):
+    unpacked = array.array("d")
+    unpacked.frombytes(buffer[offset:offset + count * 8])
+    if sys.byteorder == "big":
+        unpacked.byteswap()
+    return unpacked.tolist()
+
+
+class Encoder:
+
+    def __init__(self):
+        self.strings = []
+        self._string_indices = {}
+
+    def string_index(self, value):
+        index = self._string_indices.get(value)
+        if index is None:
+            index = self._string_indices[value] = len(self.strings)
+            self.strings.append(value)
+        return index
+
+    def encode(self, value, buffer):
+        if value is None:
+            buffer.append(NONE)
+        elif value is True:
+            buffer.append(TRUE)
+        elif value is False:
+            buffer.append(FALSE)
+        elif type(value) is int:
+            if -2 ** 63 <= value < 2 ** 63:
+                buffer.append(INT)
+                buffer += INT64.pack(value)
+            else:
+                buffer.append(BIG_INT)
+                buffer += UINT.pack(self.string_index(str(value)))
+        elif type(value) is float:
+            buffer.append(FLOAT)
+            buffer += DOUBLE.pack(value)
+        elif isinstance(value, str):
+            buffer.append(STRING)
+            buffer += UINT.pack(self.string_index(value))
+        elif isinstance(value, (list, tuple)):
+            if _is_float_table(value):
+                buffer.append(FLOAT_TABLE)
+                buffer += SHAPE.pack(len(value), len(value[0]))
+                buffer += _pack_doubles([x for row in value for x in row])
+            elif _is_float_list(value):
+                buffer.append(FLOAT_ARRAY)
+                buffer += UINT.pack(len(value))
+                buffer += _pack_doubles(value)
+            else:
+                buffer.append(LIST)
+                buffer += UINT.pack(len(value))
+                for v in value:
+                    self.encode(v, buffer)
+        elif isinstance(value, dict):
+            buffer.append(DICT)
+            buffer += UINT.pack(len(value))
+            for k, v in value.items():
+                buffer += UINT.pack(self.string_index(str(k)))
+                self.encode(v, buffer)
+        else:
+            raise TypeError("{0} is not supported. {1}".format(type(value).__name__, value))
+        return buffer
+
+    def encode_strings(self):
+        buffer = bytearray(UINT.pack(len(self.strings)))
+        for string in self.strings:
+            encoded = string.encode("UTF-8")
+            buffer += UINT.pack(len(encoded))
+            buffer += encoded
+        return buffer
+
+
+class Decoder:
+
+    def __init__(self, strings):
+        self.strings = strings
+
+    @staticmethod
+    def decode_strings(buffer):
+        count = UINT.unpack_from(buffer, 0)[0]
+        offset = UINT.size
+        strings = []
+        for _ in range(count):
+            size = UINT.unpack_from(buffer, offset)[0]
+            offset += UINT.size
+            strings.append(bytes(buffer[offset:offset + size]).decode("UTF-8"))
+            offset += size
+        return strings
+
+    def decode(self, buffer, offset=0):
+        """returns (value, next offset)"""
+        tag = buffer[offset]
+        offset += 1
+        if tag == NONE:
+            return None, offset
+        if tag == TRUE:
+            return True, offset
+        if tag == FALSE:
+            return False, offset
+        if tag == INT:
+            return INT64.unpack_from(buffer, offset)[0], offset + INT64.size
+        if tag == BIG_INT:
+            return int(self.strings[UINT.unpack_from(buffer, offset)[0]]), offset + UINT.size
+        if tag == FLOAT:
+            return DOUBLE.unpack_from(buffer, offset)[0], offset + DOUBLE.size
+        if tag == STRING:
+            return self.strings[UINT.unpack_from(buffer, offset)[0]], offset + UINT.size
+        if tag == FLOAT_ARRAY:
+            count = UINT.unpack_from(buffer, offset)[0]
+            offset += UINT.size
+            return _unpack_doubles(buffer, offset, count), offset + count * 8
+        if tag == FLOAT_TABLE:
+            rows, columns = SHAPE.unpack_from(buffer, offset)
+            offset += SHAPE.size
+            values = _unpack_doubles(buffer, offset, rows * columns)
+            return [values[i:i + columns] for i in range(0, rows * columns, columns)], offset + rows * columns * 8
+        if tag == LIST:
+            count = UINT.unpack_from(buffer, offset)[0]
+            offset += UINT.size
+            values = []
+            for _ in range(count):
+                value, offset = self.decode(buffer, offset)
+                values.append(value)
+            return values, offset
+        if tag == DICT:
+            count = UINT.unpack_from(buffer, offset)[0]
+            offset += UINT.size
+            values = {}
+            for _ in range(count):
+                key = self.strings[UINT.unpack_from(buffer, offset)[0]]
+                value, offset = self.decode(buffer, offset + UINT.size)
+                values[key] = value
+            return values, offset
+        raise ValueError("Unknown tag {0} at {1}".format(tag, offset - 1))
+
+
+def dumps(data, level=6):
+    """.domino json data to bytes"""
+    encoder = Encoder()
+    blob = bytearray()
+    components = []
+
+    def _add_section(_buffer):
+        compressed = zlib.compress(bytes(_buffer), level)
+        section = [len(blob), len(compressed)]
+        blob.extend(compressed)
+        return section
+
+    def _recursive(_data, parent):
+        value = _data.get("value", {})
+        record = {"parent": parent,
+                  "keys": list(_data.keys()),
+                  "meta": {k: value[k] for k in META_KEYS if k in value},
+                  "sections": {}}
+        components.append(record)
+        for key, section_data in _data.items():
+            if key == "__children":
+                continue
+            record["sections"][key] = _add_section(encoder.encode(section_data, bytearray()))
+        index = len(components) - 1
+        for child in _data.get("__children", []):
+            _recursive(child, index)
+
+    _recursive(data, -1)
+    # strings are collected while encoding the sections.
+    strings_section = _add_section(encoder.encode_strings())
+    index = json.dumps({"strings": strings_section, "components": components},
+                       ensure_ascii=False, separators=(",", ":")).encode("UTF-8")
+    return HEADER.pack(MAGIC, VERSION, len(index)) + index + bytes(blob)
+
+
+def loads(buffer):
+    """bytes to .domino json data"""
+    return Reader(buffer).data()
+
+
+def dump(data, file_path):
+    with open(file_path, "wb") as f:
+        f.write(dumps(data))
+
+
+def load(file_path):
+    with Reader(file_path) as reader:
+        return reader.data()
+
+
+def is_binary(file_path):
+    with open(file_path, "rb") as f:
+        return f.read(len(MAGIC)) == MAGIC
+
+
+class Reader:
+    """reads the index up front and the sections on demand.
+
+    with Reader(path) as reader:
+        names = [x["meta"]["name"] for x in reader.components]
+        value = reader.section(0, "value")
+    """
+
+    def __init__(self, source):
+        if isinstance(source, (bytes, bytearray, memoryview)):
+            self._file = None
+            self._buffer = memoryview(source)
+            header = bytes(self._buffer[:HEADER.size])
+        else:
+            self._file = open(source, "rb")
+            self._buffer = None
+            header = self._file.read(HEADER.size)
+        magic, version, index_size = HEADER.unpack(header)
+        if magic != MAGIC:
+            raise ValueError("Not a domino binary")
+        if version > VERSION:
+            raise ValueError("Unsupported domino binary version {0}".format(version))
+        self.version = version
+        index = self._read(HEADER.size, index_size)
+        self.index = json.loads(bytes(index).decode("UTF-8"))
+        self.components = self.index["components"]
+        self._blob_offset = HEADER.size + index_size
+        self._decoder = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def _read(self, offset, size):
+        if self._buffer is not None:
+            return self._buffer[offset:offset + size]
+        self._file.seek(offset)
+        return self._file.read(size)
+
+    def _read_section(self, section):
+        return zlib.decompress(self._read(self._blob_offset + section[0], section[1]))
+
+    @property
+    def decoder(self):
+        if self._decoder is None:
+            self._decoder = Decoder(Decoder.decode_strings(self._read_section(self.index["strings"])))
+        return self._decoder
+
+    def children(self, index):
+        return [i for i, x in enumerate(self.components) if x["parent"] == index]
+
+    def section(self, index, key):
+        return self.decoder.decode(self._read_section(self.components[index]["sections"][key]))[0]
+
+    def component_data(self, index, children=True):
+        """component data of `index`. "__children" is filled when `children`"""
+        data = {}
+        for key in self.components[index]["keys"]:
+            if key == "__children":
+                data[key] = [self.component_data(x) for x in self.children(index)] if children else []
+            else:
+                data[key] = self.section(index, key)
+        return data
+
+    def data(self):
+        # children are resolved by one pass over the parent positions
+        items = [self.component_data(i, children=False) for i in range(len(self.components))]
+        for i, record in enumerate(self.components):
+            if record["parent"] >= 0:
+                items[record["parent"]]["__children"].append(items[i])
+        return items[0]
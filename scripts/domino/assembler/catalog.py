@@ -0,0 +1,316 @@
+# built-ins
+import os
+import ast
+import json
+import fnmatch
+from collections import Counter
+
+# domino
+from domino import DOMINO_RIG_TEMPLATE_DIR, DOMINO_CUSTOM_COMPONENT
+from domino.assembler import binary
+from domino.lib import log
+
+# Index files in the home directory. entries are refreshed by mtime and size,
+# so browsing reads one small file instead of parsing every template.
+
+TEMPLATE_EXTENSIONS = (".domino", binary.EXTENSION)
+AUTHOR_FIELDS = ["madeBy", "contact", "component", "version", "name", "side", "index", "description"]
+
+
+def read_index(file_path):
+    if not os.path.exists(file_path):
+        return {}
+    try:
+        with open(file_path, "r", encoding="UTF-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def write_index(file_path, data):
+    # a read only home still works. the index is rebuilt in memory.
+    try:
+        with open(file_path, "w", encoding="UTF-8") as f:
+            json.dump(data, f, indent=2, ensure_ascii=False)
+    except OSError as e:
+        log.Logger.warning("Can't write catalog `{0}` : {1}".format(file_path, e))
+
+
+def summarize_template(file_path):
+    """{"name", "domino_version", "maya_version", "component_count", "components": {component: count},
+    "versions": {component: [version, ...]}}"""
+    if os.path.splitext(file_path)[1] == binary.EXTENSION:
+        # index metadata only. the assembly value section is the one section decoded
+        with binary.Reader(file_path) as reader:
+            metas = [x["meta"] for x in reader.components]
+            assembly_value = reader.section(0, "value")
+    else:
+        with open(file_path, "r", encoding="UTF-8") as f:
+            data = json.load(f)
+        metas = []
+
+        def _recursive(_data):
+            metas.append(_data["value"])
+            for child in _data["__children"]:
+                _recursive(child)
+
+        _recursive(data)
+        assembly_value = data["value"]
+
+    components = Counter(x["component"] for x in metas)
+    versions = {}
+    for meta in metas:
+        version = meta.get("component_version")
+        if version is not None and version not in versions.setdefault(meta["component"], []):
+            versions[meta["component"]].append(version)
+    return {"name": assembly_value.get("name", ""),
+            "domino_version": assembly_value.get("domino_version", ""),
+            "maya_version": assembly_value.get("maya_version", ""),
+            "component_count": len(metas),
+            "components": dict(sorted(components.items())),
+            "versions": {k: sorted(v) for k, v in sorted(versions.items())}}
+
+
+class TemplateCatalog:
+    """catalog of a template directory. `~/.domino_template_catalog.json` holds the index of every directory
+
+    the index is read and refreshed on the first search, names() only lists the directory.
+
+    catalog = get_template_catalog()
+    catalog.search(component="wing_01")
+    """
+
+    FILE_PATH = os.path.join(os.path.expanduser("~"), ".domino_template_catalog.json")
+
+    def __init__(self, directory=None, file_path=None):
+        self.directory = os.path.normpath(directory or os.getenv(DOMINO_RIG_TEMPLATE_DIR, ""))
+        self.file_path = file_path or self.FILE_PATH
+        # refreshed before the next templates access
+        self.outdated = True
+        # {file name: {"mtime", "size", summary...}}
+        self._templates = None
+
+    @property
+    def templates(self):
+        if self.outdated:
+            self.refresh()
+        return self._templates
+
+    def _entries(self):
+        if not os.path.isdir(self.directory):
+            return []
+        return [x for x in os.scandir(self.directory)
+                if x.is_file() and os.path.splitext(x.name)[1] in TEMPLATE_EXTENSIONS]
+
+    def refresh(self):
+        """re-summarize templates changed since the last refresh. returns True when the catalog changed"""
+        if self._templates is None:
+            self._templates = read_index(self.file_path).get("directories", {}).get(self.directory, {})
+        self.outdated = False
+        changed = False
+        found = set()
+        for entry in self._entries():
+            found.add(entry.name)
+            stat = entry.stat()
+            cached = self._templates.get(entry.name)
+            if cached and cached["mtime"] == stat.st_mtime_ns and cached["size"] == stat.st_size:
+                continue
+            try:
+                summary = summarize_template(entry.path)
+            except (OSError, ValueError, KeyError) as e:
+                log.Logger.warning("Can't read template `{0}` : {1}".format(entry.path, e))
+                continue
+            self._templates[entry.name] = dict(mtime=stat.st_mtime_ns, size=stat.st_size, **summary)
+            changed = True
+        for name in set(self._templates) - found:
+            del self._templates[name]
+            changed = True
+        if changed:
+            # other directories of the index are kept
+            index = read_index(self.file_path)
+            index.setdefault("directories", {})[self.directory] = dict(sorted(self._templates.items()))
+            write_index(self.file_path, index)
+        return changed
+
+    def path(self, name):
+        return os.path.normpath(os.path.join(self.directory, name))
+
+    def names(self):
+        """template file names of the directory. the templates are not read"""
+        return sorted(x.name for x in self._entries())
+
+    def search(self, component=None, version=None, name=None, text=None):
+        """template file names matching every given filter.
+
+        component -- component name. fnmatch pattern. ex) "wing_*"
+        version -- component_version of `component`
+        name -- template file name. fnmatch pattern
+        text -- case insensitive substring of the file name, asset name or component names
+        """
+        text = text.lower() if text else text
+        result = []
+        for file_name, entry in sorted(self.templates.items()):
+            if name and not fnmatch.fnmatch(file_name, name):
+                continue
+            if component:
+                components = fnmatch.filter(entry["components"], component)
+                if not components:
+                    continue
+                if version and not any(version in entry["versions"].get(x, []) for x in components):
+                    continue
+            if text:
+                fields = [file_name, entry["name"]] + list(entry["components"])
+                if not any(text in x.lower() for x in fields):
+                    continue
+            result.append(file_name)
+        return result
+
+
+# {directory: TemplateCatalog}
+_template_catalogs = {}
+
+
+def get_template_catalog(directory=None, refresh=True):
+    """refresh -- refresh the catalog before its next search"""
+    directory = os.path.normpath(directory or os.getenv(DOMINO_RIG_TEMPLATE_DIR, ""))
+    if directory not in _template_catalogs:
+        _template_catalogs[directory] = TemplateCatalog(directory)
+    catalog = _template_catalogs[directory]
+    if refresh:
+        catalog.outdated = True
+    return catalog
+
+
+def find_component_dirs():
+    """{package: {component name: component dir}}. "default" first, custom packages after it"""
+
+    def _list(_dir):
+        return {x: os.path.join(_dir, x) for x in sorted(os.listdir(_dir))
+                if x != "__pycache__" and os.path.isdir(os.path.join(_dir, x))}
+
+    default_component_dir = os.path.join(os.path.dirname(__file__), "component")
+    component_dirs = {"default": _list(default_component_dir)}
+
+    custom_component_dirs = os.getenv(DOMINO_CUSTOM_COMPONENT, None)
+    if custom_component_dirs:
+        for d in sorted(os.listdir(custom_component_dirs)):
+            d = os.path.join(custom_component_dirs, d)
+            if d.endswith("__pycache__") or not os.path.isdir(d):
+                continue
+            custom_component = _list(d)
+            for x in list(custom_component):
+                if x in component_dirs["default"]:
+                    del custom_component[x]
+                    log.Logger.warning(f"Already exists component '{x}'")
+            component_dirs[os.path.basename(d)] = custom_component
+    return component_dirs
+
+
+def read_author(component_dir):
+    """Author class fields of the component without importing it. None for fields that are not literals"""
+    file_path = os.path.join(component_dir, "__init__.py")
+    with open(file_path, "r", encoding="UTF-8") as f:
+        tree = ast.parse(f.read(), file_path)
+    for node in tree.body:
+        if not isinstance(node, ast.ClassDef) or node.name != "Author":
+            continue
+        author = dict.fromkeys(AUTHOR_FIELDS)
+        for item in node.body:
+            if isinstance(item, ast.Assign) and len(item.targets) == 1 and isinstance(item.targets[0], ast.Name):
+                try:
+                    author[item.targets[0].id] = ast.literal_eval(item.value)
+                except ValueError:
+                    pass
+        # os.path.split(os.path.dirname(__file__))[-1]
+        if author["component"] is None:
+            author["component"] = os.path.basename(component_dir)
+        return author
+    return None
+
+
+class ComponentCatalog:
+    """Author metadata of default and custom components. `~/.domino_component_catalog.json`
+
+    modules are parsed, not imported. a component is imported when its Author is not plain literals.
+    """
+
+    FILE_PATH = os.path.join(os.path.expanduser("~"), ".domino_component_catalog.json")
+
+    def __init__(self, file_path=None):
+        self.file_path = file_path or self.FILE_PATH
+        # {component name: {"package", "path", "mtime", "size", "author": {}}}
+        self.components = read_index(self.file_path).get("components", {})
+
+    def _read_author(self, name, component_dir):
+        author = read_author(component_dir)
+        if author is None or None in [author[x] for x in ["madeBy", "contact", "version", "description"]]:
+            from domino import assembler
+
+            module = assembler.import_component_module(name)
+            author = {x: getattr(module.Author, x, None) for x in AUTHOR_FIELDS}
+        author["version"] = list(author["version"]) if author["version"] is not None else None
+        return author
+
+    def refresh(self):
+        """re-read components whose __init__.py changed. returns True when the catalog changed"""
+        changed = False
+        found = {}
+        for package, components in find_component_dirs().items():
+            for name, component_dir in components.items():
+                file_path = os.path.join(component_dir, "__init__.py")
+                if not os.path.exists(file_path):
+                    continue
+                found[name] = package
+                stat = os.stat(file_path)
+                cached = self.components.get(name)
+                if cached and cached["path"] == file_path and cached["mtime"] == stat.st_mtime_ns \
+                        and cached["size"] == stat.st_size:
+                    if cached["package"] != package:
+                        cached["package"] = package
+                        changed = True
+                    continue
+                try:
+                    author = self._read_author(name, component_dir)
+                except (OSError, SyntaxError, ModuleNotFoundError, AttributeError) as e:
+                    log.Logger.warning("Can't read component `{0}` : {1}".format(name, e))
+                    continue
+                self.components[name] = {"package": package,
+                                         "path": file_path,
+                                         "mtime": stat.st_mtime_ns,
+                                         "size": stat.st_size,
+                                         "author": author}
+                changed = True
+        for name in set(self.components) - set(found):
+            del self.components[name]
+            changed = True
+        if changed:
+            write_index(self.file_path, {"components": self.components})
+        return changed
+
+    def packages(self):
+        """{package: [component name, ...]} in find_component_dirs order"""
+        packages = {}
+        for package in find_component_dirs():
+            packages[package] = sorted(k for k, v in self.components.items() if v["package"] == package)
+        return packages
+
+    def author(self, name):
+        return self.components[name]["author"]
+
+    def search(self, text):
+        """component names. case insensitive substring of the name or the description"""
+        text = text.lower()
+        return sorted(k for k, v in self.components.items()
+                      if text in k.lower() or text in (v["author"]["description"] or "").lower())
+
+
+_component_catalog = None
+
+
+def get_component_catalog(refresh=True):
+    global _component_catalog
+    if _component_catalog is None:
+        _component_catalog = ComponentCatalog()
+    if refresh:
+        _component_catalog.refresh()
+    return _component_catalog
@@ -71,6 +71,7 @@ def component_preset():
         "ctl_shapes": {"type": "nurbsCurve", "multi": True},
         "icon_name": {"type": "string"},
         "pose_json": {"type": "string"},
+        "pose_library": {"type": "string"},
         "rig_note": {"type": "string"},
         "asset_container": {"type": "string"}
     }
@@ -118,6 +119,7 @@ def component_preset():
         "run_custom_step": False,
         "custom_step": ",".join(["objects", "attributes", "operators", "connections", "finalize"]),
         "icon_name": "human",
+        "pose_library": "",
         "asset_container": Author.name
     }
     anim = {}
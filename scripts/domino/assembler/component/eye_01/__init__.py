@@ -157,7 +157,7 @@ class Rig(assembler.Rig):
         self.refs = [self.create_ref(context=context, name=name, anchor=True, m=self.ref_source)]
         self.names = [""]
 
-        if data["spherical_iris_pupil_rig"]:
+        if data.get("spherical_iris_pupil_rig", False):
             mesh = data["eyeball_mesh"]
             center_edge_index = int(data["center_edge_index"])
             limbus_edge_index = int(data["limbus_edge_index"])
@@ -226,7 +226,7 @@ class Rig(assembler.Rig):
         host = self.host
 
         data = self.component.data["value"]
-        if data["spherical_iris_pupil_rig"]:
+        if data.get("spherical_iris_pupil_rig", False):
             limbus_length = mc.getAttr(self.locs[self.limbus_edge_index] + ".tx") / self.radius
             limbus_dv = math.degrees(math.asin(limbus_length) * 2) / 180
             self.limbus_line_attr = attribute.add_attr(host,
@@ -277,7 +277,7 @@ class Rig(assembler.Rig):
                                                 switch_attr_name="aim_space_switch")
             context["callbacks"].append(script_node)
 
-        if data["spherical_iris_pupil_rig"]:
+        if data.get("spherical_iris_pupil_rig", False):
             # setup limbus, pupil, last
             for attr, i in zip([self.limbus_line_attr, self.pupil_line_attr, self.end_line_attr],
                                [self.limbus_edge_index, self.pupil_edge_index, -1]):
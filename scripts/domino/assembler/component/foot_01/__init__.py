@@ -312,7 +312,7 @@ class Rig(assembler.Rig):
             parent = None
             for i, ref in enumerate(self.refs[1:]):
                 if i == 1:
-                    mc.connectAttr(parent + ".message", root + ".jnts[1]")
+                    self.connect_multi(parent, "jnts")
                 m = matrix.get_matrix(ref)
                 parent = self.create_jnt(context=context,
                                          parent=parent,
@@ -6,10 +6,34 @@ import os
 from domino.lib import hierarchy
 from domino import DOMINO_RIG_TEMPLATE_DIR
 from domino import assembler, log
+from domino.assembler import binary
 
 # maya
 from maya import cmds as mc
 
+FILE_FILTER = "Domino Guide (*.domino *{0})".format(binary.EXTENSION)
+
+
+def read(file_path):
+    """.domino json or binary by extension"""
+    if os.path.splitext(file_path)[1] == binary.EXTENSION:
+        return binary.load(file_path)
+    with open(file_path, "r", encoding="UTF-8") as f:
+        return json.load(f)
+
+
+def write(data, file_path):
+    if os.path.splitext(file_path)[1] == binary.EXTENSION:
+        binary.dump(data, file_path)
+        return
+    with open(file_path, "w", encoding="UTF-8") as f:
+        json.dump(data, f, indent=2, ensure_ascii=False)
+
+
+def convert(source_path, target_path):
+    """ex) convert("biped.domino", "biped.dominob")"""
+    write(read(source_path), target_path)
+
 
 def dump(file_path=None):
     node = mc.ls(selection=True)
@@ -19,7 +43,7 @@ def dump(file_path=None):
     if file_path is None:
         file_path = mc.fileDialog2(caption="Save Domino guide",
                                    startingDirectory=os.getenv(DOMINO_RIG_TEMPLATE_DIR, None),
-                                   fileFilter="Domino Guide (*.domino)",
+                                   fileFilter=FILE_FILTER,
                                    fileMode=0)
         if file_path:
             file_path = file_path[0]
@@ -39,29 +63,28 @@ def dump(file_path=None):
     data = assembler.convert_component_to_data(comp)
 
     log.Logger.info("Save Guide : `{0}`".format(file_path))
-    with open(file_path, "w", encoding="UTF-8") as f:
-        json.dump(data, f, indent=2, ensure_ascii=False)
+    write(data, file_path)
 
 
-def load(file_path=None, guide=False, rig=True, context=None):
+def load(file_path=None, guide=False, rig=True, context=None, profile=False, batch=False):
     if context is None:
         context = {}
     if file_path is None:
         file_path = mc.fileDialog2(caption="Load Domino guide",
                                    startingDirectory=os.getenv(DOMINO_RIG_TEMPLATE_DIR, None),
-                                   fileFilter="Domino Guide (*.domino)",
+                                   fileFilter=FILE_FILTER,
                                    fileMode=1)
         if file_path:
             file_path = file_path[0]
         else:
             return None
 
-    with open(file_path, "r", encoding="UTF-8") as f:
-        data = json.load(f)
+    data = read(file_path)
 
     if guide:
         log.Logger.info("Load Guide : `{0}`".format(file_path))
         assembler.create_guide(data)
     if rig:
         log.Logger.info("Load Rig : `{0}`".format(file_path))
-        assembler.create_rig(data=data, context=context)
+        report_path = os.path.splitext(file_path)[0] + ".profile.json"
+        assembler.create_rig(data=data, context=context, profile=profile, report_path=report_path, batch=batch)
@@ -0,0 +1,123 @@
+# maya
+from maya import cmds as mc
+from maya.api import OpenMaya as om2
+
+# built-ins
+import json
+import time
+from collections import Counter
+from contextlib import contextmanager
+
+# domino
+from domino.lib import log
+
+
+class Profiler:
+
+    def __init__(self, enabled=True):
+        self.enabled = enabled
+        self.records = {}
+        self.order = []
+        self.total_time = 0
+        self._current = None
+        self._start_time = None
+        self._originals = {}
+        self._callback_id = None
+
+    def _wrap(self, name, func):
+        def wrapper(*args, **kwargs):
+            if self._current is not None:
+                self._current["calls"][name] += 1
+            return func(*args, **kwargs)
+
+        return wrapper
+
+    def _node_added(self, node, *args):
+        if self._current is not None:
+            self._current["nodes"][om2.MFnDependencyNode(node).typeName] += 1
+
+    def start(self):
+        if not self.enabled or self._originals:
+            return
+        for name in dir(mc):
+            func = getattr(mc, name)
+            if name.startswith("_") or not callable(func):
+                continue
+            self._originals[name] = func
+            setattr(mc, name, self._wrap(name, func))
+        self._callback_id = om2.MDGMessage.addNodeAddedCallback(self._node_added, "dependNode")
+        self._start_time = time.perf_counter()
+
+    def stop(self):
+        if not self._originals:
+            return
+        for name, func in self._originals.items():
+            setattr(mc, name, func)
+        self._originals = {}
+        if self._callback_id is not None:
+            om2.MMessage.removeCallback(self._callback_id)
+            self._callback_id = None
+        self.total_time = time.perf_counter() - self._start_time
+
+    @contextmanager
+    def record(self, identifier, step):
+        if not self.enabled:
+            yield
+            return
+        key = (identifier, step)
+        if key not in self.records:
+            self.records[key] = {"time": 0, "calls": Counter(), "nodes": Counter()}
+            self.order.append(key)
+        previous = self._current
+        self._current = self.records[key]
+        start_time = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.records[key]["time"] += time.perf_counter() - start_time
+            self._current = previous
+
+    def report(self):
+        components = {}
+        for identifier, step in self.order:
+            record = self.records[(identifier, step)]
+            if identifier not in components:
+                components[identifier] = {"time": 0, "call_count": 0, "node_count": 0, "steps": {}}
+            component = components[identifier]
+            component["time"] += record["time"]
+            component["call_count"] += sum(record["calls"].values())
+            component["node_count"] += sum(record["nodes"].values())
+            component["steps"][step] = {
+                "time": record["time"],
+                "call_count": sum(record["calls"].values()),
+                "node_count": sum(record["nodes"].values()),
+                "calls": dict(record["calls"].most_common()),
+                "nodes": dict(record["nodes"].most_common())
+            }
+        return {"total_time": self.total_time, "components": components}
+
+    def write(self, file_path):
+        if not self.enabled:
+            return None
+        log.Logger.info("Save Profile : `{0}`".format(file_path))
+        with open(file_path, "w", encoding="UTF-8") as f:
+            json.dump(self.report(), f, indent=2, ensure_ascii=False)
+        return file_path
+
+    def log_table(self, limit=None):
+        if not self.enabled:
+            return None
+        rows = sorted(self.order, key=lambda k: self.records[k]["time"], reverse=True)
+        if limit:
+            rows = rows[:limit]
+        log.Logger.info("{:+^78}".format("Profile"))
+        log.Logger.info("{: <32}{: <14}{: >12}{: >10}{: >10}".format("component", "step", "time(s)", "calls", "nodes"))
+        for identifier, step in rows:
+            record = self.records[(identifier, step)]
+            log.Logger.info("{: <32}{: <14}{: >12.4f}{: >10}{: >10}".format(str(identifier),
+                                                                          step,
+                                                                          record["time"],
+                                                                          sum(record["calls"].values()),
+                                                                          sum(record["nodes"].values())))
+        log.Logger.info("{: <46}{: >12.4f}".format("total", self.total_time))
+        log.Logger.info("{:-^78}".format("-"))
@@ -0,0 +1,241 @@
+# maya
+from maya import cmds as mc
+from maya.api import OpenMaya as om2
+
+# built-ins
+import json
+import hashlib
+from contextlib import contextmanager
+
+# domino
+from domino.lib import attribute, log
+from domino.lib.rigging import container
+
+DATA_KEYS = ["attributes", "value", "anim", "nurbs_curve", "json"]
+BASE_CONTEXT_KEYS = ["name", "asset", "geometry", "skeleton", "roots", "xxx", "callbacks", "container", "mode",
+                     "run_custom_step", "batch"]
+# shared nodes. other components are using these too.
+KEEP_NODE_TYPES = ["container", "dagContainer", "ikRPsolver", "ikSCsolver", "ikSplineSolver", "ikSpringSolver"]
+
+
+def get_identifier(component):
+    return "_".join([str(x) for x in component.identifier if x is not None])
+
+
+def hash_data(component):
+    data = {k: component.data[k] for k in DATA_KEYS if k in component.data}
+    text = json.dumps(data, sort_keys=True, default=str)
+    return hashlib.sha1(text.encode("UTF-8")).hexdigest()
+
+
+def get_references(component):
+    """space switch strings. "2 | noname,0 | COG_C_0" """
+    references = []
+    for value in component.data["value"].values():
+        if not isinstance(value, str) or " | " not in value:
+            continue
+        for element in value.split(","):
+            element = element.split(" | ")
+            if len(element) == 2 and element[0].strip().isdigit():
+                references.append(element[1].strip())
+    return references
+
+
+def collect(component):
+    """{identifier: {"hash": str, "parent": str, "references": list}}"""
+    stamps = {}
+
+    def _recursive(_component):
+        parent = _component.parent
+        stamps[get_identifier(_component)] = {
+            "hash": hash_data(_component),
+            "parent": get_identifier(parent) if parent else None,
+            "references": get_references(_component)
+        }
+        for child in _component.children:
+            _recursive(child)
+
+    _recursive(component)
+    return stamps
+
+
+class NodeRecorder:
+
+    def __init__(self):
+        self.nodes = {}
+        self._current = None
+        self._callback_id = None
+
+    def _node_added(self, node, *args):
+        if self._current is not None:
+            self.nodes[self._current].append(om2.MObjectHandle(node))
+
+    def start(self):
+        if self._callback_id is None:
+            self._callback_id = om2.MDGMessage.addNodeAddedCallback(self._node_added, "dependNode")
+
+    def stop(self):
+        if self._callback_id is not None:
+            om2.MMessage.removeCallback(self._callback_id)
+            self._callback_id = None
+
+    @contextmanager
+    def record(self, identifier):
+        if identifier not in self.nodes:
+            self.nodes[identifier] = []
+        previous = self._current
+        self._current = identifier
+        try:
+            yield
+        finally:
+            self._current = previous
+
+    def uuids(self, identifier):
+        uuids = []
+        for handle in self.nodes.get(identifier, []):
+            if not handle.isValid() or not handle.isAlive():
+                continue
+            fn_node = om2.MFnDependencyNode(handle.object())
+            if fn_node.typeName in KEEP_NODE_TYPES:
+                continue
+            uuids.append(fn_node.uuid().asString())
+        return uuids
+
+
+def find_rig(component):
+    """existing rig built from the same assembly guide"""
+    component_id = component.data["value"]["component_id"]
+    for rig_grp in mc.ls("*.is_rig", objectsOnly=True, long=True) or []:
+        if not mc.attributeQuery("assembly_node", node=rig_grp, exists=True):
+            continue
+        assembly_root = mc.listConnections(rig_grp + ".assembly_node", source=False, destination=True)
+        if not assembly_root or not mc.attributeQuery("component_id", node=assembly_root[0], exists=True):
+            continue
+        if mc.getAttr(assembly_root[0] + ".component_id") == component_id:
+            return rig_grp
+    return None
+
+
+def read_stamps(rig_grp):
+    stamps = {}
+    for root in mc.listRelatives(rig_grp + "|roots", children=True, fullPath=True) or []:
+        if not mc.attributeQuery("build_stamp", node=root, exists=True):
+            return None
+        stamp = json.loads(mc.getAttr(root + ".build_stamp"))
+        stamp["root"] = root
+        stamps[stamp["identifier"]] = stamp
+    return stamps
+
+
+def write_stamps(context, recorder, stamps, identifiers):
+    for identifier in identifiers:
+        if identifier not in context:
+            continue
+        root = context[identifier]["root"]
+        stamp = {"identifier": identifier,
+                 "hash": stamps[identifier]["hash"],
+                 "parent": stamps[identifier]["parent"],
+                 "nodes": recorder.uuids(identifier)}
+        attribute.add_attr(root, longName="build_stamp", type="string")
+        mc.setAttr(root + ".build_stamp", json.dumps(stamp), type="string")
+
+    # component shared data. ex) context["auto_clavicle"], context["specific_sets"]
+    rig_grp = context["asset"][1]
+    shared = {}
+    if mc.attributeQuery("build_context", node=rig_grp, exists=True):
+        shared = json.loads(mc.getAttr(rig_grp + ".build_context"))
+    for key, value in context.items():
+        if key in BASE_CONTEXT_KEYS or key in stamps:
+            continue
+        try:
+            shared[key] = json.loads(json.dumps(value))
+        except TypeError:
+            continue
+    attribute.add_attr(rig_grp, longName="build_context", type="string")
+    mc.setAttr(rig_grp + ".build_context", json.dumps(shared), type="string")
+
+
+def dirty_identifiers(new_stamps, old_stamps):
+    """changed components and their dependents(children, space switch)"""
+    removed = set(old_stamps) - set(new_stamps)
+    dirty = set()
+    for identifier, stamp in new_stamps.items():
+        old_stamp = old_stamps.get(identifier)
+        if old_stamp is None or old_stamp["hash"] != stamp["hash"] or old_stamp["parent"] != stamp["parent"]:
+            dirty.add(identifier)
+
+    changed = True
+    while changed:
+        changed = False
+        for identifier, stamp in new_stamps.items():
+            if identifier in dirty:
+                continue
+            dependencies = [stamp["parent"]] + stamp["references"]
+            if any(x in dirty or x in removed for x in dependencies):
+                dirty.add(identifier)
+                changed = True
+    return dirty, removed
+
+
+def remove_components(old_stamps, identifiers):
+    uuids = []
+    for identifier in identifiers:
+        uuids.extend(old_stamps[identifier]["nodes"])
+    nodes = [x for x in mc.ls(uuids, long=True) or [] if mc.nodeType(x) not in KEEP_NODE_TYPES]
+    if not nodes:
+        return None
+    container.unpublish_node(nodes)
+    # children are deleted together with parent
+    dag_nodes = set(x for x in nodes if x.startswith("|"))
+    nodes = [x for x in nodes
+             if not any("|".join(x.split("|")[:i]) in dag_nodes for i in range(2, x.count("|") + 1))]
+    mc.delete(nodes)
+
+
+def remove_rig(rig_grp):
+    asset = mc.container(query=True, findContainer=rig_grp)
+    mc.delete([rig_grp, asset] if asset else [rig_grp])
+
+
+def restore_context(rig_grp, context, old_stamps, identifiers):
+    """context of components that are not rebuilt"""
+    asset = mc.container(query=True, findContainer=rig_grp)
+    child_containers = [x for x in mc.container(asset, query=True, nodeList=True) or []
+                        if mc.nodeType(x) == "container"]
+    context.update({
+        "asset": (asset, rig_grp),
+        "geometry": rig_grp + "|geometry",
+        "skeleton": rig_grp + "|skeleton",
+        "roots": rig_grp + "|roots",
+        "xxx": rig_grp + "|xxx",
+        "callbacks": [],
+        "container": child_containers
+    })
+    if mc.attributeQuery("build_context", node=rig_grp, exists=True):
+        context.update(json.loads(mc.getAttr(rig_grp + ".build_context")))
+
+    def _connections(_attr):
+        nodes = []
+        for element in mc.listAttr(_attr, multi=True) or []:
+            node = mc.listConnections(_attr.split(".")[0] + "." + element, source=True, destination=False)
+            if node:
+                nodes.append(node[0])
+        return nodes
+
+    for identifier in identifiers:
+        root = old_stamps[identifier]["root"]
+        ctls = []
+        for ctl in _connections(root + ".ctls"):
+            selection_list = om2.MSelectionList()
+            selection_list.add(ctl)
+            ctls.append(selection_list.getDagPath(0))
+        context[identifier] = {
+            "root": root,
+            "ctls": ctls,
+            "refs": _connections(root + ".refs"),
+            "jnts": _connections(root + ".jnts")
+        }
+        host = mc.listConnections(root + ".host", source=True, destination=False)
+        if host:
+            context[identifier]["host"] = host[0]
+    log.Logger.info("Restore Context : {0}".format(", ".join(identifiers)))
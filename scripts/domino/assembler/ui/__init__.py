@@ -6,8 +6,6 @@ from . import common_component_settings_ui, jnt_name_setting_ui, manager_ui, pos
 
 # built-ins
 from functools import partial
-import os
-import json
 
 # maya
 from maya import cmds as mc
@@ -16,9 +14,10 @@ from maya.api import OpenMaya as om2
 
 # domino
 from domino import assembler
+from domino.assembler import catalog
 from domino.lib.color import MAYA_OVERRIDE_COLOR
 from domino.lib import attribute, log, hierarchy, utils, polygon
-from domino import DOMINO_CUSTOM_COMPONENT
+from domino.lib.animation import pose
 
 
 class DominoDialog(QtWidgets.QDialog):
@@ -924,41 +923,13 @@ class Manager(ManagerUI):
         self.component_listView.doubleClicked.connect(self.draw_guide)
 
     def refresh_listView(self):
+        # Author is parsed from the component sources. modules are imported when a guide is drawn
+        component_catalog = catalog.get_component_catalog()
         comp = {}
-        default_component_dir = os.path.join(os.path.dirname(assembler.__file__), "component")
-        default_component = {
-            "default":
-                {x: None for x in sorted(os.listdir(default_component_dir)) if
-                 os.path.isdir(os.path.join(default_component_dir, x))}
-        }
-        if "__pycache__" in default_component["default"]:
-            del default_component["default"]["__pycache__"]
-        comp.update(default_component)
-
-        custom_component_dirs = os.getenv(DOMINO_CUSTOM_COMPONENT, None)
-        if custom_component_dirs:
-            dir_list = [os.path.join(custom_component_dirs, x) for x in os.listdir(custom_component_dirs)
-                        if os.path.isdir(os.path.join(custom_component_dirs, x))]
-            for d in dir_list:
-                base_name = os.path.basename(d)
-                custom_component = {
-                    base_name: {x: None for x in sorted(os.listdir(d)) if os.path.isdir(os.path.join(d, x))}
-                }
-                if "__pycache__" in custom_component[base_name]:
-                    del custom_component[base_name]["__pycache__"]
-                for x in custom_component[base_name].copy():
-                    if x in comp["default"].keys():
-                        del custom_component[base_name][x]
-                        log.Logger.warning(f"Already exists component '{x}'")
-                        continue
-                comp.update(custom_component)
-
-        for k in comp:
-            for name in comp[k].copy():
-                mod = assembler.import_component_module(name)
-                comp[k][name] = {"author": mod.Author}
-
-        del comp["default"]["assembly"]
+        for package, names in component_catalog.packages().items():
+            comp[package] = {x: {"author": component_catalog.author(x)} for x in names}
+
+        comp["default"].pop("assembly", None)
         self.model = QtGui.QStandardItemModel(self)
         for repo in comp:
             for name, author in comp[repo].items():
@@ -973,12 +944,12 @@ class Manager(ManagerUI):
             name = item[0].data()
             data = item[0].data(self._role)
             author = data["author"]
-            text = f"{author.description}\n"
+            text = f"{author['description']}\n"
             text += "- - -\n"
             text += f"component : {name}\n\n"
-            text += f"madeBy : {author.madeBy}\n\n"
-            text += f"contact : {author.contact}\n\n"
-            text += f"version : {'{}. {}. {}'.format(*author.version)}\n\n"
+            text += f"madeBy : {author['madeBy']}\n\n"
+            text += f"contact : {author['contact']}\n\n"
+            text += f"version : {'{}. {}. {}'.format(*author['version'])}\n\n"
         else:
             text = ""
         self.description_textEdit.setMarkdown(text)
@@ -1063,13 +1034,13 @@ class PoseManager(PoseManagerUI):
             self.close()
         return self._root
 
-    def get_pose_data(self):
-        return json.loads(mc.getAttr(self.root + ".pose_json").replace("'", "\""))
+    def get_pose_library(self):
+        return pose.get_library(self.root)
 
     def add_pose_data(self, new_pose):
-        original_data = self.get_pose_data()
-        original_data[new_pose[0]] = new_pose[1]
-        mc.setAttr(self.root + ".pose_json", json.dumps(original_data), type="string")
+        library = self.get_pose_library()
+        library.add_pose(new_pose[0], new_pose[1])
+        library.write(self.root)
 
     def create_connections(self):
         self.add_pushButton.clicked.connect(self.add_pose)
@@ -1084,29 +1055,26 @@ class PoseManager(PoseManagerUI):
             self.refresh_listWidget()
 
     def delete_pose(self):
-        pose_data = self.get_pose_data()
+        library = self.get_pose_library()
         items = self.listWidget.selectedItems()
         for item in items:
-            pose = item.data(QtCore.Qt.DisplayRole)
-            del pose_data[pose]
-        mc.setAttr(self.root + ".pose_json", json.dumps(pose_data), type="string")
+            library.remove_pose(item.data(QtCore.Qt.DisplayRole))
+        library.write(self.root)
         self.refresh_listWidget()
 
-    def go_to_pose(self, pose):
-        if isinstance(pose, QtCore.QModelIndex):
-            pose_data = pose.data(self.POSE_ROLE)
-        else:
-            pose_data = self.get_pose_data()[pose]
-        attribute.apply_attr(pose_data)
+    def go_to_pose(self, pose_name):
+        if isinstance(pose_name, QtCore.QModelIndex):
+            pose_name = pose_name.data(self.POSE_ROLE)
+        self.get_pose_library().apply(pose_name)
 
     def refresh_listWidget(self):
-        pose_data = self.get_pose_data()
+        library = self.get_pose_library()
 
         self.listWidget.clear()
 
-        for pose, data in pose_data.items():
-            item = QtWidgets.QListWidgetItem(pose)
-            item.setData(self.POSE_ROLE, data)
+        for pose_name in library.names():
+            item = QtWidgets.QListWidgetItem(pose_name)
+            item.setData(self.POSE_ROLE, pose_name)
             self.listWidget.addItem(item)
 
 
@@ -0,0 +1,2 @@
+# Benchmark scenarios for the builder and the animation tools. see domino.bench.scenarios
+# python -m domino.bench runs them against the stand-in when maya is not importable.
@@ -0,0 +1,49 @@
+# built-ins
+import os
+import sys
+import json
+import argparse
+import importlib.util
+
+# mayapy -m domino.bench -s create_rig collect_attr -r 5 -o bench.json
+# maya.standalone is initialized for the run. the stand-in (scripts/tests/standin) is used when maya is not
+# importable or --standin is given, PYTHONPATH=tests
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="domino.bench", description="run benchmark scenarios")
+    parser.add_argument("-f", "--file_path", help=".domino or .dominob file. rig_templates/biped.domino when not given")
+    parser.add_argument("-s", "--scenarios", nargs="*", help="scenario names. all when not given")
+    parser.add_argument("-r", "--repeat", type=int, default=3)
+    parser.add_argument("-o", "--output", help="report json path")
+    parser.add_argument("--standin", action="store_true", help="run against the stand-in inside maya")
+    args = parser.parse_args(argv)
+
+    use_standin = args.standin
+    standalone = not args.standin and importlib.util.find_spec("maya") is not None
+    if standalone:
+        import maya.standalone
+
+        maya.standalone.initialize()
+    else:
+        import standin
+
+        use_standin = use_standin or standin.install()
+    try:
+        os.environ.setdefault("DOMINO_DEFAULT_COMPONENT", "domino.assembler.component")
+        from domino.bench import scenarios
+
+        kwargs = {"file_path": args.file_path} if args.file_path else {}
+        report = scenarios.run(names=args.scenarios, repeat=args.repeat, use_standin=use_standin, **kwargs)
+    finally:
+        if standalone:
+            maya.standalone.uninitialize()
+    if args.output:
+        with open(args.output, "w", encoding="UTF-8") as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+    json.dump(report, sys.stdout, indent=2, ensure_ascii=False)
+    sys.stdout.write("\n")
+
+
+if __name__ == "__main__":
+    main()
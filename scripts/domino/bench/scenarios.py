@@ -0,0 +1,158 @@
+# maya
+from maya import cmds as mc
+
+# built-ins
+import os
+import time
+import statistics
+from contextlib import contextmanager
+
+# domino
+from domino import assembler
+from domino.assembler import io as assembler_io
+from domino.lib import attribute, log
+from domino.lib.rigging import nurbs
+from domino.lib.animation import anime
+
+# Repeatable benchmark scenarios. each repeat runs in a new scene, setup is not timed.
+# runs inside maya (mayapy) or against the stand-in of scripts/tests (python -m domino.bench).
+
+TEMPLATE_PATH = os.path.join(os.path.dirname(__file__), "..", "..", "..", "rig_templates", "biped.domino")
+FRAME_RANGE = (1, 25)
+
+# {name: scenario function}
+SCENARIOS = {}
+
+
+def scenario(name):
+    """register `func(data)`. it builds the setup and returns the callable to time"""
+
+    def _register(func):
+        SCENARIOS[name] = func
+        return func
+
+    return _register
+
+
+def get_ctls():
+    return mc.ls("*.is_ctl", objectsOnly=True, long=True) or []
+
+
+def get_fk_ik_hosts():
+    return [x for x in mc.ls("*.fk_ik", objectsOnly=True, long=True) or []
+            if mc.attributeQuery("fk_match_source", node=x, exists=True)]
+
+
+@scenario("create_rig")
+def create_rig(data):
+    return lambda: assembler.create_rig(data=data)
+
+
+@scenario("create_guide")
+def create_guide(data):
+    return lambda: assembler.create_guide(data)
+
+
+@scenario("guide_round_trip")
+def guide_round_trip(data):
+    def _run():
+        hierarchy_data = assembler.get_guide_hierarchy(guide_root)
+        component = assembler.convert_node_to_component(hierarchy_data)
+        return assembler.convert_component_to_data(component)
+
+    assembler.create_guide(data)
+    guide_root = mc.ls(selection=True, long=True)[0]
+    return _run
+
+
+@scenario("nurbs_data")
+def nurbs_data(data):
+    assembler.create_rig(data=data)
+    ctls = get_ctls()
+    return lambda: [nurbs.data(x) for x in ctls]
+
+
+@scenario("nurbs_build")
+def nurbs_build(data):
+    assembler.create_rig(data=data)
+    curve_data = [nurbs.data(x) for x in get_ctls()]
+    parent = mc.createNode("transform", name="bench_nurbs_build")
+    return lambda: [nurbs.build(x, name="bench_crv", parent=parent) for x in curve_data]
+
+
+@scenario("collect_attr")
+def collect_attr(data):
+    assembler.create_rig(data=data)
+    ctls = get_ctls()
+    return lambda: attribute.collect_attr(ctls)
+
+
+@scenario("mirror_pose")
+def mirror_pose(data):
+    def _run():
+        for f in range(*FRAME_RANGE):
+            mc.currentTime(f)
+            anime.mirror_pose(ctls, flip=True)
+
+    assembler.create_rig(data=data)
+    # assembly controls have no mirror target
+    ctls = [x for x in get_ctls() if mc.attributeQuery("mirror_ctl_name", node=x, exists=True)
+            and mc.getAttr(x + ".mirror_ctl_name")]
+    return _run
+
+
+@scenario("mirror_clip")
+def mirror_clip(data):
+    assembler.create_rig(data=data)
+    ctls = [x for x in get_ctls() if mc.attributeQuery("mirror_ctl_name", node=x, exists=True)
+            and mc.getAttr(x + ".mirror_ctl_name")]
+    return lambda: anime.mirror_pose(ctls, flip=True, frame_range=FRAME_RANGE)
+
+
+@scenario("switch_fk_ik")
+def switch_fk_ik(data):
+    assembler.create_rig(data=data)
+    hosts = get_fk_ik_hosts()
+    return lambda: anime.switch_fk_ik(hosts, frame_range=FRAME_RANGE, set_key=True)
+
+
+@contextmanager
+def new_scene(use_standin=False):
+    if use_standin:
+        import standin
+
+        with standin.patch():
+            yield
+        return
+    mc.file(new=True, force=True)
+    yield
+
+
+def run_scenario(name, data, repeat=3, use_standin=False):
+    times = []
+    node_count = 0
+    for _ in range(repeat):
+        with new_scene(use_standin):
+            run = SCENARIOS[name](data)
+            count = len(mc.ls())
+            start_time = time.perf_counter()
+            run()
+            times.append(time.perf_counter() - start_time)
+            node_count = len(mc.ls()) - count
+    return {"repeat": repeat,
+            "min": min(times),
+            "mean": statistics.mean(times),
+            "median": statistics.median(times),
+            "node_count": node_count}
+
+
+def run(names=None, file_path=TEMPLATE_PATH, repeat=3, use_standin=False):
+    """{"maya": str, "template": str, "scenarios": {name: {repeat, min, mean, median, node_count}}}"""
+    data = assembler_io.read(file_path)
+    report = {"maya": "standin" if use_standin else mc.about(version=True),
+              "template": os.path.basename(file_path),
+              "scenarios": {}}
+    for name in names or SCENARIOS:
+        log.Logger.info("Bench : `{0}`".format(name))
+        report["scenarios"][name] = run_scenario(name, data, repeat, use_standin)
+    return report
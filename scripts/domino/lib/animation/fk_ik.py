@@ -0,0 +1,204 @@
+# maya
+from maya import cmds as mc
+from maya.api import OpenMaya as om2
+
+# numpy
+import numpy as np
+
+# domino
+from domino.lib import modifier, npmath
+
+# Frame range fk / ik match. the matrices of every host are sampled for the whole range with one time context
+# per frame, the targets are solved with numpy and keyed in one modifier. the current time is not changed.
+#
+# matrices are row major like maya, world = local @ parent. the parent space of a node is
+# inverse(matrix) @ worldMatrix, so offsetParentMatrix and the npo are part of it.
+
+TRANSLATE_ATTRS = ["tx", "ty", "tz"]
+ROTATE_ATTRS = ["rx", "ry", "rz"]
+# mc.aimConstraint default world up vector
+CLAVICLE_WORLD_UP = [0.0, 1.0, 0.0]
+
+
+def _connections(host, attr):
+    return mc.listConnections(host + "." + attr, source=True, destination=False) or []
+
+
+def _matrix(values):
+    return np.reshape(list(values), (4, 4))
+
+
+def sample(nodes, frames):
+    """{node: (worldMatrix, matrix)} of the nodes, each (len(frames), 4, 4). one MDGContext per frame"""
+    plugs = []
+    for node in nodes:
+        obj = modifier.get_node(node)
+        plugs.append(modifier.find_plug(obj, "worldMatrix[0]"))
+        plugs.append(modifier.find_plug(obj, "matrix"))
+    values = np.empty((len(plugs), len(frames), 4, 4))
+    for i, frame in enumerate(frames):
+        previous = om2.MDGContext(om2.MTime(frame, om2.MTime.uiUnit())).makeCurrent()
+        try:
+            for j, plug in enumerate(plugs):
+                values[j, i] = _matrix(om2.MFnMatrixData(plug.asMObject()).matrix())
+        finally:
+            previous.makeCurrent()
+    return {node: (values[i * 2], values[i * 2 + 1]) for i, node in enumerate(nodes)}
+
+
+def parent_space(world, local):
+    return np.linalg.inv(local) @ world
+
+
+def translations(matrices):
+    """(frames, 3) translate values in the ui distance unit"""
+    return matrices[:, 3, :3] * om2.MDistance(1.0).asUnits(om2.MDistance.uiUnit())
+
+
+def rotations(matrices, rotate_order):
+    """(frames, 3) rotate values in the ui angle unit. scale is removed first, the frames are unwrapped"""
+    rotation = npmath.normalize(matrices[:, :3, :3])
+    m = np.tile(np.identity(4), (len(matrices), 1, 1))
+    m[:, :3, :3] = rotation
+    eulers = [om2.MEulerRotation.decompose(om2.MMatrix(x.flatten().tolist()), rotate_order) for x in m]
+    radians = np.unwrap(np.asarray([[x.x, x.y, x.z] for x in eulers]).reshape(-1, 3), axis=0)
+    return radians * om2.MAngle(1.0).asUnits(om2.MAngle.uiUnit())
+
+
+def with_rotation(local, rotation):
+    """local matrices with the rotation of `rotation`. scale and translation of `local` are kept"""
+    m = local.copy()
+    m[:, :3, :3] = npmath.normalize(rotation[:, :3, :3]) * np.linalg.norm(local[:, :3, :3], axis=2, keepdims=True)
+    return m
+
+
+def channels(ctl, local, attrs):
+    """{attr: (frames,) values} of the ctl local matrices"""
+    values = np.concatenate([translations(local), rotations(local, int(mc.getAttr(ctl + ".ro")))], axis=1)
+    return {attr: values[:, (TRANSLATE_ATTRS + ROTATE_ATTRS).index(attr)] for attr in attrs}
+
+
+class FkIkMatch:
+    """fk / ik match of one host. see switch_fk_ik
+
+    ik to fk -- the fk controls take the world rotation of the ik joints, down the chain
+    fk to ik -- the ik control takes the world matrix of the match source, the pole vector control goes to
+                the pole vector of the fk chain
+    clavicle -- the clavicle control keeps aiming at the position the match source had before the switch, like
+                the aim constraint of the legacy match. it is solved after the switch
+    """
+
+    def __init__(self, host):
+        self.host = host
+        self.fk_ik = round(mc.getAttr(host + ".fk_ik"), 0)
+        self.clavicle_ctl = None
+        if mc.attributeQuery("clavicle_ctl", node=host, exists=True):
+            self.clavicle_ctl = _connections(host, "clavicle_ctl")[0]
+
+        self.offset = None
+        if self.fk_ik:
+            self.source = _connections(host, "fk_match_source")
+            self.target = _connections(host, "fk_match_target")
+        else:
+            self.source = _connections(host, "ik_match_source")
+            self.target = _connections(host, "ik_match_target")
+            component_root = _connections(host, "component_root")[0]
+            self.offset = mc.getAttr(component_root + ".offset_pole_vec")
+
+        # index of the nearest target above each target, fk controls follow the solved control above them
+        paths = [mc.ls(x, long=True)[0] for x in self.target]
+        self.parents = []
+        for i, path in enumerate(paths):
+            above = [j for j in range(i) if path.startswith(paths[j] + "|")]
+            self.parents.append(above[-1] if above else None)
+
+    def nodes(self):
+        return self.source + self.target + ([self.clavicle_ctl] if self.clavicle_ctl else [])
+
+    def solve(self, samples):
+        """{ctl: {attr: (frames,) values}} of the targets and {attr: value} of the host"""
+        values = {}
+        if self.fk_ik:
+            # {target index: solved world matrices}
+            solved = {}
+            for i, ctl in enumerate(self.target):
+                world, local = samples[ctl]
+                space = parent_space(world, local)
+                if self.parents[i] is not None:
+                    parent_world = samples[self.target[self.parents[i]]][0]
+                    space = space @ np.linalg.inv(parent_world) @ solved[self.parents[i]]
+                local = with_rotation(local, samples[self.source[i]][0] @ np.linalg.inv(space))
+                solved[i] = local @ space
+                values[ctl] = channels(ctl, local, TRANSLATE_ATTRS + ROTATE_ATTRS)
+        else:
+            ik_ctl, pole_vec_ctl = self.target
+            positions = [samples[x][0][:, 3, :3] for x in self.source[:3]]
+            pole_vec_m = np.tile(np.identity(4), (len(positions[0]), 1, 1))
+            pole_vec_m[:, 3, :3] = npmath.calculate_pole_vectors(*positions, self.offset)
+            for ctl, world in [(ik_ctl, samples[self.source[-1]][0]), (pole_vec_ctl, pole_vec_m)]:
+                local = world @ np.linalg.inv(parent_space(*samples[ctl]))
+                values[ctl] = channels(ctl, local, TRANSLATE_ATTRS + ROTATE_ATTRS)
+        return values, {"fk_ik": 0 if self.fk_ik else 1}
+
+    def solve_clavicle(self, samples, switched):
+        """clavicle channels of the aim constraint the legacy match made (fix_auto_clavicle). the clavicle aims at
+        the position the first match source had before the switch. x aim, world y up, the offset is maintained"""
+        world, local = samples[self.clavicle_ctl]
+        switched_world = switched[self.clavicle_ctl][0]
+        target = samples[self.source[0]][0][:, 3, :3]
+        up = np.tile(CLAVICLE_WORLD_UP, (len(world), 1))
+        aim = npmath.get_look_at_matrices(world[:, 3, :3], target, up)[:, :3, :3]
+        switched_aim = npmath.get_look_at_matrices(switched_world[:, 3, :3], target, up)[:, :3, :3]
+        # world rotation = offset @ aim rotation
+        rotation = switched_world.copy()
+        rotation[:, :3, :3] = npmath.normalize(world[:, :3, :3]) @ np.transpose(aim, (0, 2, 1)) @ switched_aim
+        local = with_rotation(local, rotation @ np.linalg.inv(parent_space(*switched[self.clavicle_ctl])))
+        return {self.clavicle_ctl: channels(self.clavicle_ctl, local, TRANSLATE_ATTRS + ROTATE_ATTRS)}
+
+
+def write(values, frames, set_key):
+    """set or key {node: {attr: (frames,) values}} in one modifier. locked channels are skipped"""
+    with modifier.batch():
+        for node, attrs in values.items():
+            obj = modifier.get_node(node)
+            for attr, value in attrs.items():
+                if modifier.find_plug(obj, attr).isLocked:
+                    continue
+                value = np.broadcast_to(value, (len(frames),)).tolist()
+                if set_key:
+                    modifier.set_keys(node, attr, frames, value)
+                else:
+                    modifier.set_attr(node, attr, value[-1])
+
+
+def switch_fk_ik(hosts, frame_range=(), set_key=False):
+    """match and switch the hosts over the frame range. every host is sampled in one pass over the frames.
+
+    frame_range -- (start, end). end is excluded. the current frame when not given
+    set_key -- key every frame of the range. without it, the current frame is matched and set and the range is not
+               used. the legacy match walked the range without keys too, it left the values of the last frame
+    """
+    current = mc.currentTime(query=True)
+    frames = [current]
+    if set_key and frame_range:
+        frames = list(range(int(frame_range[0]), int(frame_range[1])))
+
+    matches = [FkIkMatch(x) for x in hosts]
+    nodes = list(dict.fromkeys(x for match in matches for x in match.nodes()))
+    samples = sample(nodes, frames)
+
+    values = {}
+    for match in matches:
+        target_values, host_values = match.solve(samples)
+        values.update(target_values)
+        values.setdefault(match.host, {}).update(host_values)
+    write(values, frames, set_key)
+
+    # the clavicles follow the switched arm, they are sampled again after the switch
+    clavicles = [x for x in matches if x.clavicle_ctl]
+    if clavicles:
+        switched = sample([x.clavicle_ctl for x in clavicles], frames)
+        values = {}
+        for match in clavicles:
+            values.update(match.solve_clavicle(samples, switched))
+        write(values, frames, set_key)
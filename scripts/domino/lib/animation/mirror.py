@@ -0,0 +1,184 @@
+# maya
+from maya import cmds as mc
+from maya.api import OpenMaya as om2
+
+# built-ins
+import json
+
+# domino
+from domino.lib import attribute, modifier
+
+# Mirror table of a rig. every control with its mirror control, mirrored channels and signs, kept on the asset root.
+#
+# {ctl: [mirror ctl, [attr, ...], [sign, ...]]}. names without namespace
+#
+# written at rig build, so a rebuilt rig has a new table. rigs built before it compute the table on first use.
+# a channel is mirrored when it is unlocked on both controls, the sign is the inv flag of the source control.
+
+ATTRIBUTE_NAME = "mirror_table"
+TRANSFORM_ATTRS = ["tx", "ty", "tz", "rx", "ry", "rz", "sx", "sy", "sz"]
+
+
+def _strip_namespace(name):
+    return name.split("|")[-1].split(":")[-1]
+
+
+def get_channels(ctl):
+    """[(attr, sign)] unlocked transform channels and keyable numeric user attributes.
+    the sign is -1 when the inv flag of the channel is on. see attribute.add_mirror_config_channels"""
+    fn_node = om2.MFnDependencyNode(modifier.get_node(ctl))
+    attrs = TRANSFORM_ATTRS + (mc.listAttr(ctl, userDefined=True, keyable=True) or [])
+    channels = []
+    for attr in attrs:
+        plug = fn_node.findPlug(attr, False)
+        obj = plug.attribute()
+        if plug.isLocked or plug.isCompound or obj.hasFn(om2.MFn.kMessageAttribute) or \
+                obj.hasFn(om2.MFn.kTypedAttribute) or obj.hasFn(om2.MFn.kEnumAttribute):
+            continue
+        inv_attr = "inv" + attr.capitalize()
+        sign = -1 if fn_node.hasAttribute(inv_attr) and fn_node.findPlug(inv_attr, False).asBool() else 1
+        channels.append((attr, sign))
+    return channels
+
+
+def compute_table(ctls):
+    """mirror table of the controls. controls without a mirror control are left out"""
+    namespace = ""
+    if ctls and ":" in ctls[0].split("|")[-1]:
+        namespace = ctls[0].split("|")[-1].rsplit(":", 1)[0] + ":"
+    table = {}
+    for ctl in ctls:
+        if not mc.attributeQuery("mirror_ctl_name", node=ctl, exists=True):
+            continue
+        mirror_ctl = mc.getAttr(ctl + ".mirror_ctl_name")
+        if not mirror_ctl or not mc.objExists(namespace + mirror_ctl):
+            continue
+        fn_mirror = om2.MFnDependencyNode(modifier.get_node(namespace + mirror_ctl))
+        channels = [(attr, sign) for attr, sign in get_channels(ctl)
+                    if fn_mirror.hasAttribute(attr) and not fn_mirror.findPlug(attr, False).isLocked]
+        table[_strip_namespace(ctl)] = [mirror_ctl, [x[0] for x in channels], [x[1] for x in channels]]
+    return table
+
+
+def get_ctls(asset_root):
+    """controls and hosts of the rig that have a mirror control name"""
+    namespace = asset_root.rsplit(":", 1)[0] + ":" if ":" in asset_root else ""
+    return [x for x in mc.ls(namespace + "*.mirror_ctl_name", objectsOnly=True, long=True) or []
+            if x.split("|")[1] == asset_root]
+
+
+def write_table(asset_root):
+    attribute.add_attr(asset_root, longName=ATTRIBUTE_NAME, type="string")
+    mc.setAttr(asset_root + "." + ATTRIBUTE_NAME, json.dumps(compute_table(get_ctls(asset_root))), type="string")
+
+
+class MirrorTable:
+    """mirror table of one rig. plugs are resolved once per control.
+
+    table = get_table(asset_root)
+    table.mirror(ctls, flip=True, frame_range=(1, 101))
+    """
+
+    def __init__(self, data, namespace=""):
+        # {ctl: [mirror ctl, [attr], [sign]]}
+        self.data = data
+        self.namespace = namespace
+        # {ctl: ([source plug], [attribute.get_plug_type], [(destination ctl, attr)], signs)}
+        self._rows = {}
+
+    def _ctl_rows(self, ctl):
+        if ctl not in self._rows:
+            mirror_ctl, attrs, signs = self.data[ctl]
+            obj = modifier.get_node(self.namespace + ctl)
+            plugs = [modifier.find_plug(obj, attr) for attr in attrs]
+            self._rows[ctl] = (plugs,
+                               [attribute.get_plug_type(x) for x in plugs],
+                               [(self.namespace + mirror_ctl, attr) for attr in attrs],
+                               signs)
+        return self._rows[ctl]
+
+    def rows(self, ctls, flip=False):
+        """source plugs, their types, destinations and signs of the controls.
+        flip adds the mirror controls, so both sides swap. a destination written twice keeps the last row"""
+        ctls = [_strip_namespace(x) for x in ctls]
+        ctls = [x for x in ctls if x in self.data]
+        sources = []
+        for ctl in ctls:
+            sources.append(ctl)
+            mirror_ctl = self.data[ctl][0]
+            if flip and mirror_ctl not in ctls and mirror_ctl in self.data:
+                sources.append(mirror_ctl)
+
+        # {(destination ctl, attr): row}
+        destinations = {}
+        plugs = []
+        types = []
+        signs = []
+        for ctl in sources:
+            ctl_plugs, ctl_types, ctl_destinations, ctl_signs = self._ctl_rows(ctl)
+            for i, destination in enumerate(ctl_destinations):
+                destinations[destination] = len(plugs)
+                plugs.append(ctl_plugs[i])
+                types.append(ctl_types[i])
+                signs.append(ctl_signs[i])
+        indices = list(destinations.values())
+        return [plugs[i] for i in indices], [types[i] for i in indices], list(destinations), \
+            [signs[i] for i in indices]
+
+    @staticmethod
+    def read(plugs, types, frames=None):
+        """values of the plugs. one row per frame sampled with a time context, or the current values"""
+        if frames is None:
+            return [attribute.get_plug_value(x, t) for x, t in zip(plugs, types)]
+        values = []
+        for frame in frames:
+            previous = om2.MDGContext(om2.MTime(frame, om2.MTime.uiUnit())).makeCurrent()
+            try:
+                values.append([attribute.get_plug_value(x, t) for x, t in zip(plugs, types)])
+            finally:
+                previous.makeCurrent()
+        return values
+
+    def mirror(self, ctls, flip=False, frame_range=()):
+        """mirror the controls to their mirror controls in one undoable modifier.
+
+        flip -- swap both sides
+        frame_range -- (start, end). end is excluded. keys every frame of the range instead of setting the values
+        """
+        plugs, types, destinations, signs = self.rows(ctls, flip)
+        if not plugs:
+            return None
+        frames = list(range(int(frame_range[0]), int(frame_range[1]))) if frame_range else None
+        # every value is read before the first one is written
+        values = self.read(plugs, types, frames)
+        with modifier.batch():
+            if frames is None:
+                for (ctl, attr), value, sign in zip(destinations, values, signs):
+                    modifier.set_attr(ctl, attr, value * sign)
+            else:
+                for i, (ctl, attr) in enumerate(destinations):
+                    modifier.set_keys(ctl, attr, frames, [x[i] * signs[i] for x in values])
+
+
+def get_asset_root(ctl):
+    return mc.ls(ctl, long=True)[0].split("|")[1]
+
+
+# {asset root: (MObjectHandle, attribute text, MirrorTable)}
+_tables = {}
+
+
+def get_table(asset_root):
+    """mirror table of the asset root. computed again when the rig is rebuilt or the attribute changed"""
+    handle = om2.MObjectHandle(modifier.get_node(asset_root))
+    text = None
+    if mc.attributeQuery(ATTRIBUTE_NAME, node=asset_root, exists=True):
+        text = mc.getAttr(asset_root + "." + ATTRIBUTE_NAME) or None
+    cached = _tables.get(asset_root)
+    if cached and cached[0].isValid() and cached[0].hashCode() == handle.hashCode() and cached[1] == text:
+        return cached[2]
+
+    namespace = asset_root.rsplit(":", 1)[0] + ":" if ":" in asset_root else ""
+    table = MirrorTable(json.loads(text) if text else compute_table(get_ctls(asset_root)), namespace)
+    _tables[asset_root] = (handle, text, table)
+    return table
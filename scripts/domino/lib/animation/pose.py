@@ -0,0 +1,334 @@
+# maya
+from maya import cmds as mc
+
+# built-ins
+import json
+import zlib
+import base64
+import struct
+import importlib.util
+
+# domino
+from domino.lib import attribute
+
+# Pose library of a rig. poses are packed arrays over one channel table, kept on the assembly root.
+#
+# header  | magic(4s) version(H) index size(I)
+# index   | json. {"channels": [[ctl, attr], ...], "types": "fib...", "poses": [{name, covered, changed}, ...]}
+# blob    | neutral values (double), channels with a neutral (uint8), then per pose the covered channels (uint32),
+#         | the changed channels (uint32) and their deltas from neutral (double)
+#
+# the channel table only grows, stored indices stay valid. a channel first seen in a pose has no neutral,
+# its deltas are from 0 and "neutral" leaves it as it is. the attribute holds the zlib compressed library
+# as base64 text, dump / load write the same bytes to a sidecar file.
+#
+# numpy is imported when a library is used. without numpy, a new rig keeps its neutral in pose_json.
+
+ATTRIBUTE_NAME = "pose_library"
+LEGACY_ATTRIBUTE_NAME = "pose_json"
+NEUTRAL = "neutral"
+EXTENSION = ".dominop"
+MAGIC = b"DMNP"
+VERSION = 1
+HEADER = struct.Struct("<4sHI")
+
+FLOAT = "f"
+INT = "i"
+BOOL = "b"
+
+
+def _value_type(value):
+    if isinstance(value, bool):
+        return BOOL
+    elif isinstance(value, int):
+        return INT
+    return FLOAT
+
+
+class Pose:
+
+    def __init__(self, name, covered, indices, deltas):
+        import numpy as np
+
+        self.name = name
+        # channels the pose sets
+        self.covered = np.asarray(covered, dtype=np.uint32)
+        # changed channels and their deltas from neutral
+        self.indices = np.asarray(indices, dtype=np.uint32)
+        self.deltas = np.asarray(deltas, dtype=float)
+
+
+class PoseLibrary:
+    """neutral and poses of a rig. poses are deltas from neutral, a partial pose covers some channels only.
+
+    library = get_library(assembly_root)
+    library.add_pose("smile", attribute.collect_attr(mouth_ctls))
+    library.write(assembly_root)
+    library.apply(["smile", "blink_L"], [0.5, 1.0], namespace="char1:")
+    """
+
+    def __init__(self):
+        import numpy as np
+
+        # [(ctl, attr)]
+        self.channels = []
+        self.types = []
+        # {(ctl, attr): channel index}
+        self._channel_indices = {}
+        self.neutral = np.zeros(0)
+        self.has_neutral = np.zeros(0, dtype=bool)
+        # {name: Pose}
+        self.poses = {}
+        # {name: delta over every channel}. blend cache
+        self._dense = {}
+
+    def __contains__(self, name):
+        return name == NEUTRAL or name in self.poses
+
+    def names(self):
+        return [NEUTRAL] + list(self.poses)
+
+    def _add_channel(self, ctl, attr, value):
+        import numpy as np
+
+        key = (ctl, attr)
+        index = self._channel_indices.get(key)
+        if index is None:
+            index = self._channel_indices[key] = len(self.channels)
+            self.channels.append(key)
+            self.types.append(_value_type(value))
+            self.neutral = np.append(self.neutral, 0.0)
+            self.has_neutral = np.append(self.has_neutral, False)
+            self._dense.clear()
+        return index
+
+    def _flatten(self, data):
+        """channel indices and values of a collect_attr dict"""
+        import numpy as np
+
+        indices = []
+        values = []
+        for ctl in data:
+            for attr, value in data[ctl].items():
+                indices.append(self._add_channel(ctl, attr, value))
+                values.append(float(value))
+        return np.asarray(indices, dtype=np.uint32), np.asarray(values, dtype=float)
+
+    def set_neutral(self, data):
+        """data is a collect_attr dict. poses keep their deltas, values of channels without a neutral are kept"""
+        import numpy as np
+
+        indices, values = self._flatten(data)
+        new = ~self.has_neutral[indices]
+        if new.any():
+            # covered channels without a neutral are from 0, the unchanged ones too
+            rebase = np.zeros(len(self.channels))
+            rebase[indices[new]] = values[new]
+            for name, pose in self.poses.items():
+                delta = np.zeros(len(self.channels))
+                delta[pose.indices] = pose.deltas
+                delta[pose.covered] -= rebase[pose.covered]
+                pose.indices = pose.covered[delta[pose.covered] != 0]
+                pose.deltas = delta[pose.indices]
+                self._dense.pop(name, None)
+        self.neutral[indices] = values
+        self.has_neutral[indices] = True
+
+    def add_pose(self, name, data):
+        """data is a collect_attr dict. the pose covers the channels in it"""
+        import numpy as np
+
+        if name == NEUTRAL:
+            self.set_neutral(data)
+            return
+        indices, values = self._flatten(data)
+        deltas = values - self.neutral[indices]
+        changed = deltas != 0
+        self.poses[name] = Pose(name, np.unique(indices), indices[changed], deltas[changed])
+        self._dense.pop(name, None)
+
+    def remove_pose(self, name):
+        self.poses.pop(name, None)
+        self._dense.pop(name, None)
+
+    def _delta(self, name):
+        import numpy as np
+
+        if name == NEUTRAL:
+            return np.zeros(len(self.channels))
+        if name not in self._dense:
+            pose = self.poses[name]
+            delta = np.zeros(len(self.channels))
+            delta[pose.indices] = pose.deltas
+            self._dense[name] = delta
+        return self._dense[name]
+
+    def _covered(self, name):
+        if name == NEUTRAL:
+            return self.has_neutral
+        return self.poses[name].covered
+
+    def blend(self, names, weights=None):
+        """neutral + sum(weight * delta) over the channels the poses cover. returns (channel indices, values)
+
+        names -- pose names. "neutral" resets every channel that has a neutral
+        weights -- one per pose. 1.0 when not given
+        """
+        import numpy as np
+
+        if isinstance(names, str):
+            names = [names]
+        weights = np.ones(len(names)) if weights is None else np.asarray(weights, dtype=float)
+        if not names:
+            return np.zeros(0, dtype=np.uint32), np.zeros(0)
+        values = self.neutral + weights @ np.stack([self._delta(x) for x in names])
+        mask = np.zeros(len(self.channels), dtype=bool)
+        for name in names:
+            mask[self._covered(name)] = True
+        indices = np.flatnonzero(mask)
+        values = values[indices]
+        rounded = np.asarray([self.types[i] != FLOAT for i in indices], dtype=bool)
+        values[rounded] = np.rint(values[rounded])
+        return indices, values
+
+    def to_dict(self, indices, values):
+        """{ctl: {attr: value}} like collect_attr"""
+        data = {}
+        for index, value in zip(indices.tolist(), values.tolist()):
+            ctl, attr = self.channels[index]
+            value_type = self.types[index]
+            data.setdefault(ctl, {})[attr] = bool(value) if value_type == BOOL else \
+                int(value) if value_type == INT else value
+        return data
+
+    def pose_data(self, name):
+        return self.to_dict(*self.blend([name]))
+
+    def apply(self, names, weights=None, namespace=":", *args, **kwargs):
+        """set the blend of the poses. one undoable modifier. see attribute.apply_attr"""
+        attribute.apply_attr(self.to_dict(*self.blend(names, weights)), namespace)
+
+    def dumps(self):
+        import numpy as np
+
+        index = {"channels": [list(x) for x in self.channels], "types": "".join(self.types), "poses": []}
+        blob = bytearray(self.neutral.astype("<f8").tobytes())
+        blob += self.has_neutral.astype(np.uint8).tobytes()
+        for name, pose in self.poses.items():
+            index["poses"].append({"name": name,
+                                   "covered": len(pose.covered),
+                                   "changed": len(pose.indices)})
+            blob += pose.covered.astype("<u4").tobytes()
+            blob += pose.indices.astype("<u4").tobytes()
+            blob += pose.deltas.astype("<f8").tobytes()
+        index = json.dumps(index, ensure_ascii=False, separators=(",", ":")).encode("UTF-8")
+        return zlib.compress(HEADER.pack(MAGIC, VERSION, len(index)) + index + bytes(blob))
+
+    @classmethod
+    def loads(cls, buffer):
+        import numpy as np
+
+        buffer = zlib.decompress(buffer)
+        magic, version, index_size = HEADER.unpack_from(buffer, 0)
+        if magic != MAGIC:
+            raise ValueError("Not a domino pose library")
+        if version > VERSION:
+            raise ValueError("Unsupported domino pose library version {0}".format(version))
+        index = json.loads(buffer[HEADER.size:HEADER.size + index_size].decode("UTF-8"))
+        offset = HEADER.size + index_size
+
+        def _read(dtype, count):
+            nonlocal offset
+            array = np.frombuffer(buffer, dtype=dtype, count=count, offset=offset).astype(dtype[1:])
+            offset += array.nbytes
+            return array
+
+        library = cls()
+        library.channels = [tuple(x) for x in index["channels"]]
+        library.types = list(index["types"])
+        library._channel_indices = {x: i for i, x in enumerate(library.channels)}
+        library.neutral = _read("<f8", len(library.channels))
+        library.has_neutral = _read("|u1", len(library.channels)).astype(bool)
+        for record in index["poses"]:
+            covered = _read("<u4", record["covered"])
+            indices = _read("<u4", record["changed"])
+            library.poses[record["name"]] = Pose(record["name"], covered, indices, _read("<f8", record["changed"]))
+        return library
+
+    def dump(self, file_path):
+        with open(file_path, "wb") as f:
+            f.write(self.dumps())
+
+    @classmethod
+    def load(cls, file_path):
+        with open(file_path, "rb") as f:
+            return cls.loads(f.read())
+
+    @classmethod
+    def from_legacy(cls, text):
+        """pose_json text. {pose: {ctl: {attr: value}}}"""
+        library = cls()
+        data = json.loads(text.replace("'", "\"")) if text else {}
+        library.set_neutral(data.get(NEUTRAL) or {})
+        for name, pose_data in data.items():
+            if name != NEUTRAL:
+                library.add_pose(name, pose_data)
+        return library
+
+    def write(self, root):
+        text = base64.b64encode(self.dumps()).decode("ascii")
+        attribute.add_attr(root, longName=ATTRIBUTE_NAME, type="string")
+        mc.setAttr(root + "." + ATTRIBUTE_NAME, text, type="string")
+        _libraries[root] = (text, self)
+
+
+# {root: (attribute text, PoseLibrary)}
+_libraries = {}
+
+
+def has_numpy():
+    return importlib.util.find_spec("numpy") is not None
+
+
+def _text(root, attr):
+    if not mc.attributeQuery(attr, node=root, exists=True):
+        return ""
+    return mc.getAttr(root + "." + attr) or ""
+
+
+def get_legacy_data(root):
+    """{pose: {ctl: {attr: value}}} of pose_json. read without numpy"""
+    text = _text(root, LEGACY_ATTRIBUTE_NAME)
+    return json.loads(text.replace("'", "\"")) if text else {}
+
+
+def is_empty(root):
+    """no neutral and no pose on the root. checked without numpy"""
+    return not _text(root, ATTRIBUTE_NAME) and not any(get_legacy_data(root).values())
+
+
+def write_neutral(root, data):
+    """neutral of a new rig. data is a collect_attr dict. without numpy it goes in pose_json"""
+    if has_numpy():
+        library = PoseLibrary()
+        library.set_neutral(data)
+        library.write(root)
+        return
+    attribute.add_attr(root, longName=LEGACY_ATTRIBUTE_NAME, type="string")
+    mc.setAttr(root + "." + LEGACY_ATTRIBUTE_NAME, json.dumps({NEUTRAL: data}), type="string")
+
+
+def get_library(root):
+    """pose library of the assembly root. decoded again only when the attribute changed.
+    a rig without a library has its pose_json read instead"""
+    text = _text(root, ATTRIBUTE_NAME)
+    if text:
+        cached = _libraries.get(root)
+        if cached and cached[0] == text:
+            return cached[1]
+        library = PoseLibrary.loads(base64.b64decode(text))
+        _libraries[root] = (text, library)
+        return library
+    if mc.attributeQuery(LEGACY_ATTRIBUTE_NAME, node=root, exists=True):
+        return PoseLibrary.from_legacy(mc.getAttr(root + "." + LEGACY_ATTRIBUTE_NAME))
+    return PoseLibrary()
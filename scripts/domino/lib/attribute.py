@@ -4,6 +4,10 @@ from maya.api import OpenMaya as om2
 
 # built-ins
 import re
+import json
+
+# domino
+from . import modifier
 
 
 def get_index(attr):
@@ -20,57 +24,72 @@ def get_plug(node, attr):
     return fn_node.findPlug(attr, 0)
 
 
+DATA_TYPES = ["string",
+              "stringArray",
+              "matrix",
+              "reflectanceRGB",
+              "spectrumRGB",
+              "doubleArray",
+              "floatArray",
+              "Int32Array",
+              "vectorArray",
+              "nurbsCurve",
+              "nurbsSurface",
+              "mesh",
+              "lattice",
+              "pointArray"]
+ATTRIBUTE_TYPES = ["bool",
+                   "long",
+                   "short",
+                   "byte",
+                   "char",
+                   "enum",
+                   "float",
+                   "double",
+                   "doubleAngle",
+                   "doubleLinear",
+                   "compound",
+                   "message",
+                   "time",
+                   "fltMatrix",
+                   "reflectance",
+                   "spectrum",
+                   "float2",
+                   "float3",
+                   "double2",
+                   "double3",
+                   "long2",
+                   "long3",
+                   "short2",
+                   "short3"]
+
+
+def solve_type(_type):
+    if _type in DATA_TYPES:
+        return {"dataType": _type}
+    elif _type in ATTRIBUTE_TYPES:
+        return {"attributeType": _type}
+
+
+def color_attr_args(**add_attr_args):
+    """float3 add_attr arguments with the _r, _g, _b children. modifier.create_attribute makes it in one go"""
+    add_attr_args = dict(add_attr_args, usedAsColor=True)
+    add_attr_args["children"] = [{"longName": add_attr_args["longName"] + x, "attributeType": "float"}
+                                 for x in ["_r", "_g", "_b"]]
+    return add_attr_args
+
+
 def add_attr(node, **add_attr_args):
-    def solve_type(_type):
-        datatypes = ["string",
-                     "stringArray",
-                     "matrix",
-                     "reflectanceRGB",
-                     "spectrumRGB",
-                     "doubleArray",
-                     "floatArray",
-                     "Int32Array",
-                     "vectorArray",
-                     "nurbsCurve",
-                     "nurbsSurface",
-                     "mesh",
-                     "lattice",
-                     "pointArray"]
-        attribute_types = ["bool",
-                           "long",
-                           "short",
-                           "byte",
-                           "char",
-                           "enum",
-                           "float",
-                           "double",
-                           "doubleAngle",
-                           "doubleLinear",
-                           "compound",
-                           "message",
-                           "time",
-                           "fltMatrix",
-                           "reflectance",
-                           "spectrum",
-                           "float2",
-                           "float3",
-                           "double2",
-                           "double3",
-                           "long2",
-                           "long3",
-                           "short2",
-                           "short3"]
-        if _type in datatypes:
-            return {"dataType": _type}
-        elif _type in attribute_types:
-            return {"attributeType": _type}
+    add_attr_args.update(solve_type(add_attr_args.pop("type")))
+    is_color = "attributeType" in add_attr_args and add_attr_args["attributeType"] == "float3"
+
+    if modifier.is_active():
+        return modifier.add_attr(node, **(color_attr_args(**add_attr_args) if is_color else add_attr_args))
 
     if mc.attributeQuery(add_attr_args["longName"], node=node, exists=True):
         return None
 
-    add_attr_args.update(solve_type(add_attr_args.pop("type")))
-
-    if "attributeType" in add_attr_args and add_attr_args["attributeType"] == "float3":
+    if is_color:
         return add_color_attr(node, **add_attr_args)
 
     mc.addAttr(node, **add_attr_args)
@@ -112,26 +131,158 @@ def add_mirror_config_channels(ctl, conf=(0,) * 9):
         add_attr(ctl, **add_args)
 
 
-def collect_attr(ctls):
+def get_plug_type(plug):
+    """add_attr type of a numeric, unit or enum plug. "double" for the others"""
+    attr = plug.attribute()
+    if attr.hasFn(om2.MFn.kUnitAttribute):
+        unit_type = om2.MFnUnitAttribute(attr).unitType()
+        if unit_type == om2.MFnUnitAttribute.kAngle:
+            return "doubleAngle"
+        elif unit_type == om2.MFnUnitAttribute.kDistance:
+            return "doubleLinear"
+    elif attr.hasFn(om2.MFn.kEnumAttribute):
+        # mc.getAttr returns the index
+        return "long"
+    elif attr.hasFn(om2.MFn.kNumericAttribute):
+        numeric_type = om2.MFnNumericAttribute(attr).numericType()
+        if numeric_type == om2.MFnNumericData.kBoolean:
+            return "bool"
+        elif numeric_type in [om2.MFnNumericData.kInt, om2.MFnNumericData.kShort, om2.MFnNumericData.kByte,
+                              om2.MFnNumericData.kChar]:
+            return "long"
+    return "double"
+
+
+def get_plug_value(plug, attr_type=None):
+    """plug value as mc.getAttr returns it. attr_type is the add_attr type, read from the plug when not given"""
+    if attr_type is None:
+        attr_type = get_plug_type(plug)
+    if attr_type == "string":
+        return plug.asString()
+    elif attr_type == "enum":
+        return om2.MFnEnumAttribute(plug.attribute()).fieldName(plug.asShort())
+    elif attr_type == "bool":
+        return plug.asBool()
+    elif attr_type in ["long", "short", "byte", "char"]:
+        return plug.asInt()
+    elif attr_type == "doubleAngle":
+        return plug.asMAngle().asUnits(om2.MAngle.uiUnit())
+    elif attr_type == "doubleLinear":
+        return plug.asMDistance().asUnits(om2.MDistance.uiUnit())
+    elif attr_type == "matrix":
+        return list(om2.MFnMatrixData(plug.asMObject()).matrix())
+    elif attr_type in ["float2", "float3", "double2", "double3", "long2", "long3", "short2", "short3"]:
+        return tuple(get_plug_value(plug.child(i), attr_type[:-1]) for i in range(plug.numChildren()))
+    return plug.asDouble()
+
+
+def read_attrs(node, attributes):
+    """{attr: value} of the attributes that exist on the node. one MFnDependencyNode, no command per attribute.
+
+    attributes -- {attr: {"type": add_attr type, "multi": bool}}. component preset "attributes" schema
+    multi attributes are value lists in logical index order
+    """
+    fn_node = om2.MFnDependencyNode(modifier.get_node(node))
+    data = {}
+    for attr, schema in attributes.items():
+        if not fn_node.hasAttribute(attr):
+            continue
+        plug = fn_node.findPlug(attr, False)
+        if schema.get("multi"):
+            data[attr] = [get_plug_value(plug.elementByLogicalIndex(i), schema["type"])
+                          for i in plug.getExistingArrayAttributeIndices()]
+        else:
+            data[attr] = get_plug_value(plug, schema["type"])
+    return data
+
+
+class AttributeSchema:
+    """add_attr arguments compiled from an attribute schema. component preset "attributes"
+
+    schema = get_schema(component_preset["attributes"])
+    schema.add(node, {"name": "arm", "anchors": [m, m1, m2]})
+    """
+
+    def __init__(self, attributes):
+        # [add_attr arguments]
+        self.definitions = []
+        # {attr: {enum field: index}}
+        self.enums = {}
+        self.multi = set()
+        for attr, args in attributes.items():
+            args = dict(args, longName=attr)
+            args.update(solve_type(args.pop("type")))
+            if args.get("attributeType") == "float3":
+                args = color_attr_args(**args)
+            elif args.get("attributeType") == "enum":
+                index = 0
+                self.enums[attr] = {}
+                for field in args["enumName"].split(":"):
+                    if "=" in field:
+                        field, index = field.split("=")
+                        index = int(index)
+                    self.enums[attr][field] = index
+                    index += 1
+            if args.get("multi"):
+                self.multi.add(attr)
+            self.definitions.append(args)
+
+    def add(self, node, values=None):
+        """add the missing attributes and set `values` {attr: value} in one modifier pass.
+        multi values are element lists, enum values are field names"""
+        with modifier.batch():
+            for args in self.definitions:
+                modifier.add_attr(node, **args)
+            for attr, value in (values or {}).items():
+                if attr in self.multi:
+                    for i, v in enumerate(value):
+                        modifier.set_attr(node, "{0}[{1}]".format(attr, i), v)
+                elif attr in self.enums:
+                    modifier.set_attr(node, attr, self.enums[attr][str(value)])
+                else:
+                    modifier.set_attr(node, attr, value)
+
+
+# {schema json: AttributeSchema}
+_schemas = {}
+
+
+def get_schema(attributes):
+    key = json.dumps(attributes, sort_keys=True)
+    if key not in _schemas:
+        _schemas[key] = AttributeSchema(attributes)
+    return _schemas[key]
+
+
+def collect_attr(ctls, namespace=None):
+    """{ctl name: {attr: value}} of the unlocked keyable attributes.
+
+    each ctl is resolved once and its attributes are enumerated and read through om2. ctl names keep their
+    namespace unless `namespace` is given, then it is stripped. ex) collect_attr(ctls, namespace="char1:")
+    """
     d = {}
     for ctl in ctls:
         name = ctl.split("|")[-1]
-        unlocked_attrs = mc.listAttr(ctl, unlocked=True, keyable=True, shortNames=True) or []
-        user_define_attrs = []
-        for attr in unlocked_attrs:
-            plug = get_plug(ctl, attr)
-            if plug.isChannelBox or plug.isKeyable:
-                user_define_attrs.append(attr)
+        if namespace and name.startswith(namespace):
+            name = name[len(namespace):]
+        fn_node = om2.MFnDependencyNode(modifier.get_node(ctl))
         _d = {}
-        for attr in user_define_attrs:
-            _d[attr] = mc.getAttr(ctl + "." + attr)
+        for i in range(fn_node.attributeCount()):
+            attr = fn_node.attribute(i)
+            if attr.hasFn(om2.MFn.kMessageAttribute) or attr.hasFn(om2.MFn.kTypedAttribute):
+                continue
+            plug = fn_node.findPlug(attr, False)
+            if plug.isLocked or not plug.isKeyable or plug.isCompound or plug.isArray \
+                    or (plug.isChild and plug.parent().isArray):
+                continue
+            _d[plug.partialName()] = get_plug_value(plug)
         if _d:
             d[name] = _d
     return d
 
 
 def apply_attr(data, namespace=":", *args, **kwargs):
-    for ctl in data:
-        name = namespace + ctl
-        for attr in data[ctl]:
-            mc.setAttr(name + "." + attr, data[ctl][attr])
+    """set a collect_attr pose. every value goes in one undoable modifier"""
+    with modifier.batch():
+        for ctl in data:
+            modifier.set_attrs(namespace + ctl, data[ctl])
@@ -3,7 +3,7 @@ from maya import cmds as mc
 from maya.api import OpenMaya as om2
 
 # domino
-from . import matrix
+from . import matrix, modifier
 from .color import RED, GREEN, BLUE
 
 
@@ -219,15 +219,15 @@ def generate(node, points, degree, color, close=False, thickness=1, po=(0, 0, 0)
     mc.delete(curve)
 
     if color:
-        mc.setAttr(shape + ".overrideEnabled", True)
+        modifier.set_attr(shape, "overrideEnabled", True)
     if isinstance(color, int):
-        mc.setAttr(shape + ".overrideRGBColors", 0)
-        mc.setAttr(shape + ".overrideColor", color)
+        modifier.set_attr(shape, "overrideRGBColors", 0)
+        modifier.set_attr(shape, "overrideColor", color)
     elif isinstance(color, (list, tuple, om2.MColor)):
-        mc.setAttr(shape + ".overrideRGBColors", 1)
-        mc.setAttr(shape + ".overrideColorRGB", *color)
-    mc.setAttr(shape + ".lineWidth", thickness)
-    mc.setAttr(shape + ".isHistoricallyInteresting", 0)
+        modifier.set_attr(shape, "overrideRGBColors", 1)
+        modifier.set_attr(shape, "overrideColorRGB", *color)
+    modifier.set_attr(shape, "lineWidth", thickness)
+    modifier.set_attr(shape, "isHistoricallyInteresting", 0)
 
 
 def origin(parent, name, color, m, thickness=1, width=1, po=(0, 0, 0), ro=(0, 0, 0)):
@@ -0,0 +1,439 @@
+# maya
+from maya import cmds as mc
+from maya.api import OpenMaya as om2
+
+# built-ins
+import os
+from contextlib import contextmanager
+
+# This file is also loaded as a maya plug-in. the edits of a batch are done through om2 when they are issued,
+# `dominoModifier` command records them in the undo queue like any other command when the batch ends.
+maya_useNewAPI = True
+
+COMMAND_NAME = "dominoModifier"
+
+NUMERIC_TYPES = {
+    "bool": om2.MFnNumericData.kBoolean,
+    "long": om2.MFnNumericData.kInt,
+    "short": om2.MFnNumericData.kShort,
+    "byte": om2.MFnNumericData.kByte,
+    "char": om2.MFnNumericData.kChar,
+    "float": om2.MFnNumericData.kFloat,
+    "double": om2.MFnNumericData.kDouble
+}
+UNIT_TYPES = {
+    "doubleAngle": om2.MFnUnitAttribute.kAngle,
+    "doubleLinear": om2.MFnUnitAttribute.kDistance,
+    "time": om2.MFnUnitAttribute.kTime
+}
+DATA_TYPES = {
+    "string": om2.MFnData.kString,
+    "stringArray": om2.MFnData.kStringArray,
+    "matrix": om2.MFnData.kMatrix,
+    "doubleArray": om2.MFnData.kDoubleArray,
+    "Int32Array": om2.MFnData.kIntArray,
+    "vectorArray": om2.MFnData.kVectorArray,
+    "pointArray": om2.MFnData.kPointArray,
+    "nurbsCurve": om2.MFnData.kNurbsCurve,
+    "nurbsSurface": om2.MFnData.kNurbsSurface,
+    "mesh": om2.MFnData.kMesh,
+    "lattice": om2.MFnData.kLattice
+}
+
+_depth = 0
+_operations = None
+_pending = None
+# {id(cmds module): loaded}
+_plugin_loaded = {}
+
+
+def get_node(node):
+    selection_list = om2.MSelectionList()
+    selection_list.add(node)
+    return selection_list.getDependNode(0)
+
+
+def get_node_name(node):
+    if node.hasFn(om2.MFn.kDagNode):
+        return om2.MDagPath.getAPathTo(node).fullPathName()
+    return om2.MFnDependencyNode(node).name()
+
+
+def find_plug(node, attr):
+    if "[" not in attr and "." not in attr:
+        return om2.MFnDependencyNode(node).findPlug(attr, False)
+    selection_list = om2.MSelectionList()
+    selection_list.add(get_node_name(node) + "." + attr)
+    return selection_list.getPlug(0)
+
+
+def create_attribute(**kwargs):
+    long_name = kwargs["longName"]
+    short_name = kwargs.get("shortName", long_name)
+    attribute_type = kwargs.get("attributeType")
+    data_type = kwargs.get("dataType")
+    default_value = kwargs.get("defaultValue", 0)
+
+    if "children" in kwargs:
+        # float3, double3... the children are add_attr arguments too. see attribute.color_attr_args
+        children = [create_attribute(**x) for x in kwargs["children"]]
+        fn_attr = om2.MFnNumericAttribute()
+        obj = fn_attr.create(long_name, short_name, *children)
+        fn_attr.usedAsColor = bool(kwargs.get("usedAsColor", False))
+    elif attribute_type in NUMERIC_TYPES:
+        fn_attr = om2.MFnNumericAttribute()
+        obj = fn_attr.create(long_name, short_name, NUMERIC_TYPES[attribute_type], default_value)
+        if "minValue" in kwargs:
+            fn_attr.setMin(kwargs["minValue"])
+        if "maxValue" in kwargs:
+            fn_attr.setMax(kwargs["maxValue"])
+    elif attribute_type in UNIT_TYPES:
+        fn_attr = om2.MFnUnitAttribute()
+        obj = fn_attr.create(long_name, short_name, UNIT_TYPES[attribute_type], default_value)
+    elif attribute_type == "enum":
+        fn_attr = om2.MFnEnumAttribute()
+        obj = fn_attr.create(long_name, short_name, default_value)
+        index = 0
+        for field in kwargs["enumName"].split(":"):
+            if "=" in field:
+                field, index = field.split("=")
+                index = int(index)
+            fn_attr.addField(field, index)
+            index += 1
+    elif attribute_type == "message":
+        fn_attr = om2.MFnMessageAttribute()
+        obj = fn_attr.create(long_name, short_name)
+    elif data_type in DATA_TYPES:
+        fn_attr = om2.MFnTypedAttribute()
+        obj = fn_attr.create(long_name, short_name, DATA_TYPES[data_type])
+    else:
+        return None
+
+    fn_attr.keyable = bool(kwargs.get("keyable", False))
+    fn_attr.array = bool(kwargs.get("multi", False))
+    if "niceName" in kwargs:
+        fn_attr.setNiceNameOverride(kwargs["niceName"])
+    return obj
+
+
+class Operations:
+    """edits of one batch. every edit is done when it is added, in call order, so maya commands between the
+    edits see them. the batch is one entry in the undo queue
+
+    ("attribute", node, attr) ("value", node, attr, value) ("connect" | "disconnect", node, attr, node, attr)
+    ("keys", node, attr, times, values) ("flags", node, attr, lock, keyable, channel_box)
+    """
+
+    def __init__(self):
+        self.attribute_names = set()
+        # [(run, modifier | [(curve modifier, key change)] | [(plug, flags before, flags after)])] in call order.
+        # attributes, values and connections share the modifier of their run
+        self._steps = []
+
+    def is_empty(self):
+        return not self._steps
+
+    def _run(self, run, step):
+        if not self._steps or self._steps[-1][0] != run:
+            self._steps.append((run, step()))
+        return self._steps[-1][1]
+
+    def add(self, edit):
+        if edit[0] == "keys":
+            self._run("keys", list).append(self._add_keys(*edit[1:]))
+            return
+        if edit[0] == "flags":
+            self._run("flags", list).append(self._apply_flags(*edit[1:]))
+            return
+        dg_modifier = self._run("modifier", om2.MDGModifier)
+        if edit[0] == "attribute":
+            dg_modifier.addAttribute(*edit[1:])
+        elif edit[0] == "value":
+            self.set_plug(dg_modifier, find_plug(edit[1], edit[2]), edit[3])
+        elif edit[0] == "connect":
+            dg_modifier.connect(find_plug(edit[1], edit[2]), find_plug(edit[3], edit[4]))
+        else:
+            dg_modifier.disconnect(find_plug(edit[1], edit[2]), find_plug(edit[3], edit[4]))
+        # the new operations only
+        dg_modifier.doIt()
+
+    @staticmethod
+    def set_plug(dg_modifier, plug, value):
+        if plug.isCompound and isinstance(value, (list, tuple)):
+            # om2.MColor has alpha. mc.setAttr ignores values past the children too
+            for i in range(min(len(value), plug.numChildren())):
+                Operations.set_plug(dg_modifier, plug.child(i), value[i])
+            return
+        if isinstance(value, (list, tuple, om2.MMatrix)):
+            dg_modifier.newPlugValue(plug, om2.MFnMatrixData().create(om2.MMatrix(value)))
+            return
+        attr = plug.attribute()
+        if isinstance(value, str):
+            dg_modifier.newPlugValueString(plug, value)
+        elif attr.hasFn(om2.MFn.kUnitAttribute):
+            unit_type = om2.MFnUnitAttribute(attr).unitType()
+            if unit_type == om2.MFnUnitAttribute.kAngle:
+                dg_modifier.newPlugValueMAngle(plug, om2.MAngle(value, om2.MAngle.uiUnit()))
+            elif unit_type == om2.MFnUnitAttribute.kDistance:
+                dg_modifier.newPlugValueMDistance(plug, om2.MDistance(value, om2.MDistance.uiUnit()))
+            else:
+                dg_modifier.newPlugValueDouble(plug, value)
+        elif attr.hasFn(om2.MFn.kNumericAttribute):
+            numeric_type = om2.MFnNumericAttribute(attr).numericType()
+            if numeric_type == om2.MFnNumericData.kBoolean:
+                dg_modifier.newPlugValueBool(plug, bool(value))
+            elif numeric_type in [om2.MFnNumericData.kFloat, om2.MFnNumericData.kDouble]:
+                dg_modifier.newPlugValueDouble(plug, float(value))
+            else:
+                dg_modifier.newPlugValueInt(plug, int(value))
+        elif attr.hasFn(om2.MFn.kEnumAttribute):
+            dg_modifier.newPlugValueInt(plug, int(value))
+        else:
+            dg_modifier.newPlugValueDouble(plug, float(value))
+
+    @staticmethod
+    def key_values(fn_curve, values):
+        # mc.setAttr units to the internal units of the curve
+        curve_type = fn_curve.animCurveType()
+        if curve_type in [om2.MFnAnimCurve.kAnimCurveTA, om2.MFnAnimCurve.kAnimCurveUA]:
+            return [om2.MAngle(x, om2.MAngle.uiUnit()).asRadians() for x in values]
+        elif curve_type in [om2.MFnAnimCurve.kAnimCurveTL, om2.MFnAnimCurve.kAnimCurveUL]:
+            return [om2.MDistance(x, om2.MDistance.uiUnit()).asCentimeters() for x in values]
+        return [float(x) for x in values]
+
+    def _add_keys(self, node, attr, times, values):
+        curve_modifier = om2.MDGModifier()
+        key_change = om2.MAnimCurveChange()
+        plug = find_plug(node, attr)
+        source = plug.source()
+        fn_curve = om2.MFnAnimCurve()
+        if not source.isNull and source.node().hasFn(om2.MFn.kAnimCurve):
+            fn_curve.setObject(source.node())
+        else:
+            fn_curve.create(plug, modifier=curve_modifier)
+        curve_modifier.doIt()
+        fn_curve.addKeys(om2.MTimeArray([om2.MTime(x, om2.MTime.uiUnit()) for x in times]),
+                         om2.MDoubleArray(self.key_values(fn_curve, values)),
+                         keepExistingKeys=True,
+                         change=key_change)
+        return curve_modifier, key_change
+
+    @staticmethod
+    def _set_flags(plug, lock, keyable, channel_box):
+        if lock is not None:
+            plug.isLocked = lock
+        if keyable is not None:
+            plug.isKeyable = keyable
+        if channel_box is not None:
+            plug.isChannelBox = channel_box
+
+    def _apply_flags(self, node, attr, lock, keyable, channel_box):
+        plug = find_plug(node, attr)
+        change = (plug, (plug.isLocked, plug.isKeyable, plug.isChannelBox), (lock, keyable, channel_box))
+        self._set_flags(plug, lock, keyable, channel_box)
+        return change
+
+    def undoIt(self):
+        for run, step in reversed(self._steps):
+            if run == "modifier":
+                step.undoIt()
+            elif run == "keys":
+                for curve_modifier, key_change in reversed(step):
+                    key_change.undoIt()
+                    curve_modifier.undoIt()
+            else:
+                for plug, before, _ in reversed(step):
+                    self._set_flags(plug, *before)
+
+    def redoIt(self):
+        for run, step in self._steps:
+            if run == "modifier":
+                step.doIt()
+            elif run == "keys":
+                for curve_modifier, key_change in step:
+                    curve_modifier.doIt()
+                    key_change.redoIt()
+            else:
+                for plug, _, after in step:
+                    self._set_flags(plug, *after)
+
+
+class DominoModifierCommand(om2.MPxCommand):
+
+    def __init__(self):
+        super(DominoModifierCommand, self).__init__()
+        self.operations = None
+
+    @staticmethod
+    def creator():
+        return DominoModifierCommand()
+
+    def doIt(self, args):
+        from domino.lib import modifier
+
+        # the operations are done already
+        self.operations = modifier._pending
+        modifier._pending = None
+
+    def undoIt(self):
+        if self.operations is not None:
+            self.operations.undoIt()
+
+    def redoIt(self):
+        if self.operations is not None:
+            self.operations.redoIt()
+
+    def isUndoable(self):
+        return self.operations is not None
+
+
+def initializePlugin(plugin):
+    om2.MFnPlugin(plugin).registerCommand(COMMAND_NAME, DominoModifierCommand.creator)
+
+
+def uninitializePlugin(plugin):
+    om2.MFnPlugin(plugin).deregisterCommand(COMMAND_NAME)
+
+
+def load_plugin():
+    # keyed on the cmds module. a plan build (the stand-in) loads it into the stand-in, not into maya.
+    key = id(mc)
+    if key not in _plugin_loaded:
+        plugin_path = os.path.splitext(__file__)[0] + ".py"
+        try:
+            if not mc.pluginInfo(plugin_path, query=True, loaded=True):
+                mc.loadPlugin(plugin_path, quiet=True)
+            _plugin_loaded[key] = True
+        except RuntimeError:
+            _plugin_loaded[key] = False
+    return _plugin_loaded[key]
+
+
+def is_active():
+    return _operations is not None
+
+
+def begin():
+    global _depth, _operations
+    _depth += 1
+    if _operations is None:
+        _operations = Operations()
+
+
+def end():
+    global _depth, _operations
+    _depth -= 1
+    if _depth == 0:
+        flush()
+        _operations = None
+
+
+@contextmanager
+def batch(enabled=True):
+    if not enabled:
+        yield
+        return
+    begin()
+    try:
+        yield
+    finally:
+        end()
+
+
+def flush():
+    global _operations, _pending
+    if _operations is None or _operations.is_empty():
+        return None
+    operations = _operations
+    _operations = Operations()
+    if load_plugin():
+        _pending = operations
+        getattr(mc, COMMAND_NAME)()
+
+
+def add_attr(node, **add_attr_args):
+    if _operations is None:
+        mc.addAttr(node, **add_attr_args)
+        return node + "." + add_attr_args["longName"]
+
+    obj = get_node(node)
+    key = (om2.MObjectHandle(obj).hashCode(), add_attr_args["longName"])
+    if key in _operations.attribute_names or om2.MFnDependencyNode(obj).hasAttribute(add_attr_args["longName"]):
+        return None
+    attr = create_attribute(**add_attr_args)
+    if attr is None:
+        mc.addAttr(node, **add_attr_args)
+    else:
+        _operations.attribute_names.add(key)
+        _operations.add(("attribute", obj, attr))
+    return node + "." + add_attr_args["longName"]
+
+
+def set_attr(node, attr, *value):
+    if _operations is None:
+        if len(value) == 1 and isinstance(value[0], str):
+            mc.setAttr(node + "." + attr, value[0], type="string")
+        else:
+            mc.setAttr(node + "." + attr, *value)
+        return None
+    _operations.add(("value", get_node(node), attr, value[0] if len(value) == 1 else value))
+
+
+def set_attrs(node, values):
+    """{attr: value} of one node. the node is resolved once"""
+    if _operations is None:
+        for attr, value in values.items():
+            set_attr(node, attr, *(value if isinstance(value, (list, tuple)) else [value]))
+        return None
+    obj = get_node(node)
+    for attr, value in values.items():
+        _operations.add(("value", obj, attr, value))
+
+
+def set_keys(node, attr, times, values):
+    """key `values` at `times` on one plug. values are mc.setAttr units, keys at other times are kept.
+    a plug driven by something else than an anim curve is keyed through mc.setKeyframe"""
+    if _operations is None:
+        for time, value in zip(times, values):
+            mc.setKeyframe(node, attribute=attr, time=time, value=value)
+        return None
+    obj = get_node(node)
+    source = find_plug(obj, attr).source()
+    if not source.isNull and not source.node().hasFn(om2.MFn.kAnimCurve):
+        for time, value in zip(times, values):
+            mc.setKeyframe(node, attribute=attr, time=time, value=value)
+        return None
+    _operations.add(("keys", obj, attr, list(times), list(values)))
+
+
+def set_flags(node, attrs, lock=None, keyable=None, channel_box=None):
+    if _operations is None:
+        if lock is not None:
+            [mc.setAttr(node + "." + attr, lock=lock) for attr in attrs]
+        if keyable is not None:
+            [mc.setAttr(node + "." + attr, keyable=keyable) for attr in attrs]
+        if channel_box is not None:
+            [mc.setAttr(node + "." + attr, channelBox=channel_box) for attr in attrs]
+        return None
+    obj = get_node(node)
+    for attr in attrs:
+        _operations.add(("flags", obj, attr, lock, keyable, channel_box))
+
+
+def connect_attr(source, destination):
+    if _operations is None:
+        mc.connectAttr(source, destination)
+        return None
+    source_node, source_attr = source.split(".", 1)
+    destination_node, destination_attr = destination.split(".", 1)
+    _operations.add(("connect", get_node(source_node), source_attr, get_node(destination_node), destination_attr))
+
+
+def disconnect_attr(source, destination):
+    if _operations is None:
+        mc.disconnectAttr(source, destination)
+        return None
+    source_node, source_attr = source.split(".", 1)
+    destination_node, destination_attr = destination.split(".", 1)
+    _operations.add(("disconnect", get_node(source_node), source_attr,
+                     get_node(destination_node), destination_attr))
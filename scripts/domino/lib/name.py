@@ -28,3 +28,52 @@ GUIDE_POS_EXT = "pos"
 
 CHARACTER_SET_EXT = "char"
 SETS_EXT = "sets"
+
+SIDES = ["C", "L", "R"]
+NAMING_SETTINGS = ["name_rule", "index_padding", "description_letter_case", "center_name", "left_name", "right_name",
+                   "name_ext"]
+LETTER_CASES = {"lower": str.lower, "upper": str.upper, "capitalize": str.capitalize}
+
+
+class NameFormatter:
+    """naming settings of an assembly for one rule("ctl" or "jnt")"""
+
+    def __init__(self, rule_string, padding, letter_case, side_names, extension):
+        self.rule_string = rule_string
+        self.padding = int(padding)
+        self.letter_case = LETTER_CASES.get(letter_case)
+        # {"C": center name, "L": left name, "R": right name}
+        self.side_names = dict(zip(SIDES, side_names))
+        self.extension = extension
+
+    def format(self, name, side, index, description="", extension="", negate=False):
+        """side and index are None for the assembly"""
+        if self.letter_case:
+            description = self.letter_case(description)
+        if side is None:
+            side, index = "", ""
+        else:
+            if negate and side != "C":
+                side = "R" if side == "L" else "L"
+            side = self.side_names[side]
+            index = str(index).zfill(self.padding)
+        result = self.rule_string.format(name=name,
+                                         side=side,
+                                         index=index,
+                                         description=description,
+                                         extension=extension or self.extension)
+        return "_".join([x for x in result.split("_") if x])
+
+
+# {settings: NameFormatter}
+_formatters = {}
+
+
+def get_formatter(assembly_data, rule):
+    """NameFormatter of the assembly settings. compiled once per distinct settings"""
+    settings = tuple(assembly_data["{0}_{1}".format(rule, x)] for x in NAMING_SETTINGS)
+    if settings not in _formatters:
+        rule_string, padding, letter_case, center_name, left_name, right_name, extension = settings
+        _formatters[settings] = NameFormatter(rule_string, padding, letter_case, (center_name, left_name, right_name),
+                                              extension)
+    return _formatters[settings]
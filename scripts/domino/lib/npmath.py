@@ -0,0 +1,178 @@
+# numpy
+import numpy as np
+
+# NumPy version of lib.matrix / lib.vector math. it runs without maya.
+# matrices are (4, 4) row major like om2.MMatrix. om2.MMatrix(m.flatten().tolist())
+# plural functions take (N, 3) vectors, (N, 4, 4) matrices and (M, N, 3) chains.
+
+# {axis: ((source, sign) of X, Y, Z)} source 0: aim, 1: up, 2: side
+LOOK_AT_AXIS = {
+    "xy": ((0, 1), (1, 1), (2, 1)),
+    "xz": ((0, 1), (2, -1), (1, 1)),
+    "x-z": ((0, 1), (2, 1), (1, -1)),
+    "yx": ((1, 1), (0, 1), (2, -1)),
+    "yz": ((2, 1), (0, 1), (1, 1)),
+    "zx": ((1, 1), (2, 1), (0, 1)),
+    "z-x": ((1, -1), (2, -1), (0, 1)),
+    "zy": ((2, -1), (1, 1), (0, 1)),
+    "x-y": ((0, 1), (1, -1), (2, -1)),
+    "-xz": ((0, -1), (2, 1), (1, 1)),
+    "-xy": ((0, -1), (1, 1), (2, 1)),
+    "-yx": ((1, 1), (0, -1), (2, 1))
+}
+MIRROR_MATRIX = np.diag([-1.0, 1.0, 1.0, 1.0])
+
+
+def normalize(v):
+    # zero length vector is returned as it is. same as om2.MVector.normal()
+    v = np.asarray(v, dtype=float)
+    length = np.linalg.norm(v, axis=-1, keepdims=True)
+    return np.divide(v, length, out=v.copy(), where=length > 0)
+
+
+def get_angle(v0, v1):
+    v0 = np.asarray(v0, dtype=float)
+    v1 = np.asarray(v1, dtype=float)
+    return np.arctan2(np.linalg.norm(np.cross(v0, v1), axis=-1), np.sum(v0 * v1, axis=-1))
+
+
+def multiply_quaternion(q0, q1):
+    """(x, y, z, w)"""
+    x0, y0, z0, w0 = np.moveaxis(np.asarray(q0, dtype=float), -1, 0)
+    x1, y1, z1, w1 = np.moveaxis(np.asarray(q1, dtype=float), -1, 0)
+    return np.stack([w0 * x1 + x0 * w1 + y0 * z1 - z0 * y1,
+                     w0 * y1 - x0 * z1 + y0 * w1 + z0 * x1,
+                     w0 * z1 + x0 * y1 - y0 * x1 + z0 * w1,
+                     w0 * w1 - x0 * x1 - y0 * y1 - z0 * z1], axis=-1)
+
+
+def get_look_at_matrices(positions, lookats, normals, axis="xy", negate=False):
+    positions = np.asarray(positions, dtype=float)
+    lookats = np.asarray(lookats, dtype=float)
+    normals = normalize(normals)
+
+    a = normalize(positions - lookats if negate else lookats - positions)
+    c = normalize(np.cross(a, normals))
+    b = normalize(np.cross(c, a))
+    sources = (a, b, c)
+
+    matrices = np.zeros(positions.shape[:-1] + (4, 4))
+    for row, (source, sign) in enumerate(LOOK_AT_AXIS[axis]):
+        matrices[..., row, :3] = sources[source] * sign
+    matrices[..., 3, :3] = positions
+    matrices[..., 3, 3] = 1.0
+    return matrices
+
+
+def get_look_at_matrix(pos, lookat, normal, axis="xy", negate=False):
+    return get_look_at_matrices(pos, lookat, normal, axis, negate)
+
+
+def rotate_along_axes(vectors, axes, angles):
+    # https://math.stackexchange.com/questions/40164/how-do-you-rotate-a-vector-by-a-unit-quaternion
+    vectors = np.asarray(vectors, dtype=float)
+    axes = np.asarray(axes, dtype=float)
+    angles = np.asarray(angles, dtype=float)[..., np.newaxis]
+    sa = np.sin(angles / 2.0)
+    ca = np.cos(angles / 2.0)
+
+    q1 = np.concatenate([vectors, np.zeros(vectors.shape[:-1] + (1,))], axis=-1)
+    q2 = np.concatenate([axes * sa, ca], axis=-1)
+    q2n = np.concatenate([-axes * sa, ca], axis=-1)
+    q = multiply_quaternion(multiply_quaternion(q2, q1), q2n)
+    return q[..., :3]
+
+
+def rotate_along_axis(v, axis, a):
+    return rotate_along_axes(v, axis, a)
+
+
+def get_transposed_vectors(vectors, positions0, positions1, inverse=False):
+    """positions0, positions1 : ((N, 3), (N, 3))"""
+    v0 = normalize(np.asarray(positions0[1], dtype=float) - np.asarray(positions0[0], dtype=float))
+    v1 = normalize(np.asarray(positions1[1], dtype=float) - np.asarray(positions1[0], dtype=float))
+
+    ra = get_angle(v0, v1)
+    if inverse:
+        ra = -ra
+    axis = np.cross(v0, v1)
+    return rotate_along_axes(vectors, axis, ra)
+
+
+def get_transposed_vector(v, position0, position1, inverse=False):
+    return get_transposed_vectors(v, position0, position1, inverse)
+
+
+def get_chain_normals(chains, normals):
+    """chains (M, N, 3), normals (M, 3) -> (M, N - 1, 3)"""
+    chain_normals = []
+    for i in range(chains.shape[1] - 1):
+        v0 = chains[:, i - 1]
+        v1 = chains[:, i]
+        v2 = chains[:, i + 1]
+
+        # Normal Offset
+        if i > 0:
+            normals = get_transposed_vectors(normals, [v0, v1], [v1, v2])
+        chain_normals.append(normals)
+    return np.stack(chain_normals, axis=1)
+
+
+def get_chain_matrices(chains, normals, negate=False):
+    """chains (M, N, 3), normals (M, 3) -> (M, N - 1, 4, 4)"""
+    chains = np.asarray(chains, dtype=float)
+    chain_normals = get_chain_normals(chains, np.asarray(normals, dtype=float))
+    return get_look_at_matrices(chains[:, :-1], chains[:, 1:], chain_normals, "xz", negate)
+
+
+def get_chain_matrix(positions, normal, negate=False):
+    return list(get_chain_matrices([positions], [normal], negate)[0])
+
+
+def get_chain_matrices2(chains, normals, negate=False):
+    """chains (M, N, 3), normals (M, 3) -> (M, N, 4, 4)"""
+    chains = np.asarray(chains, dtype=float)
+    chain_normals = get_chain_normals(chains, np.asarray(normals, dtype=float))
+    matrices = get_look_at_matrices(chains[:, :-1], chains[:, 1:], chain_normals, "xz", negate)
+
+    # last one looks at the previous position
+    last = get_look_at_matrices(chains[:, -1], chains[:, -2], chain_normals[:, -1], "-xz", negate)
+    return np.concatenate([matrices, last[:, np.newaxis]], axis=1)
+
+
+def get_chain_matrix2(positions, normal, negate=False):
+    return list(get_chain_matrices2([positions], [normal], negate)[0])
+
+
+def get_mirror_matrices(matrices):
+    return np.asarray(matrices, dtype=float) @ MIRROR_MATRIX
+
+
+def get_mirror_matrix(m):
+    return get_mirror_matrices(np.reshape(m, (4, 4)))
+
+
+def calculate_pole_vectors(positions0, positions1, positions2, pole_distance=1):
+    vec0 = np.asarray(positions0, dtype=float)
+    vec1 = np.asarray(positions1, dtype=float)
+    vec2 = np.asarray(positions2, dtype=float)
+
+    v1_v0 = vec1 - vec0
+    v2_v0 = vec2 - vec0
+    v1_v0_normal = normalize(v1_v0)
+    v2_v0_normal = normalize(v2_v0)
+
+    dot_value = np.linalg.norm(v1_v0, axis=-1) * np.sum(v1_v0_normal * v2_v0_normal, axis=-1)
+    proj_vec = v2_v0_normal * dot_value[..., np.newaxis] + vec0
+
+    v1_proj = vec1 - proj_vec
+
+    return normalize(v1_proj) * np.asarray(pole_distance, dtype=float)[..., np.newaxis] + vec1
+
+
+def calculate_pole_vector(position0, position1, position2, pole_distance=1):
+    return calculate_pole_vectors(position0, position1, position2, pole_distance)
+
+
+def get_distance(v0, v1):
+    return float(np.linalg.norm(np.asarray(v1, dtype=float) - np.asarray(v0, dtype=float)))
@@ -22,13 +22,20 @@ def remove_node_from_asset(node):
         mc.container(mc.container(query=True, findContainer=node), edit=True, removeNode=node)
 
 
-def publish_node(node):
+def publish_node(node, asset=None):
     pub_name = node.split("|")[-1]
-    asset = mc.container(query=True, findContainer=node)
+    if asset is None:
+        asset = mc.container(query=True, findContainer=node)
     mc.containerPublish(asset, publishNode=(pub_name, ""))
     mc.containerPublish(asset, bindNode=(pub_name, node))
 
 
+def publish_nodes(nodes, asset=None):
+    """publish_node for many nodes. without an asset, each node is published to the asset it is in"""
+    for node in nodes:
+        publish_node(node, asset)
+
+
 def publish_attribute(node):
     publish_attrs = []
     for attr in mc.listAttr(node, userDefined=True, shortNames=True):
@@ -44,3 +51,24 @@ def publish_attribute(node):
         publish_name = component_identifier + ("_I_" + attr if attr != "_I" else "")
         mc.container(asset, edit=True, publishName=publish_name)
         mc.container(asset, edit=True, bindAttr=[node + "." + attr, publish_name])
+
+
+def unpublish_node(nodes):
+    nodes = mc.ls(nodes, long=True)
+    assets = set([mc.container(query=True, findContainer=x) for x in nodes])
+    for asset in [x for x in assets if x]:
+        bind_attrs = mc.container(asset, query=True, bindAttr=True) or []
+        for plug in bind_attrs[0::2]:
+            if (mc.ls(plug.split(".")[0], long=True) or [None])[0] in nodes:
+                mc.container(asset, edit=True, unbindAndUnpublish=plug)
+        bind_nodes = mc.containerPublish(asset, query=True, bindNode=True) or []
+        for pub_name, node in zip(bind_nodes[0::2], bind_nodes[1::2]):
+            if (mc.ls(node, long=True) or [None])[0] in nodes:
+                mc.containerPublish(asset, unbindNode=pub_name)
+                mc.containerPublish(asset, unpublishNode=pub_name)
+        parents = mc.container(asset, query=True, publishAsParent=True) or []
+        for pair in zip(parents[0::2], parents[1::2]):
+            for i, node in enumerate(pair):
+                if (mc.ls(node, long=True) or [None])[0] in nodes:
+                    mc.container(asset, edit=True, unbindParent=pair[1 - i])
+                    mc.container(asset, edit=True, unpublishParent=pair[1 - i])
@@ -2,7 +2,7 @@
 from maya import cmds as mc
 
 # domino
-from domino.lib import matrix, hierarchy, icon, attribute
+from domino.lib import matrix, hierarchy, icon, attribute, modifier
 
 
 def add_npo(node, name, offset_parent_matrix=False):
@@ -23,22 +23,21 @@ def add_ctl(parent, name, m, parent_ctl=None, attrs=(), mirror_config=(0,) * 9,
     matrix.set_matrix(ctl, m)
     attach_tag(ctl, parent_ctl)
 
-    mc.addAttr(ctl, longName="is_ctl", attributeType="bool", keyable=False)
+    attribute.add_attr(ctl, longName="is_ctl", type="bool", keyable=False)
 
     lock_hide_attrs = ["tx", "ty", "tz", "rx", "ry", "rz", "sx", "sy", "sz", "v"]
     [lock_hide_attrs.remove(x) for x in attrs]
-    [mc.setAttr(ctl + "." + attr, lock=True) for attr in lock_hide_attrs]
-    [mc.setAttr(ctl + "." + attr, keyable=False) for attr in lock_hide_attrs]
+    modifier.set_flags(ctl, lock_hide_attrs, lock=True, keyable=False)
 
     if config:
         attribute.add_attr(ctl, longName="component_root", type="message")
         attribute.add_attr(ctl, longName="component_host", type="message")
         # Required to publish attribute.
         attribute.add_attr(ctl, longName="identifier", type="string")
-        mc.setAttr(ctl + ".identifier", config["identifier"], type="string")
+        modifier.set_attr(ctl, "identifier", config["identifier"])
         # Required to use mirror pose.
         attribute.add_attr(ctl, longName="mirror_ctl_name", type="string")
-        mc.setAttr(ctl + ".mirror_ctl_name", config["mirror_ctl_name"], type="string")
+        modifier.set_attr(ctl, "mirror_ctl_name", config["mirror_ctl_name"])
     # Required to use rbf manager.
     # Required to use mirror pose.
     attribute.add_mirror_config_channels(ctl, mirror_config)
@@ -47,7 +46,7 @@ def add_ctl(parent, name, m, parent_ctl=None, attrs=(), mirror_config=(0,) * 9,
 
 def add_placeholder(parent, name, offset=(0, 0, 0)):
     ph = mc.createNode("transform", name=name, parent=parent)
-    mc.setAttr(ph + ".rotate", *offset)
+    modifier.set_attr(ph, "rotate", *offset)
     return ph
 
 
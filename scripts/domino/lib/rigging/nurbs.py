@@ -40,32 +40,40 @@ def build(curve_data, name="", parent=None, replace="", match=False, inherits=Tr
                 parent = curve_data["parent"][0]
     if replace and mc.objExists(replace):
         crv = replace
-        mc.delete(mc.listRelatives(crv, shapes=True, fullPath=True))
+        shapes = mc.listRelatives(crv, shapes=True, fullPath=True)
+        if shapes:
+            mc.delete(shapes)
     else:
         crv = mc.createNode("transform", name=curve_data["name"] if not name else name, parent=parent)
     if not inherits:
         mc.setAttr(crv + ".inheritsTransform", 0)
-    temp_crv_name = "curve_build_temp"
     for d in curve_data["shapes"]:
-        shape = mc.curve(name=temp_crv_name,
-                         point=d["points"],
-                         periodic=False if d["form"] == 1 else True,
-                         degree=d["degree"],
-                         knot=d["knots"])
-        shape = mc.listRelatives(shape, shapes=True, fullPath=True)[0]
-        mc.setAttr(shape + ".overrideEnabled", d["override"])
-        mc.setAttr(shape + ".overrideRGBColors", d["use_rgb"])
-        mc.setAttr(shape + ".overrideColorRGB", *d["color_rgb"])
-        mc.setAttr(shape + ".overrideColor", d["color_index"])
-        mc.setAttr(shape + ".lineWidth", d["line_width"])
-        shape = mc.rename(shape, crv.split("|")[-1] + "Shape")
-        mc.parent(shape, crv, relative=True, shape=True)
-        mc.delete(temp_crv_name)
+        build_shape(crv, d)
     if match:
         mc.xform(crv, matrix=curve_data["transform"], worldSpace=True)
     return crv
 
 
+def build_shape(crv, shape_data):
+    """nurbsCurve shape under `crv` from `data` shape data. sets the curve data directly, no temporary curve"""
+    degree = shape_data["degree"]
+    knots = shape_data["knots"]
+    points = shape_data["points"]
+    shape = crv + "|" + mc.createNode("nurbsCurve", name=crv.split("|")[-1] + "Shape", parent=crv)
+    # degree, spans, form(0 open, 1 closed, 2 periodic), rational, dimension, knots, cvs
+    mc.setAttr(shape + ".cached",
+               degree, len(points) - degree, shape_data["form"] - 1, False, 3,
+               len(knots), *knots,
+               len(points), *[v for p in points for v in p],
+               type="nurbsCurve")
+    mc.setAttr(shape + ".overrideEnabled", shape_data["override"])
+    mc.setAttr(shape + ".overrideRGBColors", shape_data["use_rgb"])
+    mc.setAttr(shape + ".overrideColorRGB", *shape_data["color_rgb"])
+    mc.setAttr(shape + ".overrideColor", shape_data["color_index"])
+    mc.setAttr(shape + ".lineWidth", shape_data["line_width"])
+    return shape
+
+
 def create(parent, name, degree, positions, m=om2.MTransformationMatrix(), bezier=False, ep=False, vis=True,
            inherits=True, display_type=0):
     if isinstance(m, om2.MTransformationMatrix):
@@ -4,12 +4,11 @@ from maya import mel
 
 # built-ins
 from functools import partial
-import json
 
 # domino
 from domino.lib import attribute
 from domino.lib.rigging import controller
-from domino.lib.animation import anime
+from domino.lib.animation import anime, pose
 
 
 def _null(*args, **kwargs):
@@ -20,8 +19,7 @@ def __switch_fk_ik(hosts, set_key, *args, **kwargs):
     selected = mc.ls(selection=True)
     time_slider = mel.eval("$tmpVar=$gPlayBackSlider")
     frame_range = mc.timeControl(time_slider, query=True, rangeArray=True)
-    for host in hosts:
-        anime.switch_fk_ik(host, frame_range=frame_range, set_key=set_key)
+    anime.switch_fk_ik(hosts, frame_range=frame_range, set_key=set_key)
     mc.select(selected)
 
 
@@ -37,6 +35,16 @@ def __mirror_flip_pose(*args):
     anime.mirror_pose(args[0], args[1])
 
 
+def __mirror_flip_clip(*args):
+    # highlighted time slider range, the playback range when nothing is highlighted
+    time_slider = mel.eval("$tmpVar=$gPlayBackSlider")
+    if mc.timeControl(time_slider, query=True, rangeVisible=True):
+        frame_range = mc.timeControl(time_slider, query=True, rangeArray=True)
+    else:
+        frame_range = [mc.playbackOptions(query=True, minTime=True), mc.playbackOptions(query=True, maxTime=True) + 1]
+    anime.mirror_pose(args[0], args[1], frame_range=frame_range)
+
+
 def __attribute_trigger(n, attr, value, *args, **kwargs):
     mc.setAttr(n + "." + attr, value)
 
@@ -155,6 +163,12 @@ def __quick_menu(parent_menu, current_control):
     mc.menuItem(parent=parent_menu,
                 label="Flip below",
                 command=partial(__mirror_flip_pose, child_controller, True))
+    mc.menuItem(parent=parent_menu,
+                label="Mirror below (Clip)",
+                command=partial(__mirror_flip_clip, child_controller, False))
+    mc.menuItem(parent=parent_menu,
+                label="Flip below (Clip)",
+                command=partial(__mirror_flip_clip, child_controller, True))
     mc.menuItem(parent=parent_menu, divider=True)
 
     mc.menuItem(parent=parent_menu,
@@ -211,10 +225,15 @@ def __quick_menu(parent_menu, current_control):
                                                 index),
                                 radioButton=value)
         mc.menuItem(parent=parent_menu, divider=True)
-        pose_data = json.loads(mc.getAttr(f"{current_control_root}.pose_json").replace("'", "\""))
         pose_menu = mc.menuItem(parent=parent_menu, label="pose", subMenu=True)
-        for pose, data in pose_data.items():
-            mc.menuItem(parent=pose_menu, label=pose, command=partial(attribute.apply_attr, data, namespace))
+        if pose.has_numpy():
+            pose_library = pose.get_library(current_control_root)
+            for pose_name in pose_library.names():
+                mc.menuItem(parent=pose_menu, label=pose_name,
+                            command=partial(pose_library.apply, pose_name, None, namespace))
+        else:
+            for pose_name, data in pose.get_legacy_data(current_control_root).items():
+                mc.menuItem(parent=pose_menu, label=pose_name, command=partial(attribute.apply_attr, data, namespace))
 
     roots_grp = [x for x in mc.listRelatives(asset_root, children=True, fullPath=True) if "roots" in x][0]
     assembly_root = None
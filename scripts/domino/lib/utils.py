@@ -4,11 +4,13 @@ import sys
 # domino
 from . import log
 
-# gui
-from PySide2 import QtWidgets, QtCore
-
 
 def reload_domino():
+    # custom component modules are not under domino package.
+    assembler = sys.modules.get("domino.assembler")
+    if assembler is not None:
+        assembler.clear_component_modules()
+        assembler.clear_custom_steps()
     for mod in sys.modules.copy():
         if mod.startswith("domino"):
             log.Logger.info("[{}.{}] Removing '{}'".format(__name__, sys._getframe().f_code.co_name, sys.modules[mod]))
@@ -22,6 +24,8 @@ def reload_module(module):
 
 
 def getMayaMainWindow():
+    from PySide2 import QtWidgets
+
     # get the qApp instance if it exists.
     app = QtWidgets.QApplication.instance()
     mayaWin = next(w for w in app.topLevelWidgets() if w.objectName() == 'MayaWindow')
@@ -29,6 +33,8 @@ def getMayaMainWindow():
 
 
 def show_dialog(ui, parent, *args, **kwargs):
+    from PySide2 import QtCore
+
     app, maya_window = getMayaMainWindow()
     try:
         for c in maya_window.children():
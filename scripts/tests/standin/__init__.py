@@ -0,0 +1,91 @@
+# built-ins
+import sys
+import types
+import importlib.util
+from contextlib import contextmanager
+
+# standin
+from standin.graph import Graph, current, set_current
+
+# Recording stand-in for maya.cmds / maya.api.OpenMaya / maya.mel / pymel.core. test and development only,
+# it is not part of the domino package. scripts/tests is on sys.path for pytest, add it for the other uses.
+# outside maya `install()` registers the stand-in as the maya modules, so domino imports as it is.
+# inside maya `patch()` swaps the maya modules of loaded domino and component modules for the build.
+
+# {module name: stand-in module name}
+MODULES = {
+    "maya": None,
+    "maya.cmds": "standin.cmds",
+    "maya.mel": "standin.mel",
+    "maya.api": None,
+    "maya.api.OpenMaya": "standin.openmaya",
+    "maya.internal": None,
+    "maya.internal.nodes": None,
+    "maya.internal.nodes.proximitywrap": None,
+    "maya.internal.nodes.proximitywrap.node_interface": "standin.proximitywrap",
+    "pymel": None,
+    "pymel.core": "standin.pymel",
+}
+
+
+def is_installed():
+    module = sys.modules.get("maya.cmds")
+    return module is not None and module.__name__ == "standin.cmds"
+
+
+def has_maya():
+    if is_installed():
+        return False
+    try:
+        return importlib.util.find_spec("maya.cmds") is not None
+    except (ImportError, ValueError):
+        return False
+
+
+def install():
+    """register the stand-in as maya modules. does nothing when maya is importable"""
+    if is_installed() or has_maya():
+        return is_installed()
+    for name, standin_name in MODULES.items():
+        if standin_name is None:
+            module = types.ModuleType(name)
+            module.__path__ = []
+        else:
+            module = importlib.import_module(standin_name)
+        sys.modules[name] = module
+        parent, _, child = name.rpartition(".")
+        if parent:
+            setattr(sys.modules[parent], child, module)
+    return True
+
+
+def _swap_targets():
+    # modules holding maya modules as globals. domino and component modules (custom components too)
+    assembler = sys.modules.get("domino.assembler")
+    component_modules = [x for x, _ in getattr(assembler, "_component_modules", {}).values()]
+    modules = [x for k, x in list(sys.modules.items()) if k.startswith("domino")]
+    return [x for x in modules + component_modules if x is not None]
+
+
+@contextmanager
+def patch(graph=None):
+    """run maya commands against the stand-in graph"""
+    graph = graph if graph is not None else Graph()
+    previous = set_current(graph)
+    swapped = []
+    if not is_installed():
+        replace = {}
+        for name, standin_name in MODULES.items():
+            if standin_name is not None and name in sys.modules:
+                replace[id(sys.modules[name])] = importlib.import_module(standin_name)
+        for module in _swap_targets():
+            for key, value in list(vars(module).items()):
+                if id(value) in replace:
+                    swapped.append((module, key, value))
+                    setattr(module, key, replace[id(value)])
+    try:
+        yield graph
+    finally:
+        for module, key, value in swapped:
+            setattr(module, key, value)
+        set_current(previous)
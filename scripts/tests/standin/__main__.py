@@ -0,0 +1,36 @@
+# built-ins
+import os
+import sys
+import json
+import argparse
+
+# standin
+import standin
+
+# cd scripts
+# PYTHONPATH=tests python -m standin ../rig_templates/biped.domino -o biped_plan.json
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="standin", description="build a rig plan without maya")
+    parser.add_argument("file_path", help=".domino or .dominob file")
+    parser.add_argument("-o", "--output", help="plan json path. statistics only are printed when not given")
+    parser.add_argument("--batch", action="store_true", help="batch DG edits through modifier")
+    args = parser.parse_args(argv)
+
+    standin.install()
+    os.environ.setdefault("DOMINO_DEFAULT_COMPONENT", "domino.assembler.component")
+    from domino import assembler
+    from domino.assembler import io as assembler_io
+
+    data = assembler_io.read(args.file_path)
+    plan = assembler.create_rig(data=data, plan=True, batch=args.batch)
+    if args.output:
+        with open(args.output, "w", encoding="UTF-8") as f:
+            json.dump(plan, f, indent=2, ensure_ascii=False)
+    json.dump(plan["statistics"], sys.stdout, indent=2, ensure_ascii=False)
+    sys.stdout.write("\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,1644 @@
+# built-ins
+import os
+import re
+import sys
+import math
+
+# standin
+from standin import graph as _graph
+from standin import matrix as _matrix
+
+# Stand-in for maya.cmds. commands read and write the current stand-in graph.
+# commands this module does not know are recorded in `graph.calls` and return None.
+
+
+def _g():
+    return _graph.current()
+
+
+def _flag(kwargs, long_name, short_name=None, default=None):
+    if long_name in kwargs:
+        return kwargs[long_name]
+    if short_name and short_name in kwargs:
+        return kwargs[short_name]
+    return default
+
+
+def _names(args):
+    names = []
+    for arg in args:
+        if arg is None:
+            continue
+        if isinstance(arg, (list, tuple, set)):
+            names.extend(_names(arg))
+        else:
+            names.append(str(arg))
+    return names
+
+
+def _node(name):
+    return _g().find(str(name))
+
+
+def _plug(plug):
+    return _g().find_plug(str(plug))
+
+
+def _result(nodes, long_name=False):
+    return [x.full_path() if long_name else x.partial_path() for x in nodes]
+
+
+def _none_if_empty(values):
+    return values or None
+
+
+def _to_values(values):
+    result = []
+    for value in values:
+        if isinstance(value, str):
+            result.append(value)
+        elif hasattr(value, "__iter__"):
+            result.extend(_to_values(list(value)))
+        else:
+            result.append(value)
+    return result
+
+
+# -------------------------------------------------------------------- nodes
+def createNode(node_type, name=None, parent=None, shared=False, skipSelect=False, **kwargs):
+    name = _flag(kwargs, "n", default=name)
+    parent = _flag(kwargs, "p", default=parent)
+    g = _g()
+    if _flag(kwargs, "ss", default=shared) and name and g.exists(name):
+        return name
+    node = g.create_node(node_type, name=name, parent=_node(parent) if parent else None)
+    return node.partial_path()
+
+
+def objExists(name):
+    g = _g()
+    name = str(name)
+    if "." in name.split("|")[-1]:
+        node_name, attr = _graph.split_plug(name)
+        node = g.find(node_name, required=False) if g.exists(node_name) else None
+        return node is not None and g.has_attribute(node, attr)
+    return g.exists(name)
+
+
+def nodeType(name, apiType=False, inherited=False, **kwargs):
+    node = _node(_graph.split_plug(str(name))[0])
+    if inherited or _flag(kwargs, "i"):
+        types = ["containerBase", "entity", "dagNode", "transform"] if node.is_dag and not node.is_shape else []
+        return types + [node.type] if node.type not in types else types
+    return node.type
+
+
+def objectType(name, isType=None, **kwargs):
+    node_type = nodeType(name)
+    if isType is not None:
+        return node_type == isType
+    return node_type
+
+
+def ls(*args, **kwargs):
+    g = _g()
+    long_name = _flag(kwargs, "long", "l", False)
+    node_type = _flag(kwargs, "type", "typ") or _flag(kwargs, "exactType", "et")
+    if _flag(kwargs, "selection", "sl", False):
+        nodes = list(g.selection)
+        if args:
+            selected = set(nodes)
+            nodes = [x for x in _ls_nodes(args) if x in selected]
+    elif _flag(kwargs, "uuid", default=False):
+        return [x.uuid for x in _ls_nodes(args)]
+    elif args and _names(args):
+        nodes = _ls_nodes(args)
+    elif args:
+        return []
+    else:
+        nodes = list(g.nodes.values())
+    if _flag(kwargs, "dagObjects", "dag", False):
+        expanded = []
+        for node in nodes:
+            expanded.append(node)
+            expanded.extend(node.descendants())
+        nodes = expanded if args else [x for x in g.nodes.values() if x.is_dag]
+    if _flag(kwargs, "transforms", "tr", False):
+        nodes = [x for x in nodes if x.is_dag and not x.is_shape]
+    if _flag(kwargs, "shapes", "s", False):
+        nodes = [x for x in nodes if x.is_shape]
+    if _flag(kwargs, "assemblies", "assemblies", False):
+        nodes = [x for x in nodes if x.is_dag and x.parent is None]
+    if node_type:
+        types = node_type if isinstance(node_type, (list, tuple)) else [node_type]
+        nodes = [x for x in nodes if g.is_type(x, types)]
+    seen = set()
+    unique = []
+    for node in nodes:
+        if id(node) not in seen:
+            seen.add(id(node))
+            unique.append(node)
+    if _flag(kwargs, "showType", "st", False):
+        return [v for node in unique for v in (node.partial_path(), node.type)]
+    if _flag(kwargs, "showNamespace", "sns", False):
+        # the stand-in has the root namespace only
+        return [v for node in unique for v in (node.partial_path(), ":")]
+    plugs = []
+    for name in _names(args):
+        if "." in name.split("|")[-1] and not _flag(kwargs, "objectsOnly", "o", False) and \
+                not any(c in name for c in "*?"):
+            try:
+                node, attr = g.find_plug(name)
+                plugs.append((node, attr))
+            except ValueError:
+                pass
+    if plugs and len(plugs) == len(_names(args)):
+        return [(x.full_path() if long_name else x.partial_path()) + "." + attr for x, attr in plugs]
+    return _result(unique, long_name)
+
+
+def _ls_nodes(args):
+    g = _g()
+    nodes = []
+    for name in _names(args):
+        if name in g.uuids:
+            nodes.append(g.uuids[name])
+            continue
+        nodes.extend(g.ls(name))
+    return nodes
+
+
+def listRelatives(*args, **kwargs):
+    g = _g()
+    nodes = [_node(x) for x in _names(args)] if args else list(g.selection)
+    full_path = _flag(kwargs, "fullPath", "f", False) or _flag(kwargs, "path", "pa", False)
+    node_type = _flag(kwargs, "type", "typ")
+    result = []
+    for node in nodes:
+        if _flag(kwargs, "parent", "p", False):
+            related = [node.parent] if node.parent is not None else []
+        elif _flag(kwargs, "allParents", "ap", False):
+            related = [node.parent] if node.parent is not None else []
+        elif _flag(kwargs, "allDescendents", "ad", False):
+            related = list(reversed(list(node.descendants())))
+        elif _flag(kwargs, "shapes", "s", False):
+            related = [x for x in node.children if x.is_shape]
+        else:
+            related = list(node.children)
+        if _flag(kwargs, "shapes", "s", False):
+            related = [x for x in related if x.is_shape]
+        if _flag(kwargs, "noIntermediate", "ni", False):
+            related = [x for x in related if not g.get_value(x, "intermediateObject")]
+        if node_type:
+            types = node_type if isinstance(node_type, (list, tuple)) else [node_type]
+            related = [x for x in related if g.is_type(x, types)]
+        result.extend(related)
+    return _none_if_empty(_result(result, full_path))
+
+
+def listConnections(*args, **kwargs):
+    g = _g()
+    source = _flag(kwargs, "source", "s", True)
+    destination = _flag(kwargs, "destination", "d", True)
+    plugs = _flag(kwargs, "plugs", "p", False)
+    connections = _flag(kwargs, "connections", "c", False)
+    node_type = _flag(kwargs, "type", "t") or _flag(kwargs, "exactType", "et")
+    result = []
+    for name in _names(args):
+        if "." in name.split("|")[-1]:
+            node, attr = g.find_plug(name)
+        else:
+            node, attr = _node(name), None
+        for (this_node, this_attr), (other_node, other_attr) in g.connection_pairs(node, attr, source,
+                                                                                      destination):
+            if node_type:
+                types = node_type if isinstance(node_type, (list, tuple)) else [node_type]
+                if not g.is_type(other_node, types):
+                    continue
+            if _flag(kwargs, "shapes", "sh", False) is False and other_node.is_shape and not plugs:
+                other_name = other_node.parent.partial_path() if other_node.parent else other_node.partial_path()
+            else:
+                other_name = other_node.partial_path()
+            if connections:
+                result.append(this_node.partial_path() + "." + this_attr)
+            result.append(other_node.partial_path() + "." + other_attr if plugs else other_name)
+    if not connections and not plugs:
+        unique = []
+        for x in result:
+            if x not in unique:
+                unique.append(x)
+        result = unique
+    return _none_if_empty(result)
+
+
+def delete(*args, **kwargs):
+    g = _g()
+    if _flag(kwargs, "constructionHistory", "ch", False) or _flag(kwargs, "channels", "c", False):
+        return None
+    if _flag(kwargs, "constraints", "cn", False):
+        for name in _names(args):
+            node = _node(name)
+            for child in [x for x in node.children if x.type.endswith("Constraint")]:
+                g.delete(child)
+        return None
+    names = _names(args) if args else [x.partial_path() for x in g.selection]
+    if not names and args:
+        raise ValueError("No object matches name")
+    nodes = []
+    for name in names:
+        if "." in name.split("|")[-1]:
+            continue
+        found = g.ls(name)
+        if not found:
+            raise ValueError("No object matches name: {0}".format(name))
+        nodes.extend(found)
+    for node in nodes:
+        g.delete(node)
+
+
+def rename(*args, **kwargs):
+    g = _g()
+    if len(args) == 1:
+        node = g.selection[0]
+        new_name = args[0]
+    else:
+        node = _node(_names([args[0]])[0])
+        new_name = args[1]
+    g.rename(node, str(new_name))
+    return node.partial_path()
+
+
+def parent(*args, **kwargs):
+    g = _g()
+    names = _names(args)
+    world = _flag(kwargs, "world", "w", False)
+    relative = _flag(kwargs, "relative", "r", False)
+    if world:
+        children, new_parent = names, None
+    else:
+        children, new_parent = names[:-1], _node(names[-1])
+    result = []
+    for name in children:
+        node = _node(name)
+        if node.parent is new_parent:
+            raise RuntimeError("Object '{0}' is already a child of '{1}'.".format(name, names[-1]))
+        g.reparent(node, new_parent, relative=relative or node.is_shape)
+        result.append(node.partial_path())
+    return result
+
+
+def duplicate(*args, **kwargs):
+    g = _g()
+    name = _flag(kwargs, "name", "n")
+    parent_only = _flag(kwargs, "parentOnly", "po", False)
+    result = []
+    for source in _names(args) or [x.partial_path() for x in g.selection]:
+        node = _node(source)
+        new = g.duplicate(node, name=name or node.name, children=not parent_only)
+        result.append(new.partial_path())
+        if not _flag(kwargs, "returnRootsOnly", "rr", False):
+            result.extend(x.partial_path() for x in new.descendants())
+    return result
+
+
+def select(*args, **kwargs):
+    g = _g()
+    if _flag(kwargs, "clear", "cl", False):
+        g.selection = []
+        return None
+    nodes = [_node(x) for x in _names(args)]
+    if _flag(kwargs, "hierarchy", "hi", False):
+        nodes = [y for x in nodes for y in [x] + list(x.descendants())]
+    if _flag(kwargs, "deselect", "d", False):
+        g.selection = [x for x in g.selection if x not in nodes]
+    elif _flag(kwargs, "add", "af", False) or _flag(kwargs, "toggle", "tgl", False):
+        g.selection.extend(x for x in nodes if x not in g.selection)
+    else:
+        g.selection = nodes
+
+
+def hide(*args, **kwargs):
+    g = _g()
+    for name in _names(args) or [x.partial_path() for x in g.selection]:
+        g.set_value(_node(name), "visibility", False)
+
+
+def showHidden(*args, **kwargs):
+    g = _g()
+    for name in _names(args):
+        g.set_value(_node(name), "visibility", True)
+
+
+def spaceLocator(*args, **kwargs):
+    g = _g()
+    name = _flag(kwargs, "name", "n") or "locator#"
+    transform = g.create_node("transform", name=name)
+    g.create_node("locator", name=transform.name + "Shape", parent=transform)
+    position = _flag(kwargs, "position", "p")
+    if position:
+        g.set_value(transform, "translate", tuple(position))
+    return [transform.partial_path()]
+
+
+def group(*args, **kwargs):
+    g = _g()
+    name = _flag(kwargs, "name", "n") or "group#"
+    parent_name = _flag(kwargs, "parent", "p")
+    node = g.create_node("transform", name=name, parent=_node(parent_name) if parent_name else None)
+    if not _flag(kwargs, "empty", "em", False):
+        for child in _names(args):
+            g.reparent(_node(child), node)
+    return node.partial_path()
+
+
+# -------------------------------------------------------------------- attributes
+def _get_type(node, attr):
+    g = _g()
+    name = _graph.strip_index(attr)
+    if name in node.attributes:
+        return node.attributes[name].type
+    if name in _graph.COMPOUNDS:
+        return "double3"
+    if name in _graph.MATRIX_ATTRS or name.endswith("Matrix") and not attr.endswith("]") and \
+            g.attribute(node, name).multi:
+        return "matrix"
+    value = g.get_value(node, attr)
+    if isinstance(value, str):
+        return "string"
+    if isinstance(value, bool):
+        return "bool"
+    if isinstance(value, int):
+        return "long"
+    if isinstance(value, (list, tuple)) and len(value) == 16:
+        return "matrix"
+    if isinstance(value, (list, tuple)):
+        return "double3"
+    return g.attribute(node, name).type
+
+
+def getAttr(plug, **kwargs):
+    g = _g()
+    node, attr = _plug(plug)
+    if _flag(kwargs, "lock", "l", False):
+        return g.is_locked(node, attr)
+    if _flag(kwargs, "keyable", "k", False):
+        return g.get_flag(node, attr, "keyable")
+    if _flag(kwargs, "channelBox", "cb", False):
+        return g.get_flag(node, attr, "channelBox")
+    if _flag(kwargs, "type", "typ", False):
+        return _get_type(node, attr)
+    if _flag(kwargs, "settable", "se", False):
+        return not g.is_locked(node, attr) and (node, attr) not in g.inputs
+    if _flag(kwargs, "multiIndices", "mi", False):
+        return _none_if_empty(g.element_indices(node, attr))
+    if _flag(kwargs, "size", "s", False):
+        indices = g.element_indices(node, attr)
+        return indices[-1] + 1 if indices else 0
+    time = _flag(kwargs, "time", "t")
+    if time is not None:
+        previous = g.context_time
+        g.set_time(time, context=True)
+        try:
+            return getAttr(plug, **{k: v for k, v in kwargs.items() if k not in ("time", "t")})
+        finally:
+            g.set_time(previous, context=True)
+    name = _graph.strip_index(attr)
+    definition = node.attributes.get(name)
+    if definition is not None and definition.multi and not attr.endswith("]") and definition.type != "matrix":
+        indices = g.element_indices(node, attr)
+        return [g.get_value(node, "{0}[{1}]".format(attr, i)) for i in indices] or None
+    if name in ("worldMatrix", "worldInverseMatrix", "parentMatrix", "parentInverseMatrix") and \
+            not attr.endswith("]"):
+        attr += "[0]"
+    value = g.get_value(node, attr)
+    if _flag(kwargs, "asString", "asString", False):
+        enum_names = definition.enum_names if definition is not None else []
+        names = dict((i, n) for n, i in enum_names)
+        return names.get(int(value or 0), str(value))
+    if isinstance(value, tuple):
+        return [tuple(value)]
+    if isinstance(value, list) and len(value) == 16:
+        return list(value)
+    if definition is not None and definition.type == "enum":
+        return int(value or 0)
+    return value
+
+
+def setAttr(plug, *values, **kwargs):
+    g = _g()
+    node, attr = _plug(plug)
+    for long_name, short_name, flag in (("lock", "l", "lock"), ("keyable", "k", "keyable"),
+                                        ("channelBox", "cb", "channelBox")):
+        value = _flag(kwargs, long_name, short_name)
+        if value is not None:
+            g.set_flag(node, attr, flag, bool(value))
+    if not values:
+        return None
+    if g.is_locked(node, attr):
+        raise RuntimeError("setAttr: The attribute '{0}.{1}' is locked or connected and cannot be modified.".format(
+            node.partial_path(), attr))
+    data_type = _flag(kwargs, "type", "typ")
+    values = list(values)
+    if data_type == "matrix":
+        value = [float(x) for x in _to_values(values)]
+    elif data_type == "string":
+        value = values[0]
+    elif data_type in ("stringArray", "doubleArray", "Int32Array", "pointArray", "vectorArray"):
+        value = list(values[1:]) if isinstance(values[0], int) and len(values) > 1 else \
+            list(values[0]) if len(values) == 1 else values
+    elif data_type == "nurbsCurve":
+        if node.type == "nurbsCurve" and g.long_attr_name(node, attr) in ("cached", "create"):
+            node.data["curve"] = _curve_data(_to_values(values))
+            g.dirty(node)
+            return None
+        value = values
+    else:
+        flat = _to_values(values)
+        if len(flat) == 1:
+            value = flat[0]
+        else:
+            children = g.children_attrs(node, attr)
+            value = tuple(flat[:len(children)] if children else flat)
+    g.set_value(node, attr, value)
+    return None
+
+
+def _curve_data(values):
+    # degree spans form rational dimension knot_count knots... cv_count cvs...
+    degree, _, form, _, dimension, knot_count = [int(x) for x in values[:6]]
+    knots = [float(x) for x in values[6:6 + knot_count]]
+    cv_count = int(values[6 + knot_count])
+    cvs = [float(x) for x in values[7 + knot_count:]]
+    points = [tuple(cvs[i * dimension:i * dimension + 3]) + (0.0,) * (3 - dimension) for i in range(cv_count)]
+    return {"points": points, "knots": knots, "degree": degree, "form": form + 1}
+
+
+def addAttr(*args, **kwargs):
+    g = _g()
+    edit = _flag(kwargs, "edit", "e", False)
+    query = _flag(kwargs, "query", "q", False)
+    names = _names(args)
+    if not names:
+        names = [x.partial_path() for x in g.selection]
+    if edit or query:
+        node, attr = _plug(names[0]) if "." in names[0] else (_node(names[0]), _flag(kwargs, "longName", "ln"))
+        definition = node.attributes.get(_graph.strip_index(attr))
+        if definition is None:
+            raise RuntimeError("addAttr: attribute not found '{0}'".format(names[0]))
+        if query:
+            if _flag(kwargs, "exists", "ex", False):
+                return True
+            if _flag(kwargs, "enumName", "en", False):
+                return ":".join("{0}={1}".format(n, i) for n, i in definition.enum_names)
+            if _flag(kwargs, "defaultValue", "dv", False):
+                return definition.default
+            if _flag(kwargs, "minValue", "min", False):
+                return definition.min
+            if _flag(kwargs, "maxValue", "max", False):
+                return definition.max
+            if _flag(kwargs, "attributeType", "at", False):
+                return definition.type
+            return None
+        if _flag(kwargs, "enumName", "en") is not None:
+            definition.enum_names = _parse_enum(_flag(kwargs, "enumName", "en"))
+        for long_name, short_name, key in (("defaultValue", "dv", "default"), ("minValue", "min", "min"),
+                                           ("maxValue", "max", "max"), ("niceName", "nn", "nice_name"),
+                                           ("keyable", "k", "keyable")):
+            value = _flag(kwargs, long_name, short_name)
+            if value is not None:
+                setattr(definition, key, value)
+        return None
+
+    long_name = _flag(kwargs, "longName", "ln")
+    short_name = _flag(kwargs, "shortName", "sn") or long_name
+    attribute_type = _flag(kwargs, "attributeType", "at")
+    data_type = _flag(kwargs, "dataType", "dt")
+    if not attribute_type and not data_type:
+        attribute_type = "double"
+    type_name = attribute_type or data_type
+    if attribute_type in ("doubleAngle", "doubleLinear", "time"):
+        kind = "unit"
+    elif attribute_type == "enum":
+        kind = "enum"
+    elif attribute_type == "message":
+        kind = "message"
+    elif attribute_type in ("compound", "double3", "float3", "double2", "float2", "long3", "short3"):
+        kind = "compound"
+    elif attribute_type in ("matrix", "fltMatrix"):
+        kind = "matrix"
+    elif data_type:
+        kind = "typed"
+    else:
+        kind = "numeric"
+    for name in names:
+        node = _node(name)
+        if long_name in node.attributes:
+            raise RuntimeError("Found a matching attribute for '{0}' on '{1}'".format(long_name, name))
+        attr = _graph.Attribute(long_name, short_name, kind, type_name, _flag(kwargs, "defaultValue", "dv"))
+        attr.multi = bool(_flag(kwargs, "multi", "m", False))
+        attr.keyable = bool(_flag(kwargs, "keyable", "k", False))
+        attr.hidden = bool(_flag(kwargs, "hidden", "h", False))
+        attr.nice_name = _flag(kwargs, "niceName", "nn")
+        attr.min = _flag(kwargs, "minValue", "min")
+        attr.max = _flag(kwargs, "maxValue", "max")
+        attr.soft_min = _flag(kwargs, "softMinValue", "smn")
+        attr.soft_max = _flag(kwargs, "softMaxValue", "smx")
+        attr.used_as_color = bool(_flag(kwargs, "usedAsColor", "uac", False))
+        if kind == "enum":
+            attr.enum_names = _parse_enum(_flag(kwargs, "enumName", "en", ""))
+        parent_name = _flag(kwargs, "parent", "p")
+        if parent_name:
+            parent_attr = node.attributes[g.long_attr_name(node, parent_name)]
+            attr.parent = parent_attr
+            parent_attr.children.append(attr)
+        g.add_attribute(node, attr)
+    return None
+
+
+def _parse_enum(enum_name):
+    fields = []
+    index = 0
+    for field in (enum_name or "").split(":"):
+        if not field:
+            continue
+        if "=" in field:
+            field, index = field.split("=")
+            index = int(index)
+        fields.append((field, index))
+        index += 1
+    return fields
+
+
+def deleteAttr(*args, **kwargs):
+    g = _g()
+    attribute = _flag(kwargs, "attribute", "at")
+    for name in _names(args):
+        if attribute:
+            g.remove_attribute(_node(name), attribute)
+        else:
+            node, attr = _plug(name)
+            g.remove_attribute(node, attr)
+
+
+def attributeQuery(attr, **kwargs):
+    g = _g()
+    node = _node(_flag(kwargs, "node", "n"))
+    exists = g.has_attribute(node, attr)
+    if _flag(kwargs, "exists", "ex", False):
+        return exists
+    if not exists:
+        raise RuntimeError("attributeQuery: No attribute named '{0}'".format(attr))
+    definition = g.attribute(node, attr)
+    if _flag(kwargs, "listEnum", "le", False):
+        return [":".join(n if i == k else "{0}={1}".format(n, i)
+                         for k, (n, i) in enumerate(definition.enum_names))]
+    if _flag(kwargs, "listDefault", "ld", False):
+        default = g.default_value(node, definition.long_name)
+        return list(default) if isinstance(default, (list, tuple)) else [default]
+    if _flag(kwargs, "attributeType", "at", False):
+        if definition.kind == "typed":
+            return "typed"
+        return definition.type
+    if _flag(kwargs, "multi", "m", False):
+        return definition.multi
+    if _flag(kwargs, "keyable", "k", False):
+        return definition.keyable
+    if _flag(kwargs, "minExists", "mne", False):
+        return definition.min is not None
+    if _flag(kwargs, "maxExists", "mxe", False):
+        return definition.max is not None
+    if _flag(kwargs, "minimum", "min", False):
+        return [definition.min]
+    if _flag(kwargs, "maximum", "max", False):
+        return [definition.max]
+    if _flag(kwargs, "softMinExists", "sme", False):
+        return definition.soft_min is not None
+    if _flag(kwargs, "softMaxExists", "sxe", False):
+        return definition.soft_max is not None
+    if _flag(kwargs, "softMin", "smn", False):
+        return [definition.soft_min]
+    if _flag(kwargs, "softMax", "smx", False):
+        return [definition.soft_max]
+    if _flag(kwargs, "listChildren", "lc", False):
+        return _none_if_empty(g.children_attrs(node, definition.long_name))
+    if _flag(kwargs, "listParent", "lp", False):
+        parent_attr = g.parent_attr(node, definition.long_name)
+        return [parent_attr] if parent_attr else None
+    if _flag(kwargs, "niceName", "nn", False):
+        return definition.nice_name or definition.long_name
+    if _flag(kwargs, "shortName", "sn", False):
+        return definition.short_name
+    if _flag(kwargs, "longName", "ln", False):
+        return definition.long_name
+    if _flag(kwargs, "usedAsColor", "uac", False):
+        return definition.used_as_color
+    if _flag(kwargs, "hidden", "h", False):
+        return definition.hidden
+    return None
+
+
+def listAttr(*args, **kwargs):
+    g = _g()
+    result = []
+    short_names = _flag(kwargs, "shortNames", "sn", False)
+    for name in _names(args) or [x.partial_path() for x in g.selection]:
+        if "." in name.split("|")[-1]:
+            node, attr = _plug(name)
+            if _flag(kwargs, "multi", "m", False):
+                indices = g.element_indices(node, attr)
+                result.extend("{0}[{1}]".format(attr, i) for i in indices)
+            else:
+                result.append(attr)
+            continue
+        node = _node(name)
+        if _flag(kwargs, "userDefined", "ud", False):
+            attrs = [x.long_name for x in node.attributes.values()]
+        else:
+            attrs = g.static_attributes(node) + [x.long_name for x in node.attributes.values()]
+        if _flag(kwargs, "keyable", "k", False):
+            attrs = [x for x in attrs if g.get_flag(node, x, "keyable") and not g.children_attrs(node, x)]
+        if _flag(kwargs, "channelBox", "cb", False):
+            attrs = [x for x in attrs if g.get_flag(node, x, "channelBox")]
+        if _flag(kwargs, "locked", "l", False):
+            attrs = [x for x in attrs if g.is_locked(node, x)]
+        if _flag(kwargs, "unlocked", "u", False):
+            attrs = [x for x in attrs if not g.is_locked(node, x)]
+        if _flag(kwargs, "multi", "m", False):
+            expanded = []
+            for x in attrs:
+                definition = g.attribute(node, x)
+                if definition.multi:
+                    expanded.extend("{0}[{1}]".format(x, i) for i in g.element_indices(node, x))
+                else:
+                    expanded.append(x)
+            attrs = expanded
+        if _flag(kwargs, "string", "st"):
+            patterns = _flag(kwargs, "string", "st")
+            patterns = patterns if isinstance(patterns, (list, tuple)) else [patterns]
+            import fnmatch
+
+            attrs = [x for x in attrs if any(fnmatch.fnmatchcase(x, p) for p in patterns)]
+        if short_names:
+            attrs = [g.short_attr_name(node, x) for x in attrs]
+        result.extend(attrs)
+    return _none_if_empty(result)
+
+
+def connectAttr(source, destination, force=False, **kwargs):
+    g = _g()
+    force = force or _flag(kwargs, "f", default=False)
+    source_node, source_attr = _plug(source)
+    destination_node, destination_attr = _plug(destination)
+    if _flag(kwargs, "nextAvailable", "na", False):
+        indices = g.element_indices(destination_node, destination_attr)
+        index = 0
+        while index in indices and (destination_node, "{0}[{1}]".format(destination_attr, index)) in g.inputs:
+            index += 1
+        destination_attr = "{0}[{1}]".format(destination_attr, index)
+    if g.is_locked(destination_node, destination_attr):
+        raise RuntimeError("connectAttr: The destination attribute '{0}.{1}' is locked".format(
+            destination_node.partial_path(), destination_attr))
+    g.connect(source_node, source_attr, destination_node, destination_attr, force=force)
+    return "Connected {0}.{1} to {2}.{3}.".format(source_node.partial_path(), source_attr,
+                                                  destination_node.partial_path(), destination_attr)
+
+
+def disconnectAttr(source, destination=None, **kwargs):
+    g = _g()
+    source_node, source_attr = _plug(source)
+    if destination is None:
+        for (node, attr), (other_node, other_attr) in g.connection_pairs(source_node, source_attr, False, True):
+            g.disconnect(node, attr, other_node, other_attr)
+        return None
+    destination_node, destination_attr = _plug(destination)
+    if not g.disconnect(source_node, source_attr, destination_node, destination_attr):
+        raise RuntimeError("disconnectAttr: There is no connection from '{0}' to '{1}' to disconnect".format(
+            source, destination))
+
+
+def isConnected(source, destination, **kwargs):
+    g = _g()
+    source_node, source_attr = _plug(source)
+    destination_node, destination_attr = _plug(destination)
+    return g.inputs.get((destination_node, destination_attr)) == (source_node, source_attr)
+
+
+def aliasAttr(*args, **kwargs):
+    return None
+
+
+# -------------------------------------------------------------------- transforms
+def xform(*args, **kwargs):
+    g = _g()
+    nodes = [_node(x) for x in _names(args)] or list(g.selection)
+    query = _flag(kwargs, "query", "q", False)
+    world_space = _flag(kwargs, "worldSpace", "ws", False)
+    relative = _flag(kwargs, "relative", "r", False)
+    translation = _flag(kwargs, "translation", "t")
+    rotation = _flag(kwargs, "rotation", "ro")
+    scale = _flag(kwargs, "scale", "s")
+    m = _flag(kwargs, "matrix", "m")
+    if query:
+        node = nodes[0]
+        world_m = g.world_matrix(node)
+        if m:
+            return list(world_m if world_space else g.local_matrix(node))
+        if translation:
+            if world_space:
+                return list(world_m[12:15])
+            return [g.get_value(node, x) for x in _graph.COMPOUNDS["translate"]]
+        if rotation:
+            if world_space:
+                order = int(g.get_value(node, "rotateOrder"))
+                return _matrix.decompose(world_m, order)[1]
+            return [g.get_value(node, x) for x in _graph.COMPOUNDS["rotate"]]
+        if scale:
+            if world_space:
+                return _matrix.decompose(world_m)[2]
+            return [g.get_value(node, x) for x in _graph.COMPOUNDS["scale"]]
+        if _flag(kwargs, "rotatePivot", "rp", False) or _flag(kwargs, "scalePivot", "sp", False) or \
+                _flag(kwargs, "pivots", "piv", False):
+            return list(world_m[12:15]) if world_space else [0.0, 0.0, 0.0]
+        if _flag(kwargs, "rotateOrder", "roo", False):
+            return ("xyz", "yzx", "zxy", "xzy", "yxz", "zyx")[int(g.get_value(node, "rotateOrder"))]
+        if _flag(kwargs, "boundingBox", "bb", False):
+            return list(world_m[12:15]) * 2
+        return None
+
+    for node in nodes:
+        if m is not None:
+            values = [float(x) for x in _to_values([m])]
+            if world_space:
+                g.set_world_matrix(node, values)
+            else:
+                g.set_local_matrix(node, values)
+        rotate_order = _flag(kwargs, "rotateOrder", "roo")
+        if rotate_order is not None:
+            g.set_value(node, "rotateOrder", ("xyz", "yzx", "zxy", "xzy", "yxz", "zyx").index(rotate_order))
+        if translation is not None:
+            translation = [float(x) for x in _to_values([translation])]
+            if relative:
+                translation = [a + b for a, b in zip(translation, g.values_of(node, _graph.COMPOUNDS["translate"]))]
+                g.set_value(node, "translate", tuple(translation))
+            elif world_space:
+                world_m = g.world_matrix(node)
+                world_m[12:15] = translation
+                g.set_world_matrix(node, world_m, rotate=False, scale=False)
+            else:
+                g.set_value(node, "translate", tuple(translation))
+        if rotation is not None:
+            rotation = [float(x) for x in _to_values([rotation])]
+            if world_space and not relative:
+                order = int(g.get_value(node, "rotateOrder"))
+                t, _, s = _matrix.decompose(g.world_matrix(node), order)
+                g.set_world_matrix(node, _matrix.compose(t, rotation, s, order), translate=False, scale=False)
+            else:
+                if relative:
+                    rotation = [a + b for a, b in zip(rotation, g.values_of(node, _graph.COMPOUNDS["rotate"]))]
+                g.set_value(node, "rotate", tuple(rotation))
+        if scale is not None:
+            scale = [float(x) for x in _to_values([scale])]
+            if relative:
+                scale = [a * b for a, b in zip(scale, g.values_of(node, _graph.COMPOUNDS["scale"]))]
+            g.set_value(node, "scale", tuple(scale))
+    return None
+
+
+def makeIdentity(*args, **kwargs):
+    g = _g()
+    translate = _flag(kwargs, "translate", "t", False)
+    rotate = _flag(kwargs, "rotate", "r", False)
+    scale = _flag(kwargs, "scale", "s", False)
+    if not (translate or rotate or scale):
+        translate = rotate = scale = True
+    apply = _flag(kwargs, "apply", "a", False)
+    for name in _names(args) or [x.partial_path() for x in g.selection]:
+        node = _node(name)
+        if node.is_shape:
+            continue
+        children = [x for x in node.descendants() if not x.is_shape]
+        child_world = [(x, g.world_matrix(x)) for x in children if x.parent is node]
+        before = g.local_matrix(node)
+        order = int(g.get_value(node, "rotateOrder"))
+        if node.type == "joint" and rotate and apply:
+            joint_orient = g.values_of(node, _graph.COMPOUNDS["jointOrient"])
+            rotation = _matrix.multiply(_matrix.compose_rotation(
+                [math.radians(x) for x in g.values_of(node, _graph.COMPOUNDS["rotate"])], order),
+                _matrix.compose_rotation([math.radians(x) for x in joint_orient], 0))
+            g.set_value(node, "jointOrient", tuple(math.degrees(x) for x in _matrix.decompose_rotation(rotation, 0)))
+        if translate:
+            g.set_value(node, "translate", (0.0, 0.0, 0.0))
+        if rotate:
+            g.set_value(node, "rotate", (0.0, 0.0, 0.0))
+        if scale:
+            g.set_value(node, "scale", (1.0, 1.0, 1.0))
+        if apply and node.type != "joint":
+            after = g.local_matrix(node)
+            baked = _matrix.multiply(before, _matrix.inverse(after))
+            for shape in [x for x in node.children if x.is_shape]:
+                curve = shape.data.get("curve")
+                if curve:
+                    curve["points"] = [tuple(_transform_point(p, baked)) for p in curve["points"]]
+                    g.dirty(shape)
+        for child, world_m in child_world:
+            g.set_world_matrix(child, world_m)
+
+
+def _transform_point(point, m):
+    x, y, z = point[:3]
+    return [x * m[c] + y * m[4 + c] + z * m[8 + c] + m[12 + c] for c in range(3)]
+
+
+def matchTransform(*args, **kwargs):
+    g = _g()
+    names = _names(args)
+    target = _node(names[-1])
+    position = _flag(kwargs, "position", "pos", False)
+    rotation = _flag(kwargs, "rotation", "rot", False)
+    scale = _flag(kwargs, "scale", "scl", False)
+    if not (position or rotation or scale):
+        position = rotation = scale = True
+    target_m = g.world_matrix(target)
+    for name in names[:-1]:
+        node = _node(name)
+        order = int(g.get_value(node, "rotateOrder"))
+        t, r, s = _matrix.decompose(g.world_matrix(node), order)
+        target_t, target_r, target_s = _matrix.decompose(target_m, order)
+        world_m = _matrix.compose(target_t if position else t, target_r if rotation else r,
+                                  target_s if scale else s, order)
+        g.set_world_matrix(node, world_m, translate=position, rotate=rotation, scale=scale)
+
+
+def transformLimits(*args, **kwargs):
+    g = _g()
+    node = _node(_names(args)[0])
+    for key, value in kwargs.items():
+        if not isinstance(value, (list, tuple, bool)):
+            continue
+        g.set_value(node, "limit_" + key, value)
+
+
+# -------------------------------------------------------------------- constraints
+def _constraint(constraint_type, channels, args, kwargs):
+    g = _g()
+    names = _names(args)
+    if _flag(kwargs, "query", "q", False):
+        node = _node(names[-1])
+        if node.type != constraint_type:
+            node = [x for x in node.children if x.type == constraint_type][0]
+        targets = node.data.get("targets", [])
+        if _flag(kwargs, "targetList", "tl", False):
+            return [x.partial_path() for x in targets]
+        if _flag(kwargs, "weightAliasList", "wal", False):
+            return ["{0}W{1}".format(x.name, i) for i, x in enumerate(targets)]
+        return None
+    targets = [_node(x) for x in names[:-1]]
+    driven = _node(names[-1])
+    if _flag(kwargs, "edit", "e", False) or _flag(kwargs, "remove", "rm", False):
+        return None
+    name = _flag(kwargs, "name", "n") or "{0}_{1}1".format(driven.name, constraint_type)
+    existing = [x for x in driven.children if x.type == constraint_type]
+    if existing:
+        node = existing[0]
+    else:
+        node = g.create_node(constraint_type, name=name, parent=driven if driven.is_dag else None)
+        node.data["targets"] = []
+    skip = _flag(kwargs, "skip", "sk") or []
+    skip = [skip] if isinstance(skip, str) else list(skip)
+    maintain_offset = _flag(kwargs, "maintainOffset", "mo", False)
+    world_m = g.world_matrix(driven)
+    for target in targets:
+        index = len(node.data["targets"])
+        node.data["targets"].append(target)
+        g.add_attribute(node, _graph.Attribute("{0}W{1}".format(target.name, index), "w{0}".format(index),
+                                               "numeric", "double", 1.0))
+        g.set_value(node, "{0}W{1}".format(target.name, index), float(_flag(kwargs, "weight", "w", 1.0)))
+        g.connect(node, "{0}W{1}".format(target.name, index), node, "target[{0}].targetWeight".format(index))
+        for attr in ("parentMatrix[0]", "worldMatrix[0]"):
+            destination = "target[{0}].targetParentMatrix".format(index) if attr == "parentMatrix[0]" else \
+                "target[{0}].targetMatrix".format(index)
+            if constraint_type != "poleVectorConstraint" or attr == "worldMatrix[0]":
+                g.connect(target, attr, node, destination)
+    if constraint_type == "poleVectorConstraint":
+        for source, destination in (("constraintTranslateX", "poleVectorX"), ("constraintTranslateY", "poleVectorY"),
+                                    ("constraintTranslateZ", "poleVectorZ")):
+            if (driven, destination) not in g.inputs:
+                g.connect(node, source, driven, destination)
+        return [node.partial_path()]
+    if driven.is_dag:
+        g.connect(driven, "parentInverseMatrix[0]", node, "constraintParentInverseMatrix", force=True) \
+            if (node, "constraintParentInverseMatrix") not in g.inputs else None
+    if not maintain_offset and targets and driven.is_dag:
+        target_t, target_r, target_s = _matrix.decompose(g.world_matrix(targets[0]))
+        order = int(g.get_value(driven, "rotateOrder"))
+        t, r, s = _matrix.decompose(world_m, order)
+        if "translate" in channels and constraint_type != "aimConstraint":
+            t = [sum(g.world_matrix(x)[12 + i] for x in targets) / len(targets) for i in range(3)]
+        if "rotate" in channels and constraint_type in ("orientConstraint", "parentConstraint"):
+            r = _matrix.decompose(g.world_matrix(targets[0]), order)[1]
+        if "scale" in channels:
+            s = target_s
+        g.set_world_matrix(driven, _matrix.compose(t, r, s, order))
+    for channel in channels:
+        for axis in "XYZ":
+            if axis.lower() in skip:
+                continue
+            destination = channel + axis
+            if driven.is_dag and (driven, destination) not in g.inputs and \
+                    (driven, channel) not in g.inputs and not g.is_locked(driven, destination):
+                g.connect(node, "constraint" + channel[0].upper() + channel[1:] + axis, driven, destination)
+    return [node.partial_path()]
+
+
+def pointConstraint(*args, **kwargs):
+    return _constraint("pointConstraint", ["translate"], args, kwargs)
+
+
+def orientConstraint(*args, **kwargs):
+    return _constraint("orientConstraint", ["rotate"], args, kwargs)
+
+
+def parentConstraint(*args, **kwargs):
+    return _constraint("parentConstraint", ["translate", "rotate"], args, kwargs)
+
+
+def scaleConstraint(*args, **kwargs):
+    return _constraint("scaleConstraint", ["scale"], args, kwargs)
+
+
+def aimConstraint(*args, **kwargs):
+    return _constraint("aimConstraint", ["rotate"], args, kwargs)
+
+
+def poleVectorConstraint(*args, **kwargs):
+    return _constraint("poleVectorConstraint", [], args, kwargs)
+
+
+def ikHandle(*args, **kwargs):
+    g = _g()
+    start_joint = _node(_flag(kwargs, "startJoint", "sj"))
+    end_effector = _node(_flag(kwargs, "endEffector", "ee"))
+    solver = _flag(kwargs, "solver", "sol", "ikRPsolver")
+    name = _flag(kwargs, "name", "n") or "ikHandle#"
+    handle = g.create_node("ikHandle", name=name)
+    effector = g.create_node("ikEffector", name="effector#", parent=end_effector.parent)
+    g.set_world_matrix(handle, g.world_matrix(end_effector))
+    g.connect(start_joint, "message", handle, "startJoint")
+    g.connect(effector, "handlePath[0]", handle, "endEffector")
+    g.connect(end_effector, "translateX", effector, "translateX")
+    handle.data["solver"] = solver
+    result = [handle.partial_path(), effector.partial_path()]
+    if solver == "ikSplineSolver":
+        curve_name = _flag(kwargs, "curve", "c")
+        if curve_name:
+            curve_shape = _node(curve_name)
+            if not curve_shape.is_shape:
+                curve_shape = [x for x in curve_shape.children if x.is_shape][0]
+            g.connect(curve_shape, "worldSpace[0]", handle, "inCurve")
+        elif _flag(kwargs, "createCurve", "ccv", True):
+            transform = g.create_node("transform", name="curve#")
+            shape = g.create_node("nurbsCurve", name=transform.name + "Shape", parent=transform)
+            shape.data["curve"] = {"points": [], "knots": [], "degree": 3, "form": 1}
+            g.connect(shape, "worldSpace[0]", handle, "inCurve")
+            result.append(transform.partial_path())
+    return result
+
+
+def ikHandleDisplayScale(*args, **kwargs):
+    return 1.0
+
+
+# -------------------------------------------------------------------- curves
+def _default_knots(count, degree, periodic=False):
+    if periodic:
+        return list(range(-degree + 1, count + degree - 1 + 1 - degree + 1))[:count + degree - 1]
+    spans = count - degree
+    return [0.0] * (degree - 1) + [float(x) for x in range(spans + 1)] + [float(spans)] * (degree - 1)
+
+
+def curve(*args, **kwargs):
+    g = _g()
+    points = _flag(kwargs, "point", "p") or _flag(kwargs, "editPoint", "ep") or []
+    points = [tuple(float(v) for v in list(p)[:3]) for p in points]
+    degree = int(_flag(kwargs, "degree", "d", 3))
+    if _flag(kwargs, "bezier", "bez", False):
+        degree = 3
+    degree = min(degree, max(1, len(points) - 1))
+    periodic = bool(_flag(kwargs, "periodic", "per", False))
+    knots = _flag(kwargs, "knot", "k")
+    knots = [float(x) for x in knots] if knots is not None else _default_knots(len(points), degree, periodic)
+    name = _flag(kwargs, "name", "n")
+    transform = g.create_node("transform", name=name or "curve#")
+    shape_name = re.sub(r"^(\D+)(\d*)$", r"\1Shape\2", transform.name)
+    shape = g.create_node("nurbsCurve", name=shape_name, parent=transform)
+    shape.data["curve"] = {"points": points, "knots": knots, "degree": degree, "form": 3 if periodic else 1}
+    return transform.partial_path()
+
+
+def duplicateCurve(*args, **kwargs):
+    g = _g()
+    source = _node(_names(args)[0].split(".")[0])
+    if not source.is_shape:
+        source = [x for x in source.children if x.is_shape][0]
+    name = _flag(kwargs, "name", "n") or "duplicatedCurve#"
+    transform = g.create_node("transform", name=name)
+    shape = g.create_node("nurbsCurve", name=transform.name + "Shape", parent=transform)
+    shape.data["curve"] = dict(source.data.get("curve", {}))
+    world_m = g.world_matrix(source)
+    if "points" in shape.data["curve"] and not _flag(kwargs, "local", "l", False):
+        shape.data["curve"]["points"] = [tuple(_transform_point(p, world_m)) for p in shape.data["curve"]["points"]]
+    result = [transform.partial_path()]
+    if _flag(kwargs, "constructionHistory", "ch", True):
+        history = g.create_node("curveFromSurfaceIso" if source.type == "nurbsSurface" else "curveFromCurve")
+        result.append(history.partial_path())
+    return result
+
+
+def rebuildCurve(*args, **kwargs):
+    g = _g()
+    shape = _node(_names(args)[0])
+    if not shape.is_shape:
+        shape = [x for x in shape.children if x.is_shape][0]
+    curve_data = shape.data.setdefault("curve", {"points": [], "knots": [], "degree": 3, "form": 1})
+    spans = int(_flag(kwargs, "spans", "s", 4))
+    degree = int(_flag(kwargs, "degree", "d", curve_data["degree"]))
+    points = curve_data["points"]
+    if len(points) > 1:
+        count = spans + degree
+        curve_data["points"] = [tuple(_graph.sample_polyline(points, i / float(count - 1))) for i in range(count)]
+        g.dirty(shape)
+        curve_data["degree"] = degree
+        curve_data["knots"] = _default_knots(count, degree)
+    result = [shape.parent.partial_path() if shape.parent else shape.partial_path()]
+    if _flag(kwargs, "constructionHistory", "ch", True):
+        result.append(g.create_node("rebuildCurve").partial_path())
+    return result
+
+
+def arclen(*args, **kwargs):
+    g = _g()
+    shape = _node(_names(args)[0])
+    if not shape.is_shape:
+        shape = [x for x in shape.children if x.is_shape][0]
+    if _flag(kwargs, "constructionHistory", "ch", False):
+        curve_info = g.create_node("curveInfo")
+        g.connect(shape, "worldSpace[0]", curve_info, "inputCurve")
+        curve_info.values["arcLength"] = arclen(shape.partial_path())
+        return curve_info.partial_path()
+    world_m = g.world_matrix(shape)
+    points = [_transform_point(p, world_m) for p in shape.data.get("curve", {}).get("points", [])]
+    return sum(math.sqrt(sum((x - y) ** 2 for x, y in zip(a, b))) for a, b in zip(points, points[1:]))
+
+
+def loft(*args, **kwargs):
+    g = _g()
+    name = _flag(kwargs, "name", "n") or "loftedSurface#"
+    transform = g.create_node("transform", name=name)
+    shape = g.create_node("nurbsSurface", name=transform.name + "Shape", parent=transform)
+    result = [transform.partial_path()]
+    if _flag(kwargs, "constructionHistory", "ch", True):
+        loft_node = g.create_node("loft")
+        for i, curve_name in enumerate(_names(args)):
+            curve_shape = _node(curve_name)
+            if not curve_shape.is_shape:
+                curve_shape = [x for x in curve_shape.children if x.is_shape][0]
+            g.connect(curve_shape, "worldSpace[0]", loft_node, "inputCurve[{0}]".format(i))
+        g.connect(loft_node, "outputSurface", shape, "create")
+        result.append(loft_node.partial_path())
+    return result
+
+
+def pointPosition(point, world=False, local=False, **kwargs):
+    g = _g()
+    match = re.match(r"^(.*)\.(cv|ep|vtx)\[(\d+)\]$", str(point))
+    node = _node(match.group(1))
+    if not node.is_shape:
+        node = [x for x in node.children if x.is_shape][0]
+    position = node.data.get("curve", {}).get("points", [(0, 0, 0)])[int(match.group(3))]
+    if world or _flag(kwargs, "w", default=False):
+        return _transform_point(position, g.world_matrix(node))
+    return list(position)
+
+
+# -------------------------------------------------------------------- containers / sets
+def container(*args, **kwargs):
+    g = _g()
+    names = _names(args)
+    query = _flag(kwargs, "query", "q", False)
+    edit = _flag(kwargs, "edit", "e", False)
+    if query:
+        find_container = _flag(kwargs, "findContainer", "fc")
+        if find_container:
+            nodes = [_node(x) for x in _names([find_container])]
+            for node in nodes:
+                if node.container is not None:
+                    return node.container.partial_path()
+            return None
+        if _flag(kwargs, "current", "c", False):
+            current = g.current_container
+            return current.partial_path() if current is not None and current.alive else None
+        node = _node(names[0])
+        if _flag(kwargs, "nodeList", "nl", False):
+            return _none_if_empty([x.partial_path() for x in node.data.get("members", []) if x.alive])
+        if _flag(kwargs, "publishAsRoot", "par", False):
+            root = node.data.get("root")
+            return [root.partial_path(), "1"] if root is not None and root.alive else None
+        if _flag(kwargs, "publishAsParent", "pap", False):
+            return _none_if_empty([v for name, n in node.data.get("parents", {}).items() if n.alive
+                                   for v in (name, n.partial_path())])
+        if _flag(kwargs, "publishAsChild", "pac", False):
+            return _none_if_empty([v for name, n in node.data.get("children", {}).items() if n.alive
+                                   for v in (name, n.partial_path())])
+        if _flag(kwargs, "bindAttr", "ba", False):
+            return _none_if_empty([v for plug, name in node.data.get("bind_attrs", []) for v in (plug, name)])
+        if _flag(kwargs, "publishName", "pn", False):
+            return _none_if_empty(list(node.data.get("published_names", [])))
+        if _flag(kwargs, "type", "typ", False):
+            return node.type
+        return None
+
+    if edit:
+        node = _node(names[0])
+        if _flag(kwargs, "current", "c", False):
+            g.current_container = node
+        add_nodes = _flag(kwargs, "addNode", "an")
+        if add_nodes:
+            for name in _names([add_nodes]):
+                member = _node(name)
+                g.add_to_container(node, member)
+                if _flag(kwargs, "includeHierarchyBelow", "ihb", False):
+                    for child in member.descendants():
+                        g.add_to_container(node, child)
+        remove_nodes = _flag(kwargs, "removeNode", "rn")
+        if remove_nodes:
+            for name in _names([remove_nodes]):
+                g.remove_from_container(node, _node(name))
+        publish_as_root = _flag(kwargs, "publishAsRoot", "par")
+        if publish_as_root:
+            node.data["root"] = _node(publish_as_root[0])
+        publish_as_parent = _flag(kwargs, "publishAsParent", "pap")
+        if publish_as_parent:
+            node.data.setdefault("parents", {})[publish_as_parent[1]] = _node(publish_as_parent[0])
+        publish_as_child = _flag(kwargs, "publishAsChild", "pac")
+        if publish_as_child:
+            node.data.setdefault("children", {})[publish_as_child[1]] = _node(publish_as_child[0])
+        publish_name = _flag(kwargs, "publishName", "pn")
+        if publish_name:
+            node.data.setdefault("published_names", []).append(publish_name)
+        bind_attr = _flag(kwargs, "bindAttr", "ba")
+        if bind_attr:
+            plug_node, plug_attr = _plug(bind_attr[0])
+            node.data.setdefault("bind_attrs", []).append((plug_node.partial_path() + "." + plug_attr,
+                                                           bind_attr[1]))
+        unbind = _flag(kwargs, "unbindAndUnpublish", "ubp")
+        if unbind:
+            plug_node, plug_attr = _plug(unbind)
+            plug = plug_node.partial_path() + "." + plug_attr
+            node.data["bind_attrs"] = [x for x in node.data.get("bind_attrs", []) if x[0] != plug]
+        for flag, short, key in (("unbindParent", "ubp", "parents"), ("unpublishParent", "upp", "parents"),
+                                 ("unbindChild", "ubc", "children"), ("unpublishChild", "upc", "children")):
+            value = kwargs.get(flag)
+            if value:
+                node.data.get(key, {}).pop(value, None)
+        return None
+
+    name = _flag(kwargs, "name", "n") or "container#"
+    container_type = _flag(kwargs, "type", "typ", "container")
+    node = g.create_node(container_type, name=name)
+    add_nodes = _flag(kwargs, "addNode", "an")
+    if add_nodes:
+        for x in _names([add_nodes]):
+            g.add_to_container(node, _node(x))
+    return node.partial_path()
+
+
+def containerPublish(*args, **kwargs):
+    g = _g()
+    node = _node(_names(args)[0])
+    published = node.data.setdefault("published_nodes", {})
+    if _flag(kwargs, "query", "q", False):
+        if _flag(kwargs, "bindNode", "bn", False):
+            return _none_if_empty([v for name, n in published.items() if n is not None and n.alive
+                                   for v in (name, n.partial_path())])
+        if _flag(kwargs, "publishNode", "pn", False):
+            return _none_if_empty([v for name in published for v in (name, "")])
+        return None
+    publish_node = _flag(kwargs, "publishNode", "pn")
+    if publish_node:
+        published.setdefault(publish_node[0], None)
+    bind_node = _flag(kwargs, "bindNode", "bn")
+    if bind_node:
+        published[bind_node[0]] = _node(bind_node[1])
+    unbind_node = _flag(kwargs, "unbindNode", "ubn")
+    if unbind_node and unbind_node in published:
+        published[unbind_node] = None
+    unpublish_node = _flag(kwargs, "unpublishNode", "upn")
+    if unpublish_node:
+        published.pop(unpublish_node, None)
+    return None
+
+
+def sets(*args, **kwargs):
+    g = _g()
+    names = _names(args)
+    if _flag(kwargs, "query", "q", False):
+        node = _node(names[0])
+        return _none_if_empty([x.partial_path() for x in node.data.get("members", []) if x.alive])
+    add_element = _flag(kwargs, "addElement", "add") or _flag(kwargs, "include", "in") or \
+        _flag(kwargs, "forceElement", "fe")
+    if add_element:
+        node = _node(add_element)
+        members = node.data.setdefault("members", [])
+        for name in names:
+            member = _node(name)
+            if member not in members:
+                members.append(member)
+        return None
+    remove = _flag(kwargs, "remove", "rm")
+    if remove:
+        node = _node(remove)
+        members = node.data.setdefault("members", [])
+        for name in names:
+            member = _node(name)
+            if member in members:
+                members.remove(member)
+        return None
+    if _flag(kwargs, "isMember", "im"):
+        node = _node(_flag(kwargs, "isMember", "im"))
+        return all(_node(x) in node.data.get("members", []) for x in names)
+    name = _flag(kwargs, "name", "n") or "set#"
+    node = g.create_node("objectSet", name=name)
+    node.data["members"] = [] if _flag(kwargs, "empty", "em", False) else [_node(x) for x in names]
+    return node.partial_path()
+
+
+def listSets(*args, **kwargs):
+    g = _g()
+    obj = _flag(kwargs, "object", "o")
+    if obj is None:
+        return _none_if_empty([x.partial_path() for x in g.nodes.values() if x.type == "objectSet"])
+    node = _node(obj)
+    return _none_if_empty([x.partial_path() for x in g.nodes.values()
+                           if x.type == "objectSet" and node in x.data.get("members", [])])
+
+
+# -------------------------------------------------------------------- rigging nodes
+def controller(*args, **kwargs):
+    g = _g()
+    names = _names(args)
+    if _flag(kwargs, "query", "q", False):
+        node = _node(names[0])
+        tags = [other for other, attr in g.connections_of(node, "message", False, True)
+                if other.type == "controller" and attr == "controllerObject"]
+        return _none_if_empty([x.partial_path() for x in tags])
+    if _flag(kwargs, "isController", "ic", False):
+        node = _node(names[0])
+        return int(any(other.type == "controller" for other, _ in g.connections_of(node, "message", False, True)))
+    if _flag(kwargs, "parent", "p", False) and len(names) == 2:
+        child_tag = controller(names[0], query=True)
+        parent_tag = controller(names[1], query=True)
+        if child_tag and parent_tag:
+            child = _node(child_tag[0])
+            parent_node = _node(parent_tag[0])
+            index = len(g.element_indices(parent_node, "children"))
+            g.connect(child, "parent", parent_node, "children[{0}]".format(index))
+        return None
+    for name in names:
+        node = _node(name)
+        if controller(name, query=True):
+            continue
+        tag = g.create_node("controller", name=node.name + "_tag")
+        g.connect(node, "message", tag, "controllerObject")
+    return None
+
+
+def poseInterpolator(*args, **kwargs):
+    g = _g()
+    names = _names(args)
+    if _flag(kwargs, "query", "q", False):
+        node = _node(names[0])
+        if _flag(kwargs, "index", "i", False):
+            return list(range(len(node.data.get("poses", []))))
+        if _flag(kwargs, "poseNames", "pn", False):
+            return list(node.data.get("poses", []))
+        return None
+    if _flag(kwargs, "edit", "e", False):
+        node = _node(names[0])
+        if node.type != "poseInterpolator":
+            node = [x for x in node.children if x.type == "poseInterpolator"][0]
+        add_pose = _flag(kwargs, "addPose", "ap")
+        if add_pose:
+            poses = node.data.setdefault("poses", [])
+            poses.append(add_pose)
+            g.set_value(node, "pose[{0}].poseName".format(len(poses) - 1), add_pose)
+        return None
+    name = _flag(kwargs, "name", "n") or "poseInterpolator#"
+    transform = g.create_node("transform", name=name)
+    shape = g.create_node("poseInterpolator", name=transform.name + "Shape", parent=transform)
+    drivers = [_node(x) for x in names] or list(g.selection)
+    for i, driver in enumerate(drivers):
+        g.connect(driver, "matrix", shape, "driver[{0}].driverMatrix".format(i))
+    return [transform.partial_path()]
+
+
+def scriptNode(*args, **kwargs):
+    g = _g()
+    names = _names(args)
+    if _flag(kwargs, "executeBefore", "eb", False) or _flag(kwargs, "executeAfter", "ea", False):
+        return None
+    if _flag(kwargs, "query", "q", False):
+        node = _node(names[0])
+        if _flag(kwargs, "beforeScript", "bs", False):
+            return node.data.get("before")
+        if _flag(kwargs, "afterScript", "as", False):
+            return node.data.get("after")
+        return None
+    if _flag(kwargs, "edit", "e", False):
+        node = _node(names[0])
+    else:
+        node = g.create_node("script", name=_flag(kwargs, "name", "n") or "script#")
+    before = _flag(kwargs, "beforeScript", "bs")
+    if before is not None:
+        node.data["before"] = before
+        g.set_value(node, "before", before)
+    after = kwargs.get("afterScript")
+    if after is not None:
+        node.data["after"] = after
+        g.set_value(node, "after", after)
+    for long_name, short_name in (("scriptType", "st"), ("sourceType", "stp")):
+        value = _flag(kwargs, long_name, short_name)
+        if value is not None:
+            g.set_value(node, long_name, value)
+    return node.partial_path()
+
+
+def setDrivenKeyframe(*args, **kwargs):
+    g = _g()
+    driven_node, driven_attr = _plug(_names(args)[0])
+    driver_node, driver_attr = _plug(_flag(kwargs, "currentDriver", "cd"))
+    driver_value = _flag(kwargs, "driverValue", "dv", g.get_value(driver_node, driver_attr))
+    value = _flag(kwargs, "value", "v", g.get_value(driven_node, driven_attr))
+    curve_node = None
+    source = g.inputs.get((driven_node, driven_attr))
+    if source is not None and source[0].type.startswith("animCurveU"):
+        curve_node = source[0]
+    elif source is not None and source[0].type == "blendWeighted":
+        for other, _ in g.connections_of(source[0], "input", True, False):
+            if g.inputs.get((other, "input")) == (driver_node, driver_attr):
+                curve_node = other
+    if curve_node is None:
+        definition = g.attribute(driven_node, _graph.strip_index(driven_attr))
+        curve_type = {"doubleAngle": "animCurveUA", "doubleLinear": "animCurveUL"}.get(definition.type,
+                                                                                        "animCurveUU")
+        curve_node = g.create_node(curve_type, name="{0}_{1}".format(driven_node.name, driven_attr.split(".")[-1]))
+        g.connect(driver_node, driver_attr, curve_node, "input")
+        if source is None:
+            g.connect(curve_node, "output", driven_node, driven_attr)
+        else:
+            blend = source[0] if source[0].type == "blendWeighted" else None
+            if blend is None:
+                blend = g.create_node("blendWeighted")
+                g.disconnect(source[0], source[1], driven_node, driven_attr)
+                g.connect(source[0], source[1], blend, "input[0]")
+                g.connect(blend, "output", driven_node, driven_attr)
+            index = len(g.element_indices(blend, "input"))
+            g.connect(curve_node, "output", blend, "input[{0}]".format(index))
+    curve_node.data.setdefault("keys", {})[float(driver_value)] = float(value)
+    g.dirty(curve_node)
+    return None
+
+
+def setInfinity(*args, **kwargs):
+    return None
+
+
+def setKeyframe(*args, **kwargs):
+    g = _g()
+    attribute = _flag(kwargs, "attribute", "at")
+    value = _flag(kwargs, "value", "v")
+    time = _flag(kwargs, "time", "t", g.time)
+    if isinstance(time, (list, tuple)):
+        time = time[0]
+    count = 0
+    for name in _names(args) or [x.partial_path() for x in g.selection]:
+        if "." in name.split("|")[-1]:
+            plugs = [_plug(name)]
+        else:
+            node = _node(name)
+            attrs = _names([attribute]) if attribute else [x for x in g.static_attributes(node) +
+                                                           list(node.attributes) if g.get_flag(node, x, "keyable")
+                                                           and not g.children_attrs(node, x)]
+            plugs = [(node, g.long_attr_name(node, x)) for x in attrs]
+        for node, attr in plugs:
+            if node.type.startswith("animCurve"):
+                curve_node = node
+            else:
+                current = g.get_value(node, attr)
+                source = g.inputs.get((node, attr))
+                if source is not None and source[0].type.startswith("animCurveT"):
+                    curve_node = source[0]
+                else:
+                    curve_node = g.create_node("animCurveTU", name="{0}_{1}".format(node.name, attr))
+                    # maya blends keys into a driven plug through a pairBlend. the stand-in keeps the driver
+                    if source is None:
+                        g.connect(curve_node, "output", node, attr)
+            key_value = value if value is not None else (current if curve_node is not node else 0.0)
+            key = _flag(kwargs, "float", "f", time)
+            curve_node.data.setdefault("keys", {})[float(key)] = float(key_value)
+            g.dirty(curve_node)
+            count += 1
+    return count
+
+
+def keyframe(*args, **kwargs):
+    g = _g()
+    names = _names(args)
+    if _flag(kwargs, "query", "q", False) and names:
+        node = _node(names[0])
+        keys = sorted(node.data.get("keys", {}).items())
+        if _flag(kwargs, "valueChange", "vc", False):
+            return [v for _, v in keys]
+        if _flag(kwargs, "keyframeCount", "kc", False):
+            return len(keys)
+        return [k for k, _ in keys]
+    return None
+
+
+def cutKey(*args, **kwargs):
+    g = _g()
+    for name in _names(args):
+        node = _node(name) if "." not in name else _plug(name)[0]
+        for other, _ in g.connections_of(node, None, True, False):
+            if other.type.startswith("animCurveT"):
+                g.delete(other)
+    return 0
+
+
+def skinCluster(*args, **kwargs):
+    g = _g()
+    if _flag(kwargs, "query", "q", False) or _flag(kwargs, "edit", "e", False):
+        node = _node(_names(args)[0])
+        if _flag(kwargs, "influence", "inf", False):
+            return [x.partial_path() for x in node.data.get("influences", [])]
+        if _flag(kwargs, "geometry", "g", False):
+            return [x.partial_path() for x in node.data.get("geometry", [])]
+        return None
+    names = _names(args)
+    node = g.create_node("skinCluster", name=_flag(kwargs, "name", "n") or "skinCluster#")
+    node.data["influences"] = [_node(x) for x in names[:-1]]
+    for i, influence in enumerate(node.data["influences"]):
+        g.connect(influence, "worldMatrix[0]", node, "matrix[{0}]".format(i))
+    shape = _node(names[-1])
+    if not shape.is_shape:
+        shape = [x for x in shape.children if x.is_shape][0]
+    # deformed shapes keep the original geometry as an intermediate shape
+    orig = g.duplicate(shape, name=shape.name + "Orig", children=False)
+    g.set_value(orig, "intermediateObject", True)
+    attr = "worldMesh" if shape.type == "mesh" else "worldSpace"
+    g.connect(orig, attr + "[0]", node, "input[0].inputGeometry")
+    g.connect(node, "outputGeometry[0]", shape, "inMesh" if shape.type == "mesh" else "create", force=True)
+    node.data["geometry"] = [shape]
+    return [node.partial_path()]
+
+
+def skinPercent(*args, **kwargs):
+    return None
+
+
+def polySelect(*args, **kwargs):
+    return []
+
+
+def polyEvaluate(*args, **kwargs):
+    return 0
+
+
+# -------------------------------------------------------------------- scene / session
+def undoInfo(*args, **kwargs):
+    if _flag(kwargs, "query", "q", False):
+        return True
+    return None
+
+
+def currentTime(*args, **kwargs):
+    g = _g()
+    if _flag(kwargs, "query", "q", False):
+        return g.time
+    if args:
+        g.set_time(args[0])
+    return g.time
+
+
+def playbackOptions(*args, **kwargs):
+    if _flag(kwargs, "query", "q", False):
+        return 1.0
+    return None
+
+
+def pluginInfo(*args, **kwargs):
+    if _flag(kwargs, "query", "q", False):
+        name = _names(args)[0] if args else ""
+        if _flag(kwargs, "loaded", "l", False) or _flag(kwargs, "registered", "r", False):
+            return name in _loaded_plugins or os.path.splitext(os.path.basename(name))[0] in _loaded_plugins
+        return None
+    return None
+
+
+_loaded_plugins = {}
+
+
+def loadPlugin(*args, **kwargs):
+    from standin import openmaya
+
+    result = []
+    for path in _names(args):
+        name = os.path.splitext(os.path.basename(path))[0]
+        if name in _loaded_plugins:
+            continue
+        module = None
+        for m in list(sys.modules.values()):
+            module_file = getattr(m, "__file__", None) or ""
+            if module_file and os.path.normcase(os.path.splitext(os.path.abspath(module_file))[0]) == \
+                    os.path.normcase(os.path.splitext(os.path.abspath(path))[0]):
+                module = m
+                break
+        if module is None or not hasattr(module, "initializePlugin"):
+            raise RuntimeError("loadPlugin: Plug-in, \"{0}\", was not found on MAYA_PLUG_IN_PATH.".format(path))
+        module.initializePlugin(openmaya.MObject())
+        _loaded_plugins[name] = module
+        result.append(name)
+    return result
+
+
+def unloadPlugin(*args, **kwargs):
+    from standin import openmaya
+
+    for path in _names(args):
+        name = os.path.splitext(os.path.basename(path))[0]
+        module = _loaded_plugins.pop(name, None)
+        if module is not None and hasattr(module, "uninitializePlugin"):
+            module.uninitializePlugin(openmaya.MObject())
+
+
+def optionVar(*args, **kwargs):
+    if _flag(kwargs, "query", "q", False) or _flag(kwargs, "exists", "ex", False):
+        return 0
+    return None
+
+
+def about(*args, **kwargs):
+    if _flag(kwargs, "version", "v", False) or _flag(kwargs, "apiVersion", "api", False):
+        return "2024"
+    if _flag(kwargs, "batch", "b", False):
+        return True
+    return ""
+
+
+def namespaceInfo(*args, **kwargs):
+    return ":"
+
+
+def warning(*args, **kwargs):
+    print("Warning: " + " ".join(str(x) for x in args))
+
+
+def error(*args, **kwargs):
+    raise RuntimeError(" ".join(str(x) for x in args))
+
+
+def refresh(*args, **kwargs):
+    return None
+
+
+def dgdirty(*args, **kwargs):
+    return None
+
+
+def flushUndo(*args, **kwargs):
+    return None
+
+
+def evalDeferred(*args, **kwargs):
+    return None
+
+
+def __getattr__(name):
+    # plug-in commands registered through MFnPlugin run like maya would run them.
+    if name in _graph._commands:
+        creator = _graph._commands[name]
+
+        def plugin_command(*args, **kwargs):
+            from standin import openmaya
+
+            command = creator()
+            command.doIt(openmaya.MArgList(args))
+
+        return plugin_command
+    if name.startswith("__"):
+        raise AttributeError(name)
+
+    def unknown_command(*args, **kwargs):
+        _g().calls.append((name, args, kwargs))
+        return None
+
+    return unknown_command
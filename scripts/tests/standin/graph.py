@@ -0,0 +1,1120 @@
+# built-ins
+import re
+import uuid
+import fnmatch
+import itertools
+from collections import OrderedDict, defaultdict
+
+# standin
+from standin import matrix
+
+# Recording node graph behind the stand-in maya modules.
+# nodes, attributes, connections and set values are kept in memory, transforms are evaluated so
+# xform / getAttr queries return what maya would. everything else returns stored values or defaults.
+
+IDENTITY = matrix.identity()
+
+# {short name: long name}
+ALIASES = {
+    "t": "translate", "tx": "translateX", "ty": "translateY", "tz": "translateZ",
+    "r": "rotate", "rx": "rotateX", "ry": "rotateY", "rz": "rotateZ",
+    "s": "scale", "sx": "scaleX", "sy": "scaleY", "sz": "scaleZ",
+    "sh": "shear", "shxy": "shearXY", "shxz": "shearXZ", "shyz": "shearYZ",
+    "jo": "jointOrient", "jox": "jointOrientX", "joy": "jointOrientY", "joz": "jointOrientZ",
+    "ra": "rotateAxis", "rax": "rotateAxisX", "ray": "rotateAxisY", "raz": "rotateAxisZ",
+    "rp": "rotatePivot", "sp": "scalePivot",
+    "v": "visibility", "ro": "rotateOrder", "it": "inheritsTransform",
+    "m": "matrix", "im": "inverseMatrix", "wm": "worldMatrix", "wim": "worldInverseMatrix",
+    "pm": "parentMatrix", "pim": "parentInverseMatrix", "xm": "xformMatrix", "opm": "offsetParentMatrix",
+    "io": "intermediateObject", "ihi": "isHistoricallyInteresting", "msg": "message",
+    "ove": "overrideEnabled", "ovc": "overrideColor", "ovrgbf": "overrideRGBColors",
+    "ovrgb": "overrideColorRGB", "ovdt": "overrideDisplayType", "ovv": "overrideVisibility",
+    "hio": "hiddenInOutliner", "uoc": "useOutlinerColor", "oclr": "outlinerColor",
+    "dla": "displayLocalAxis", "dh": "displayHandle", "lw": "lineWidth", "lodv": "lodVisibility",
+    "ssc": "segmentScaleCompensate", "radi": "radius", "ds": "drawStyle", "is": "inverseScale",
+    "cp": "controlPoints", "ws": "worldSpace", "l": "local", "cc": "cached", "cr": "create",
+}
+# {compound: children}
+COMPOUNDS = {
+    "translate": ("translateX", "translateY", "translateZ"),
+    "rotate": ("rotateX", "rotateY", "rotateZ"),
+    "scale": ("scaleX", "scaleY", "scaleZ"),
+    "shear": ("shearXY", "shearXZ", "shearYZ"),
+    "jointOrient": ("jointOrientX", "jointOrientY", "jointOrientZ"),
+    "rotateAxis": ("rotateAxisX", "rotateAxisY", "rotateAxisZ"),
+    "rotatePivot": ("rotatePivotX", "rotatePivotY", "rotatePivotZ"),
+    "scalePivot": ("scalePivotX", "scalePivotY", "scalePivotZ"),
+    "overrideColorRGB": ("overrideColorR", "overrideColorG", "overrideColorB"),
+    "outlinerColor": ("outlinerColorR", "outlinerColorG", "outlinerColorB"),
+}
+# utility node compounds {name: children suffixes}
+XYZ_COMPOUNDS = ("input1", "input2", "output", "outputTranslate", "outputRotate", "outputScale", "outputShear",
+                 "inputTranslate", "inputRotate", "inputScale", "inputShear", "constraintTranslate",
+                 "constraintRotate", "constraintScale", "offset", "aimVector", "upVector", "worldUpVector",
+                 "restTranslate", "restRotate", "targetTranslate", "targetRotate", "targetScale", "position",
+                 "result", "point", "normal", "tangent", "vector", "outputQuat", "inputQuat", "min", "max",
+                 "value", "translation", "rotation")
+RGB_COMPOUNDS = ("color", "colorIfTrue", "colorIfFalse", "outColor", "color1", "color2", "input")
+LOWER_XYZ_COMPOUNDS = ("input3D", "output3D", "input2D", "output2D")
+
+TRANSFORM_TYPES = ("transform", "joint", "ikHandle", "ikEffector", "dagContainer", "pointConstraint",
+                   "orientConstraint", "parentConstraint", "aimConstraint", "scaleConstraint",
+                   "poleVectorConstraint", "place3dTexture")
+SHAPE_TYPES = ("nurbsCurve", "nurbsSurface", "mesh", "locator", "poseInterpolator", "camera", "follicle")
+SHAPE_NAMES = {"nurbsCurve": "curve", "nurbsSurface": "surface", "mesh": "polySurface", "locator": "locator",
+               "poseInterpolator": "poseInterpolator", "follicle": "follicle", "camera": "camera"}
+MATRIX_ATTRS = ("matrix", "inverseMatrix", "worldMatrix", "worldInverseMatrix", "parentMatrix",
+                "parentInverseMatrix", "xformMatrix", "offsetParentMatrix", "inputMatrix", "outputMatrix",
+                "matrixSum", "matrixIn", "bindPreMatrix", "dagLocalMatrix", "dagLocalInverseMatrix")
+DEFAULTS = {
+    "visibility": True, "inheritsTransform": True, "scaleX": 1.0, "scaleY": 1.0, "scaleZ": 1.0,
+    "lineWidth": -1.0, "isHistoricallyInteresting": 2, "segmentScaleCompensate": True, "radius": 1.0,
+    "lodVisibility": True, "overrideVisibility": True, "overrideShading": True, "overrideTexturing": True,
+    "overridePlayback": True, "overrideColor": 0, "envelope": 1.0, "displayHandle": False,
+    "input2X": 1.0, "input2Y": 1.0, "input2Z": 1.0, "weight": 1.0, "blender": 0.5, "operation": 1,
+}
+
+
+class Attribute:
+
+    def __init__(self, long_name, short_name=None, kind="numeric", type_name="double", default=None):
+        self.long_name = long_name
+        self.short_name = short_name or long_name
+        self.kind = kind
+        self.type = type_name
+        self.default = default
+        self.multi = False
+        self.keyable = False
+        self.channel_box = False
+        self.hidden = False
+        self.storable = True
+        self.readable = True
+        self.writable = True
+        self.connectable = True
+        self.used_as_color = False
+        self.nice_name = None
+        self.min = None
+        self.max = None
+        self.soft_min = None
+        self.soft_max = None
+        self.enum_names = []
+        self.children = []
+        self.parent = None
+
+    def copy(self):
+        attr = Attribute(self.long_name, self.short_name, self.kind, self.type, self.default)
+        attr.__dict__.update(self.__dict__)
+        attr.enum_names = list(self.enum_names)
+        attr.children = [x.copy() for x in self.children]
+        for child in attr.children:
+            child.parent = attr
+        return attr
+
+    def serialize(self):
+        data = {"shortName": self.short_name, "type": self.type}
+        if self.multi:
+            data["multi"] = True
+        if self.keyable:
+            data["keyable"] = True
+        if self.parent is not None:
+            data["parent"] = self.parent.long_name
+        if self.enum_names:
+            data["enumName"] = ":".join("{0}={1}".format(n, i) for n, i in self.enum_names)
+        if self.min is not None:
+            data["minValue"] = self.min
+        if self.max is not None:
+            data["maxValue"] = self.max
+        if self.default is not None:
+            data["defaultValue"] = self.default
+        return data
+
+
+class Node:
+
+    def __init__(self, graph, name, node_type, parent=None):
+        self.graph = graph
+        self.name = name
+        self.type = node_type
+        self.parent = parent
+        self.children = []
+        self.attributes = OrderedDict()
+        self.aliases = {}
+        self.values = {}
+        self.flags = {}
+        self.uuid = str(uuid.uuid4()).upper()
+        self.alive = False
+        self.locked = False
+        self.container = None
+        self.data = {}
+        self.inputs = set()
+        self.outputs = set()
+        self.is_shape = node_type in SHAPE_TYPES
+        self.is_dag = self.is_shape or node_type in TRANSFORM_TYPES or node_type.endswith("Constraint")
+
+    def __repr__(self):
+        return "<Node {0} {1}>".format(self.type, self.full_path() if self.is_dag else self.name)
+
+    def full_path(self):
+        if not self.is_dag:
+            return self.name
+        names = []
+        node = self
+        while node is not None:
+            names.append(node.name)
+            node = node.parent
+        return "|" + "|".join(reversed(names))
+
+    def partial_path(self):
+        if not self.is_dag:
+            return self.name
+        same_names = self.graph.names.get(self.name, [])
+        if len(same_names) <= 1:
+            return self.name
+        parts = self.full_path()[1:].split("|")
+        for i in range(2, len(parts) + 1):
+            suffix = "|" + "|".join(parts[-i:])
+            if len([x for x in same_names if x.full_path().endswith(suffix)]) == 1:
+                return "|".join(parts[-i:]) if i < len(parts) else "|" + "|".join(parts)
+        return self.full_path()
+
+    def descendants(self):
+        for child in self.children:
+            yield child
+            for x in child.descendants():
+                yield x
+
+
+def strip_index(attr):
+    """'a[0].b[1]' -> 'b', 'a[0]' -> 'a'"""
+    return re.sub(r"\[.*?\]", "", attr.split(".")[-1])
+
+
+def split_plug(plug):
+    node, _, attr = plug.partition(".")
+    return node, attr
+
+
+class Graph:
+
+    def __init__(self):
+        self.nodes = OrderedDict()
+        self.names = defaultdict(list)
+        self.uuids = {}
+        self.inputs = {}
+        self.outputs = defaultdict(list)
+        self.selection = []
+        self.current_container = None
+        self.time = 1.0
+        # MDGContext time. None evaluates at self.time
+        self.context_time = None
+        self.callbacks = OrderedDict()
+        self.counter = itertools.count(1)
+        self.calls = []
+        # evaluated values. edits drop the cache of the node and everything downstream of it
+        # {node id: {attr: value}}, attr None is the world matrix
+        self.cache = {}
+        self.cycle = False
+
+    # ---------------------------------------------------------------- nodes
+    def unique_name(self, name, parent=None, is_dag=False, ignore=None):
+        def conflict(n):
+            for node in self.names.get(n, []):
+                if node is ignore:
+                    continue
+                if not is_dag or not node.is_dag or node.parent is parent:
+                    return True
+            return False
+
+        if "#" not in name and not conflict(name):
+            return name
+        match = re.match(r"^(.*?)(\d*)$", name.replace("#", ""))
+        base, number = match.group(1), match.group(2)
+        index = int(number) + 1 if number else 1
+        while conflict("{0}{1}".format(base, index)):
+            index += 1
+        return "{0}{1}".format(base, index)
+
+    def create_node(self, node_type, name=None, parent=None, defer=False, skip_shape_parent=False):
+        if node_type in SHAPE_TYPES and parent is None and not skip_shape_parent:
+            base = SHAPE_NAMES.get(node_type, node_type)
+            parent = self.create_node("transform", name=base + "#" if not name else name + "_transform#")
+            if not name:
+                name = re.sub(r"^(\D+)(\d*)$", r"\1Shape\2", parent.name)
+        if not name:
+            name = node_type[0].lower() + node_type[1:] + "#"
+        node = Node(self, name, node_type)
+        node.parent = parent if node.is_dag else None
+        node.name = self.unique_name(name, node.parent, node.is_dag)
+        if not defer:
+            self.insert(node)
+        return node
+
+    def insert(self, node):
+        node.alive = True
+        self.nodes[id(node)] = node
+        self.names[node.name].append(node)
+        self.uuids[node.uuid] = node
+        if node.parent is not None:
+            node.parent.children.append(node)
+        if self.current_container is not None and self.current_container.alive:
+            self.add_to_container(self.current_container, node)
+        self.join_dag_container(node)
+        self.fire("node_added", node)
+        return node
+
+    def delete(self, node):
+        if not node.alive:
+            return
+        self.dirty(node)
+        for child in list(node.children):
+            self.delete(child)
+        self.fire("node_removed", node)
+        for attr in list(node.inputs):
+            source = self.inputs.get((node, attr))
+            if source:
+                self.disconnect(source[0], source[1], node, attr)
+        for attr in list(node.outputs):
+            for destination in list(self.outputs.get((node, attr), [])):
+                self.disconnect(node, attr, destination[0], destination[1])
+        if node.container is not None:
+            self.remove_from_container(node.container, node)
+        for member in node.data.get("members", []):
+            if member.container is node:
+                member.container = None
+        for x in self.nodes.values():
+            if x.type == "objectSet" and node in x.data.get("members", []):
+                x.data["members"].remove(node)
+        if node.parent is not None and node in node.parent.children:
+            node.parent.children.remove(node)
+        self.names[node.name].remove(node)
+        if not self.names[node.name]:
+            del self.names[node.name]
+        self.uuids.pop(node.uuid, None)
+        self.nodes.pop(id(node), None)
+        if node in self.selection:
+            self.selection.remove(node)
+        if self.current_container is node:
+            self.current_container = None
+        node.alive = False
+
+    def rename(self, node, name):
+        name = self.unique_name(name.split("|")[-1], node.parent, node.is_dag, ignore=node)
+        if name == node.name:
+            return node.name
+        self.names[node.name].remove(node)
+        if not self.names[node.name]:
+            del self.names[node.name]
+        node.name = name
+        self.names[node.name].append(node)
+        return node.name
+
+    def reparent(self, node, parent, relative=False):
+        self.dirty(node)
+        world_m = None if relative or node.is_shape else self.world_matrix(node)
+        if node.parent is not None:
+            node.parent.children.remove(node)
+        node.parent = parent
+        if parent is not None:
+            parent.children.append(node)
+            self.join_dag_container(node)
+        if self.unique_name(node.name, parent, True, ignore=node) != node.name:
+            self.rename(node, node.name)
+        if world_m is not None:
+            self.set_world_matrix(node, world_m)
+        return node
+
+    def find(self, name, required=True):
+        if isinstance(name, Node):
+            return name
+        name = str(name)
+        if name.startswith(":"):
+            name = name[1:]
+        parts = name.strip("|").split("|")
+        candidates = self.names.get(parts[-1], [])
+        if len(parts) > 1 or name.startswith("|"):
+            path = "|" + "|".join(parts)
+            candidates = [x for x in candidates
+                          if (x.full_path() == path if name.startswith("|") else x.full_path().endswith(path))]
+        if len(candidates) == 1:
+            return candidates[0]
+        if not candidates and name in self.uuids:
+            return self.uuids[name]
+        if not required:
+            return None
+        if candidates:
+            raise ValueError("More than one object matches name: {0}".format(name))
+        raise ValueError("No object matches name: {0}".format(name))
+
+    def exists(self, name):
+        try:
+            return self.find(name) is not None
+        except ValueError:
+            return False
+
+    def find_plug(self, plug):
+        node_name, attr = split_plug(plug)
+        node = self.find(node_name)
+        return node, self.long_attr_name(node, attr)
+
+    def ls(self, pattern=None, node_type=None):
+        if pattern is None:
+            nodes = list(self.nodes.values())
+        elif isinstance(pattern, Node):
+            nodes = [pattern]
+        elif "." in str(pattern).split("|")[-1]:
+            node_pattern, attr = split_plug(pattern)
+            nodes = [x for x in self.ls(node_pattern) if self.has_attribute(x, strip_index(attr))]
+        elif any(c in pattern for c in "*?["):
+            if "|" in pattern:
+                nodes = [x for x in self.nodes.values() if fnmatch.fnmatchcase(x.full_path(), pattern)
+                         or fnmatch.fnmatchcase(x.full_path(), "*|" + pattern.lstrip("|"))]
+            else:
+                nodes = [x for x in self.nodes.values() if fnmatch.fnmatchcase(x.name, pattern)]
+        else:
+            node = self.find(pattern, required=False)
+            if node is None and pattern in self.uuids:
+                node = self.uuids[pattern]
+            nodes = [node] if node is not None else []
+        if node_type:
+            types = node_type if isinstance(node_type, (list, tuple)) else [node_type]
+            nodes = [x for x in nodes if self.is_type(x, types)]
+        return nodes
+
+    @staticmethod
+    def is_type(node, types):
+        for t in types:
+            if node.type == t:
+                return True
+            if t == "transform" and node.is_dag and not node.is_shape:
+                return True
+            if t in ("dagNode",) and node.is_dag:
+                return True
+            if t in ("shape", "geometryShape", "controlPoint", "deformableShape") and node.is_shape:
+                return True
+            if t == "animCurve" and node.type.startswith("animCurve"):
+                return True
+            if t == "constraint" and node.type.endswith("Constraint"):
+                return True
+            if t in ("dependNode", "node"):
+                return True
+        return False
+
+    def duplicate(self, node, name=None, parent=None, children=True):
+        new = self.create_node(node.type, name=name or node.name, parent=node.parent if parent is None else parent,
+                               skip_shape_parent=True)
+        new.values = dict(node.values)
+        new.flags = {k: dict(v) for k, v in node.flags.items()}
+        new.data = {k: (dict(v) if isinstance(v, dict) else v) for k, v in node.data.items() if k != "members"}
+        for attr in node.attributes.values():
+            self.add_attribute(new, attr.copy())
+        if children:
+            for child in list(node.children):
+                self.duplicate(child, child.name, new)
+        return new
+
+    # ---------------------------------------------------------------- containers / sets
+    def add_to_container(self, container, node):
+        if node is container:
+            return
+        if node.container is not None:
+            self.remove_from_container(node.container, node)
+        node.container = container
+        container.data.setdefault("members", []).append(node)
+
+    def join_dag_container(self, node):
+        # dag nodes parented into a dagContainer hierarchy become its members
+        parent = node.parent
+        if parent is None or node.container is not None:
+            return
+        container = parent if parent.type == "dagContainer" else parent.container
+        if container is not None and container.type == "dagContainer":
+            self.add_to_container(container, node)
+
+    def remove_from_container(self, container, node):
+        members = container.data.get("members", [])
+        if node in members:
+            members.remove(node)
+        if node.container is container:
+            node.container = None
+
+    # ---------------------------------------------------------------- attributes
+    def long_attr_name(self, node, attr):
+        parts = []
+        for part in attr.split("."):
+            name, bracket, rest = part.partition("[")
+            name = node.aliases.get(name, name)
+            if name not in node.attributes:
+                name = ALIASES.get(name, name)
+            parts.append(name + bracket + rest)
+        return ".".join(parts)
+
+    def short_attr_name(self, node, attr):
+        reverse = dict((v, k) for k, v in ALIASES.items())
+        parts = []
+        for part in attr.split("."):
+            name, bracket, rest = part.partition("[")
+            if name in node.attributes:
+                name = node.attributes[name].short_name
+            else:
+                name = reverse.get(name, name)
+            parts.append(name + bracket + rest)
+        return ".".join(parts)
+
+    def add_attribute(self, node, attr):
+        if attr.long_name in node.attributes:
+            raise RuntimeError("Found a matching attribute for '{0}'".format(attr.long_name))
+        node.attributes[attr.long_name] = attr
+        if attr.short_name != attr.long_name:
+            node.aliases[attr.short_name] = attr.long_name
+        if attr.parent is None and attr.kind == "compound" or attr.children:
+            for child in attr.children:
+                child.parent = attr
+                self.add_attribute(node, child)
+        return attr
+
+    def remove_attribute(self, node, name):
+        attr = node.attributes.pop(self.long_attr_name(node, name), None)
+        if attr is None:
+            return
+        node.aliases.pop(attr.short_name, None)
+        for child in attr.children:
+            self.remove_attribute(node, child.long_name)
+        for key in [k for k in node.values if strip_index(k) == attr.long_name or k.startswith(attr.long_name + "[")]:
+            node.values.pop(key)
+        for key in [k for k in node.inputs | node.outputs if k.split("[")[0].split(".")[0] == attr.long_name]:
+            source = self.inputs.get((node, key))
+            if source:
+                self.disconnect(source[0], source[1], node, key)
+            for destination in list(self.outputs.get((node, key), [])):
+                self.disconnect(node, key, destination[0], destination[1])
+
+    def static_attributes(self, node):
+        names = ["message", "caching", "frozen", "nodeState", "isHistoricallyInteresting", "binMembership"]
+        if node.is_dag:
+            names += ["visibility", "intermediateObject", "template", "lodVisibility", "overrideEnabled",
+                      "overrideDisplayType", "overrideVisibility", "overrideColor", "overrideRGBColors",
+                      "overrideColorRGB", "overrideColorR", "overrideColorG", "overrideColorB", "hiddenInOutliner",
+                      "useOutlinerColor", "outlinerColor", "outlinerColorR", "outlinerColorG", "outlinerColorB",
+                      "worldMatrix", "worldInverseMatrix", "parentMatrix", "parentInverseMatrix",
+                      "instObjGroups"]
+        if node.is_dag and not node.is_shape:
+            names += ["translate", "rotate", "scale", "shear", "rotateOrder", "inheritsTransform",
+                      "offsetParentMatrix", "matrix", "inverseMatrix", "xformMatrix", "rotatePivot", "scalePivot",
+                      "rotateAxis", "displayHandle", "displayLocalAxis", "selectHandle", "dagLocalMatrix"]
+            names += [x for k in ("translate", "rotate", "scale", "shear", "rotatePivot", "scalePivot",
+                                  "rotateAxis") for x in COMPOUNDS[k]]
+        if node.type == "joint":
+            names += ["jointOrient", "radius", "drawStyle", "segmentScaleCompensate", "inverseScale", "side",
+                      "type", "otherType", "drawLabel", "preferredAngle", "bindPose"]
+            names += list(COMPOUNDS["jointOrient"])
+        if node.is_shape:
+            names += ["lineWidth", "alwaysDrawOnTop", "worldSpace", "local", "create", "cached", "controlPoints",
+                      "spans", "degree", "form"]
+        if node.type in ("container", "dagContainer"):
+            names += ["blackBox", "iconName", "viewName", "rmbCommand", "templateName", "hyperLayout"]
+        return names
+
+    def has_attribute(self, node, name):
+        name = self.long_attr_name(node, name.split(".")[-1].split("[")[0])
+        if name in node.attributes or name in self.static_attributes(node):
+            return True
+        return any(strip_index(k) == name or k.split("[")[0] == name for k in node.values) or \
+            any(strip_index(k) == name or k.split("[")[0] == name for k in node.inputs | node.outputs)
+
+    def attribute(self, node, name):
+        name = self.long_attr_name(node, name)
+        if name in node.attributes:
+            return node.attributes[name]
+        attr = Attribute(name, kind="numeric", type_name="double")
+        attr.dynamic = False
+        if name in ("visibility", "inheritsTransform", "overrideEnabled", "overrideRGBColors",
+                    "segmentScaleCompensate", "displayHandle", "displayLocalAxis", "hiddenInOutliner",
+                    "useOutlinerColor", "intermediateObject", "template", "lodVisibility"):
+            attr.type = "bool"
+        elif name in ("rotateOrder", "overrideDisplayType", "drawStyle", "nodeState", "side", "type"):
+            attr.kind = attr.type = "enum"
+        elif name in ("overrideColor", "isHistoricallyInteresting"):
+            attr.type = "byte"
+        elif name in COMPOUNDS["translate"] or name in ("radius",):
+            attr.kind, attr.type = "unit", "doubleLinear"
+        elif name in COMPOUNDS["rotate"] or name in COMPOUNDS["jointOrient"]:
+            attr.kind, attr.type = "unit", "doubleAngle"
+        elif name in MATRIX_ATTRS:
+            attr.kind, attr.type = "typed", "matrix"
+        elif name == "message":
+            attr.kind = attr.type = "message"
+        elif name in COMPOUNDS:
+            attr.kind, attr.type = "compound", "double3"
+            attr.children = [self.attribute(node, x) for x in COMPOUNDS[name]]
+        if name in ("visibility",) or name in COMPOUNDS["translate"] + COMPOUNDS["rotate"] + COMPOUNDS["scale"]:
+            attr.keyable = node.is_dag and not node.is_shape or name == "visibility"
+        if name in ("worldMatrix", "worldInverseMatrix", "parentMatrix", "parentInverseMatrix", "worldSpace",
+                    "instObjGroups"):
+            attr.multi = True
+        return attr
+
+    def children_attrs(self, node, attr):
+        attr = self.long_attr_name(node, attr)
+        name = strip_index(attr)
+        if name in node.attributes and node.attributes[name].children:
+            children = [x.long_name for x in node.attributes[name].children]
+        elif name in COMPOUNDS:
+            children = list(COMPOUNDS[name])
+        elif name in ("outputQuat", "inputQuat"):
+            children = [name + x for x in "XYZW"]
+        elif name in XYZ_COMPOUNDS:
+            children = [name + x for x in "XYZ"]
+        elif name in RGB_COMPOUNDS:
+            children = [name + x for x in "RGB"]
+        elif name in LOWER_XYZ_COMPOUNDS:
+            children = [name + x for x in "xyz"[:int(name[-2])]]
+        else:
+            return []
+        if attr.endswith("]"):
+            return [attr + "." + x for x in children]
+        if "." in attr:
+            return [attr.rsplit(".", 1)[0] + "." + x for x in children]
+        return children
+
+    def parent_attr(self, node, attr):
+        head, _, leaf = attr.rpartition(".")
+        if leaf.endswith("]"):
+            return head or None
+        name = leaf.split("[")[0]
+        parent = None
+        if name in node.attributes and node.attributes[name].parent is not None:
+            parent = node.attributes[name].parent.long_name
+        for compound, children in COMPOUNDS.items():
+            if name in children:
+                parent = compound
+        for compounds, suffixes in ((XYZ_COMPOUNDS, "XYZW"), (RGB_COMPOUNDS, "RGB"), (LOWER_XYZ_COMPOUNDS, "xyz")):
+            if name[-1:] in suffixes and name[:-1] in compounds:
+                parent = name[:-1]
+        if parent is None:
+            return head or None
+        return head + "." + parent if head else parent
+
+    def element_indices(self, node, attr):
+        attr = self.long_attr_name(node, attr)
+        pattern = re.compile(r"^" + re.escape(attr) + r"\[(\d+)\]")
+        indices = set()
+        for key in itertools.chain(node.values, node.inputs, node.outputs):
+            match = pattern.match(key)
+            if match:
+                indices.add(int(match.group(1)))
+        return sorted(indices)
+
+    # ---------------------------------------------------------------- flags
+    def get_flag(self, node, attr, flag):
+        attr = self.long_attr_name(node, attr)
+        flags = node.flags.get(attr, {})
+        if flag in flags:
+            return flags[flag]
+        if flag == "lock":
+            return False
+        definition = self.attribute(node, strip_index(attr))
+        if flag == "keyable":
+            return definition.keyable
+        if flag == "channelBox":
+            return definition.channel_box
+        return False
+
+    def set_flag(self, node, attr, flag, value):
+        attr = self.long_attr_name(node, attr)
+        node.flags.setdefault(attr, {})[flag] = value
+        if flag in ("keyable", "lock"):
+            for child in self.children_attrs(node, attr):
+                node.flags.setdefault(child, {})[flag] = value
+        if flag == "keyable" and value:
+            node.flags[attr]["channelBox"] = False
+
+    def is_locked(self, node, attr):
+        attr = self.long_attr_name(node, attr)
+        if self.get_flag(node, attr, "lock"):
+            return True
+        parent = self.parent_attr(node, attr)
+        return bool(parent) and self.get_flag(node, parent, "lock")
+
+    # ---------------------------------------------------------------- connections
+    def connect(self, source_node, source_attr, destination_node, destination_attr, force=False):
+        self.dirty(destination_node)
+        source_attr = self.long_attr_name(source_node, source_attr)
+        destination_attr = self.long_attr_name(destination_node, destination_attr)
+        key = (destination_node, destination_attr)
+        if key in self.inputs:
+            if self.inputs[key] == (source_node, source_attr):
+                raise RuntimeError("'{0}.{1}' is already connected to '{2}.{3}'.".format(
+                    source_node.partial_path(), source_attr, destination_node.partial_path(), destination_attr))
+            if not force:
+                raise RuntimeError("The attribute '{0}.{1}' is already connected".format(
+                    destination_node.partial_path(), destination_attr))
+            self.disconnect(self.inputs[key][0], self.inputs[key][1], destination_node, destination_attr)
+        self.inputs[key] = (source_node, source_attr)
+        self.outputs[(source_node, source_attr)].append(key)
+        source_node.outputs.add(source_attr)
+        destination_node.inputs.add(destination_attr)
+        self.fire("attribute_changed", destination_node, destination_attr)
+
+    def disconnect(self, source_node, source_attr, destination_node, destination_attr):
+        self.dirty(destination_node)
+        source_attr = self.long_attr_name(source_node, source_attr)
+        destination_attr = self.long_attr_name(destination_node, destination_attr)
+        key = (destination_node, destination_attr)
+        if self.inputs.get(key) != (source_node, source_attr):
+            return False
+        del self.inputs[key]
+        outputs = self.outputs[(source_node, source_attr)]
+        outputs.remove(key)
+        if not outputs:
+            del self.outputs[(source_node, source_attr)]
+            source_node.outputs.discard(source_attr)
+        destination_node.inputs.discard(destination_attr)
+        return True
+
+    def connections_of(self, node, attr, as_destination=True, as_source=True):
+        """-> [(node, attr)] of the other side, attr None means every attribute of the node"""
+        result = []
+        if attr is not None:
+            attr = self.long_attr_name(node, attr)
+        if as_destination:
+            for key in sorted(node.inputs):
+                if attr is None or key == attr or key.startswith(attr + "[") or key.startswith(attr + "."):
+                    result.append(self.inputs[(node, key)])
+        if as_source:
+            for key in sorted(node.outputs):
+                if attr is None or key == attr or key.startswith(attr + "[") or key.startswith(attr + "."):
+                    result.extend(self.outputs[(node, key)])
+        return result
+
+    def connection_pairs(self, node, attr=None, as_destination=True, as_source=True):
+        """-> [((node, attr), (other node, other attr))]"""
+        pairs = []
+        if attr is not None:
+            attr = self.long_attr_name(node, attr)
+
+        def match(key):
+            return attr is None or key == attr or key.startswith(attr + "[") or key.startswith(attr + ".")
+
+        if as_destination:
+            pairs += [((node, key), self.inputs[(node, key)]) for key in sorted(node.inputs) if match(key)]
+        if as_source:
+            pairs += [((node, key), x) for key in sorted(node.outputs) if match(key)
+                      for x in self.outputs[(node, key)]]
+        return pairs
+
+    def connected_attrs(self, node):
+        return sorted(node.inputs | node.outputs)
+
+    # ---------------------------------------------------------------- values
+    def default_value(self, node, attr):
+        name = strip_index(attr)
+        if name in node.attributes:
+            definition = node.attributes[name]
+            if definition.children:
+                return tuple(self.default_value(node, x.long_name) for x in definition.children)
+            if definition.type == "matrix":
+                return list(IDENTITY)
+            if definition.kind == "typed" or definition.kind == "message":
+                return definition.default
+            if definition.type == "bool":
+                return bool(definition.default or False)
+            if definition.default is not None:
+                return definition.default
+            return 0 if definition.type in ("long", "short", "byte", "char", "enum") else 0.0
+        if name in DEFAULTS:
+            return DEFAULTS[name]
+        if name in MATRIX_ATTRS or name.endswith("Matrix"):
+            return list(IDENTITY)
+        children = self.children_attrs(node, attr)
+        if children and name in COMPOUNDS:
+            return tuple(self.default_value(node, x) for x in children)
+        if name in ("message",):
+            return None
+        return 0.0
+
+    def evaluate(self, node, attr, visited=None):
+        """-> value or None when nothing is known about the plug"""
+        visited = visited or set()
+        key = (id(node), attr)
+        if key in visited:
+            self.cycle = True
+            return None
+        visited.add(key)
+
+        source = self.inputs.get((node, attr))
+        if source is not None:
+            value = self.evaluate(source[0], source[1], visited)
+            if value is not None:
+                return value
+        parent = self.parent_attr(node, attr)
+        if parent is not None and (node, parent) in self.inputs:
+            value = self.evaluate(node, parent, visited)
+            if isinstance(value, (list, tuple)):
+                children = self.children_attrs(node, parent)
+                if attr in children and children.index(attr) < len(value):
+                    return value[children.index(attr)]
+        value = self.compute(node, attr, visited)
+        if value is not None:
+            return value
+        if attr in node.values:
+            return node.values[attr]
+        children = self.children_attrs(node, attr)
+        if children and any(x in node.values or (node, x) in self.inputs for x in children):
+            return tuple(self.get_value(node, x, visited) for x in children)
+        return None
+
+    def get_value(self, node, attr, visited=None):
+        attr = self.long_attr_name(node, attr)
+        cache = self.cache.get(id(node))
+        if cache is not None and attr in cache:
+            value = cache[attr]
+            return list(value) if isinstance(value, list) else value
+        outer_cycle, self.cycle = self.cycle, False
+        value = self.evaluate(node, attr, set(visited) if visited else None)
+        if value is None:
+            value = self.default_value(node, attr)
+        # values cut short by a dependency cycle depend on where the evaluation started
+        if not self.cycle:
+            self.cache.setdefault(id(node), {})[attr] = value
+        self.cycle = self.cycle or outer_cycle
+        return value
+
+    def dirty(self, node=None):
+        if node is None:
+            self.cache.clear()
+            return
+        stack = [node]
+        visited = set()
+        while stack:
+            node = stack.pop()
+            if id(node) in visited:
+                continue
+            visited.add(id(node))
+            # downstream values are evaluated through this node, so it is cached whenever they are.
+            if self.cache.pop(id(node), None) is None and len(visited) > 1:
+                continue
+            stack.extend(node.children)
+            for attr in node.outputs:
+                stack.extend(x[0] for x in self.outputs.get((node, attr), []))
+
+    def set_value(self, node, attr, value):
+        self.dirty(node)
+        attr = self.long_attr_name(node, attr)
+        children = self.children_attrs(node, attr)
+        if children and isinstance(value, (list, tuple)) and len(value) == len(children) and \
+                strip_index(attr) not in MATRIX_ATTRS:
+            node.values.pop(attr, None)
+            for child, v in zip(children, value):
+                node.values[child] = v
+        else:
+            node.values[attr] = value
+            parent = self.parent_attr(node, attr)
+            if parent is not None and isinstance(node.values.get(parent), (list, tuple)):
+                siblings = self.children_attrs(node, parent)
+                stored = node.values.pop(parent)
+                for child, v in zip(siblings, stored):
+                    node.values.setdefault(child, v)
+        self.fire("attribute_changed", node, attr)
+
+    def values_of(self, node, names):
+        return [self.get_value(node, x) for x in names]
+
+    # ---------------------------------------------------------------- evaluation
+    def compute(self, node, attr, visited):
+        name = attr.split("[")[0]
+        if node.is_dag:
+            if name in ("worldMatrix", "matrix", "xformMatrix", "worldInverseMatrix", "inverseMatrix",
+                        "parentMatrix", "parentInverseMatrix"):
+                if name in ("matrix", "xformMatrix"):
+                    return self.local_matrix(node)
+                if name == "inverseMatrix":
+                    return matrix.inverse(self.local_matrix(node))
+                if name == "worldMatrix":
+                    return self.world_matrix(node)
+                if name == "worldInverseMatrix":
+                    return matrix.inverse(self.world_matrix(node))
+                parent_m = self.world_matrix(node.parent) if node.parent is not None else list(IDENTITY)
+                return parent_m if name == "parentMatrix" else matrix.inverse(parent_m)
+            return None
+        node_type = node.type
+        if node_type == "decomposeMatrix" and name.startswith("output"):
+            m = self.get_value(node, "inputMatrix", visited)
+            t, r, s = matrix.decompose(list(m), int(self.get_value(node, "inputRotateOrder", visited) or 0))
+            outputs = {"outputTranslate": t, "outputRotate": r, "outputScale": s}
+            for key, values in list(outputs.items()):
+                for axis, v in zip("XYZ", values):
+                    outputs[key + axis] = v
+            value = outputs.get(name)
+            return tuple(value) if isinstance(value, list) else value
+        if node_type == "composeMatrix" and name == "outputMatrix":
+            t = [self.get_value(node, "inputTranslate" + x, visited) for x in "XYZ"]
+            r = [self.get_value(node, "inputRotate" + x, visited) for x in "XYZ"]
+            s = [self.get_value(node, "inputScale" + x, visited) if "inputScale" + x in node.values else 1.0
+                 for x in "XYZ"]
+            return matrix.compose(t, r, s, int(self.get_value(node, "inputRotateOrder", visited) or 0))
+        if node_type == "multMatrix" and name == "matrixSum":
+            m = list(IDENTITY)
+            for i in self.element_indices(node, "matrixIn"):
+                m = matrix.multiply(m, list(self.get_value(node, "matrixIn[{0}]".format(i), visited)))
+            return m
+        if node_type == "inverseMatrix" and name == "outputMatrix":
+            return matrix.inverse(list(self.get_value(node, "inputMatrix", visited)))
+        if node_type.startswith("animCurve") and name == "output":
+            if node_type.startswith("animCurveT") and (node, "input") not in self.inputs:
+                return self.evaluate_curve(node, self.evaluation_time())
+            return self.evaluate_curve(node, self.get_value(node, "input", visited))
+        if node_type == "blendWeighted" and name == "output":
+            return sum(self.get_value(node, "input[{0}]".format(i), visited) *
+                       (self.get_value(node, "weight[{0}]".format(i), visited) if "weight[{0}]".format(i)
+                        in node.values else 1.0)
+                       for i in self.element_indices(node, "input"))
+        if node_type == "motionPath" and name.startswith("allCoordinates"):
+            source = self.inputs.get((node, "geometryPath"))
+            if source is None:
+                return None
+            u = self.get_value(node, "uValue", visited)
+            position = self.curve_position(source[0], u, bool(self.get_value(node, "fractionMode", visited)),
+                                           world=source[1].startswith("worldSpace"))
+            return tuple(position) if name == "allCoordinates" else position["XYZ".index(name[-1])]
+        if node_type in ("addDoubleLinear", "multDoubleLinear") and name == "output":
+            a = self.get_value(node, "input1", visited)
+            b = self.get_value(node, "input2", visited)
+            return a + b if node_type == "addDoubleLinear" else a * b
+        if node_type == "multiplyDivide" and name.startswith("output"):
+            operation = int(self.get_value(node, "operation", visited))
+            values = []
+            for axis in "XYZ":
+                a = self.get_value(node, "input1" + axis, visited)
+                b = self.get_value(node, "input2" + axis, visited)
+                if operation == 1:
+                    values.append(a * b)
+                elif operation == 2:
+                    values.append(a / b if b else 0.0)
+                elif operation == 3:
+                    values.append(a ** b if a or b > 0 else 0.0)
+                else:
+                    values.append(a)
+            return tuple(values) if name == "output" else values["XYZ".index(name[-1])]
+        return None
+
+    def local_matrix(self, node):
+        if not node.is_dag or node.is_shape:
+            return list(IDENTITY)
+        translate = self.values_of(node, COMPOUNDS["translate"])
+        rotate = self.values_of(node, COMPOUNDS["rotate"])
+        scale = self.values_of(node, COMPOUNDS["scale"])
+        order = int(self.get_value(node, "rotateOrder"))
+        joint_orient = self.values_of(node, COMPOUNDS["jointOrient"]) if node.type == "joint" else None
+        return matrix.compose(translate, rotate, scale, order, joint_orient)
+
+    def world_matrix(self, node):
+        if node is None:
+            return list(IDENTITY)
+        if node.is_shape:
+            return self.world_matrix(node.parent)
+        cache = self.cache.setdefault(id(node), {})
+        if None not in cache:
+            m = matrix.multiply(self.local_matrix(node), list(self.get_value(node, "offsetParentMatrix")))
+            if node.parent is not None and self.get_value(node, "inheritsTransform"):
+                m = matrix.multiply(m, self.world_matrix(node.parent))
+            self.cache.setdefault(id(node), {})[None] = m
+        return list(self.cache[id(node)][None])
+
+    def parent_space(self, node):
+        m = list(self.get_value(node, "offsetParentMatrix"))
+        if node.parent is not None and self.get_value(node, "inheritsTransform"):
+            m = matrix.multiply(m, self.world_matrix(node.parent))
+        return m
+
+    def set_local_matrix(self, node, m, translate=True, rotate=True, scale=True):
+        self.dirty(node)
+        joint_orient = self.values_of(node, COMPOUNDS["jointOrient"]) if node.type == "joint" else None
+        t, r, s = matrix.decompose(m, int(self.get_value(node, "rotateOrder")), joint_orient)
+        for flag, name, values in ((translate, "translate", t), (rotate, "rotate", r), (scale, "scale", s)):
+            if flag:
+                for child, v in zip(COMPOUNDS[name], values):
+                    node.values[child] = v
+
+    def set_world_matrix(self, node, m, translate=True, rotate=True, scale=True):
+        if node.is_shape:
+            return
+        local = matrix.multiply(list(m), matrix.inverse(self.parent_space(node)))
+        self.set_local_matrix(node, local, translate, rotate, scale)
+
+    # ---------------------------------------------------------------- curves
+    def curve_position(self, shape, u, fraction=False, world=True):
+        curve = shape.data.get("curve") or {}
+        points = [list(x) for x in curve.get("points", [])]
+        if not points:
+            return [0.0, 0.0, 0.0]
+        if world:
+            m = self.world_matrix(shape)
+            points = [[p[0] * m[c] + p[1] * m[4 + c] + p[2] * m[8 + c] + m[12 + c] for c in range(3)] for p in points]
+        degree = curve.get("degree", 1)
+        knots = list(curve.get("knots") or range(len(points) + degree - 1))
+        # maya knot lists drop the first and last knot
+        knots = [knots[0]] + knots + [knots[-1]]
+        if fraction:
+            samples = [nurbs_point(points, knots, degree, knots[degree] + (knots[-degree - 1] - knots[degree]) * i / 100.0)
+                       for i in range(101)]
+            return sample_polyline(samples, u)
+        return nurbs_point(points, knots, degree, u)
+
+    # ---------------------------------------------------------------- anim curves
+    def evaluation_time(self):
+        return self.time if self.context_time is None else self.context_time
+
+    def set_time(self, time, context=False):
+        """current time, or the MDGContext time when `context`. time curves are evaluated again"""
+        previous = self.evaluation_time()
+        if context:
+            self.context_time = None if time is None else float(time)
+        else:
+            self.time = float(time)
+        if self.evaluation_time() == previous:
+            return
+        for node in list(self.nodes.values()):
+            if node.type.startswith("animCurveT") and (node, "input") not in self.inputs:
+                self.dirty(node)
+
+    @staticmethod
+    def evaluate_curve(node, value):
+        keys = sorted(node.data.get("keys", {}).items())
+        if not keys:
+            return 0.0
+        if value <= keys[0][0]:
+            return keys[0][1]
+        if value >= keys[-1][0]:
+            return keys[-1][1]
+        for (x0, y0), (x1, y1) in zip(keys, keys[1:]):
+            if x0 <= value <= x1:
+                return y0 + (y1 - y0) * (value - x0) / (x1 - x0) if x1 != x0 else y0
+        return keys[-1][1]
+
+    # ---------------------------------------------------------------- callbacks
+    def add_callback(self, kind, function, node_filter=None, client_data=None):
+        callback_id = next(self.counter)
+        self.callbacks[callback_id] = (kind, function, node_filter, client_data)
+        return callback_id
+
+    def remove_callback(self, callback_id):
+        self.callbacks.pop(callback_id, None)
+
+    def fire(self, kind, node, attr=None):
+        if not self.callbacks:
+            return
+        from standin import openmaya
+
+        for callback_kind, function, node_filter, client_data in list(self.callbacks.values()):
+            if callback_kind != kind:
+                continue
+            if kind in ("node_added", "node_removed"):
+                if node_filter not in (None, "dependNode") and not self.is_type(node, [node_filter]):
+                    continue
+                function(openmaya.MObject(node), client_data)
+            elif kind == "attribute_changed" and node_filter is node:
+                function(openmaya.MNodeMessage.kAttributeSet, openmaya.MPlug(node, attr), openmaya.MPlug(),
+                         client_data)
+
+    # ---------------------------------------------------------------- plan
+    def serialize(self):
+        nodes = []
+        for node in self.nodes.values():
+            data = {"name": node.partial_path(), "type": node.type, "uuid": node.uuid}
+            if node.is_dag and node.parent is not None:
+                data["parent"] = node.parent.partial_path()
+            if node.container is not None:
+                data["container"] = node.container.partial_path()
+            if node.attributes:
+                data["attributes"] = OrderedDict((k, v.serialize()) for k, v in node.attributes.items())
+            if node.values:
+                data["values"] = OrderedDict((k, _serializable(v)) for k, v in sorted(node.values.items()))
+            locked = sorted(k for k, v in node.flags.items() if v.get("lock"))
+            if locked:
+                data["locked"] = locked
+            if node.type == "objectSet" and node.data.get("members"):
+                data["members"] = [x.partial_path() for x in node.data["members"] if x.alive]
+            if node.data.get("curve"):
+                data["curve"] = _serializable(node.data["curve"])
+            if node.data.get("keys"):
+                data["keys"] = [list(x) for x in sorted(node.data["keys"].items())]
+            nodes.append(data)
+        connections = []
+        for (destination_node, destination_attr), (source_node, source_attr) in self.inputs.items():
+            connections.append([source_node.partial_path() + "." + source_attr,
+                                destination_node.partial_path() + "." + destination_attr])
+        return {"nodes": nodes, "connections": connections}
+
+    def statistics(self):
+        node_types = defaultdict(int)
+        for node in self.nodes.values():
+            node_types[node.type] += 1
+        return {"node_count": len(self.nodes),
+                "connection_count": len(self.inputs),
+                "value_count": sum(len(x.values) for x in self.nodes.values()),
+                "node_types": dict(sorted(node_types.items(), key=lambda x: -x[1]))}
+
+
+def nurbs_point(points, knots, degree, u):
+    # de Boor
+    u = min(max(u, knots[degree]), knots[len(points)])
+    span = degree
+    while span < len(points) - 1 and u >= knots[span + 1]:
+        span += 1
+    d = [list(points[j + span - degree]) for j in range(degree + 1)]
+    for r in range(1, degree + 1):
+        for j in range(degree, r - 1, -1):
+            i = j + span - degree
+            denominator = knots[i + degree - r + 1] - knots[i]
+            alpha = (u - knots[i]) / denominator if denominator else 0.0
+            d[j] = [(1.0 - alpha) * a + alpha * b for a, b in zip(d[j - 1], d[j])]
+    return d[degree]
+
+
+def sample_polyline(points, fraction):
+    lengths = [0.0]
+    for a, b in zip(points, points[1:]):
+        lengths.append(lengths[-1] + sum((x - y) ** 2 for x, y in zip(a, b)) ** 0.5)
+    target = lengths[-1] * min(max(fraction, 0.0), 1.0)
+    for i in range(len(points) - 1):
+        if lengths[i + 1] >= target:
+            span = lengths[i + 1] - lengths[i] or 1.0
+            f = (target - lengths[i]) / span
+            return [a + (b - a) * f for a, b in zip(points[i], points[i + 1])]
+    return list(points[-1])
+
+
+def _serializable(value):
+    if isinstance(value, dict):
+        return {k: _serializable(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_serializable(x) for x in value]
+    if isinstance(value, (str, int, float, bool)) or value is None:
+        return value
+    if hasattr(value, "__iter__"):
+        return [_serializable(x) for x in value]
+    return str(value)
+
+
+# plug-in commands registered through MFnPlugin. {name: creator}
+_commands = {}
+_current = Graph()
+
+
+def current():
+    return _current
+
+
+def set_current(graph):
+    global _current
+    previous = _current
+    _current = graph
+    return previous
+
+
+def register_command(name, creator):
+    _commands[name] = creator
+
+
+def deregister_command(name):
+    _commands.pop(name, None)
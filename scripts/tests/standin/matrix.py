@@ -0,0 +1,130 @@
+# built-ins
+import math
+
+# flat row major 4x4 matrix helpers shared by the graph and openmaya.
+ROTATE_ORDERS = ("xyz", "yzx", "zxy", "xzy", "yxz", "zyx")
+
+
+def identity():
+    return [1.0, 0.0, 0.0, 0.0, 0.0, 1.0, 0.0, 0.0, 0.0, 0.0, 1.0, 0.0, 0.0, 0.0, 0.0, 1.0]
+
+
+def multiply(a, b):
+    return [a[r * 4] * b[c] + a[r * 4 + 1] * b[4 + c] + a[r * 4 + 2] * b[8 + c] + a[r * 4 + 3] * b[12 + c]
+            for r in range(4) for c in range(4)]
+
+
+def inverse(m):
+    a = [list(m[r * 4:r * 4 + 4]) + [1.0 if r == c else 0.0 for c in range(4)] for r in range(4)]
+    for c in range(4):
+        pivot = max(range(c, 4), key=lambda r: abs(a[r][c]))
+        if abs(a[pivot][c]) < 1e-12:
+            return identity()
+        a[c], a[pivot] = a[pivot], a[c]
+        p = a[c][c]
+        a[c] = [x / p for x in a[c]]
+        for r in range(4):
+            if r != c and a[r][c]:
+                f = a[r][c]
+                a[r] = [x - f * y for x, y in zip(a[r], a[c])]
+    return [a[r][4 + c] for r in range(4) for c in range(4)]
+
+
+def axis_matrix(axis, angle):
+    c = math.cos(angle)
+    s = math.sin(angle)
+    if axis == "x":
+        return [1, 0, 0, 0, 0, c, s, 0, 0, -s, c, 0, 0, 0, 0, 1]
+    if axis == "y":
+        return [c, 0, -s, 0, 0, 1, 0, 0, s, 0, c, 0, 0, 0, 0, 1]
+    return [c, s, 0, 0, -s, c, 0, 0, 0, 0, 1, 0, 0, 0, 0, 1]
+
+
+def compose_rotation(angles, order=0):
+    """angles (x, y, z) radians -> flat row major matrix"""
+    m = identity()
+    for axis in ROTATE_ORDERS[order]:
+        m = multiply(m, axis_matrix(axis, angles["xyz".index(axis)]))
+    return m
+
+
+def decompose_rotation(m, order=0):
+    """orthonormal flat matrix -> (x, y, z) radians"""
+    axes = ROTATE_ORDERS[order]
+    perm = ["xyz".index(a) for a in axes]
+    odd = order in (3, 4, 5)
+
+    # relabel axes to x-y-z, odd permutations flip the rotation direction.
+    r = [[m[perm[i] * 4 + perm[j]] for j in range(3)] for i in range(3)]
+    sy = max(-1.0, min(1.0, -r[0][2]))
+    a1 = math.asin(sy)
+    if abs(sy) < 0.9999999:
+        a0 = math.atan2(r[1][2], r[2][2])
+        a2 = math.atan2(r[0][1], r[0][0])
+    else:
+        a0 = math.atan2(-r[2][1], r[1][1])
+        a2 = 0.0
+    angles = [a0, a1, a2]
+    if odd:
+        angles = [-x for x in angles]
+    result = [0.0, 0.0, 0.0]
+    for i, axis in enumerate(perm):
+        result[axis] = angles[i]
+    return result
+
+
+def quaternion_to_matrix(x, y, z, w):
+    return [1 - 2 * (y * y + z * z), 2 * (x * y + z * w), 2 * (x * z - y * w), 0,
+            2 * (x * y - z * w), 1 - 2 * (x * x + z * z), 2 * (y * z + x * w), 0,
+            2 * (x * z + y * w), 2 * (y * z - x * w), 1 - 2 * (x * x + y * y), 0,
+            0, 0, 0, 1]
+
+
+def matrix_to_quaternion(m):
+    # column major rotation is the transpose of the row major maya matrix.
+    m00, m01, m02 = m[0], m[4], m[8]
+    m10, m11, m12 = m[1], m[5], m[9]
+    m20, m21, m22 = m[2], m[6], m[10]
+    trace = m00 + m11 + m22
+    if trace > 0:
+        s = math.sqrt(trace + 1.0) * 2
+        return (m21 - m12) / s, (m02 - m20) / s, (m10 - m01) / s, 0.25 * s
+    if m00 > m11 and m00 > m22:
+        s = math.sqrt(1.0 + m00 - m11 - m22) * 2
+        return 0.25 * s, (m01 + m10) / s, (m02 + m20) / s, (m21 - m12) / s
+    if m11 > m22:
+        s = math.sqrt(1.0 + m11 - m00 - m22) * 2
+        return (m01 + m10) / s, 0.25 * s, (m12 + m21) / s, (m02 - m20) / s
+    s = math.sqrt(1.0 + m22 - m00 - m11) * 2
+    return (m02 + m20) / s, (m12 + m21) / s, 0.25 * s, (m10 - m01) / s
+
+
+def compose(translate, rotate, scale, order=0, joint_orient=None):
+    """translate, rotate (degrees), scale -> local matrix. S * R * JO * T like maya transform and joint"""
+    sx, sy, sz = scale
+    m = [sx, 0, 0, 0, 0, sy, 0, 0, 0, 0, sz, 0, 0, 0, 0, 1]
+    m = multiply(m, compose_rotation([math.radians(x) for x in rotate], order))
+    if joint_orient is not None:
+        m = multiply(m, compose_rotation([math.radians(x) for x in joint_orient], 0))
+    m[12:15] = [float(x) for x in translate]
+    return m
+
+
+def decompose(m, order=0, joint_orient=None):
+    """local matrix -> translate, rotate (degrees), scale"""
+    rows = [m[r * 4:r * 4 + 3] for r in range(3)]
+    scale = [math.sqrt(sum(x * x for x in row)) for row in rows]
+    det = (m[0] * (m[5] * m[10] - m[6] * m[9])
+           - m[1] * (m[4] * m[10] - m[6] * m[8])
+           + m[2] * (m[4] * m[9] - m[5] * m[8]))
+    if det < 0:
+        scale[2] = -scale[2]
+    rotation = identity()
+    for r in range(3):
+        for c in range(3):
+            rotation[r * 4 + c] = rows[r][c] / scale[r] if scale[r] else float(r == c)
+    if joint_orient is not None:
+        orient = compose_rotation([math.radians(x) for x in joint_orient], 0)
+        rotation = multiply(rotation, inverse(orient))
+    rotate = [math.degrees(x) for x in decompose_rotation(rotation, order)]
+    return [float(x) for x in m[12:15]], rotate, scale
@@ -0,0 +1,21 @@
+# standin
+from standin import graph as _graph
+
+# Stand-in for maya.mel. scripts are recorded, the few the build relies on are interpreted.
+
+
+def eval(script):
+    g = _graph.current()
+    command = script.strip().rstrip(";").split()
+    if command and command[0] == "ClearCurrentContainer":
+        g.current_container = None
+        return None
+    if command and command[0] == "findRelatedSkinCluster" and len(command) > 1:
+        node = g.find(command[1])
+        shapes = [node] + [x for x in node.children if x.is_shape]
+        for other in g.nodes.values():
+            if other.type == "skinCluster" and any(x in other.data.get("geometry", []) for x in shapes):
+                return other.partial_path()
+        return ""
+    g.calls.append(("mel", (script,), {}))
+    return None
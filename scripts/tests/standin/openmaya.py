@@ -0,0 +1,2127 @@
+# built-ins
+import math
+
+# standin
+from standin import graph as _graph
+from standin.matrix import (identity as _identity, multiply as _multiply, inverse as _inverse,
+                                   compose_rotation, decompose_rotation,
+                                   quaternion_to_matrix as _quaternion_to_matrix,
+                                   matrix_to_quaternion as _matrix_to_quaternion)
+
+# Stand-in for maya.api.OpenMaya. the math classes follow maya conventions (row vectors, row major matrix,
+# x-y-z rotate order), the scene classes read and write the current stand-in graph.
+
+class MSpace:
+    kInvalid = 0
+    kTransform = 1
+    kPreTransform = 2
+    kObject = 2
+    kPostTransform = 3
+    kWorld = 4
+
+
+class MVector:
+    kTolerance = 1e-10
+
+    def __init__(self, *args):
+        if not args:
+            values = (0.0, 0.0, 0.0)
+        elif len(args) == 1:
+            values = list(args[0])[:3]
+        else:
+            values = args[:3]
+        values = [float(x) for x in values] + [0.0] * (3 - len(values))
+        self.x, self.y, self.z = values
+
+    def __repr__(self):
+        return "maya.api.OpenMaya.MVector({0}, {1}, {2})".format(self.x, self.y, self.z)
+
+    def __len__(self):
+        return 3
+
+    def __iter__(self):
+        return iter((self.x, self.y, self.z))
+
+    def __getitem__(self, index):
+        return (self.x, self.y, self.z)[index]
+
+    def __setitem__(self, index, value):
+        setattr(self, "xyz"[index], float(value))
+
+    def __eq__(self, other):
+        return isinstance(other, MVector) and tuple(self) == tuple(other)
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __hash__(self):
+        return hash(tuple(self))
+
+    def __neg__(self):
+        return MVector(-self.x, -self.y, -self.z)
+
+    def __add__(self, other):
+        return MVector(self.x + other[0], self.y + other[1], self.z + other[2])
+
+    def __radd__(self, other):
+        return self + other
+
+    def __sub__(self, other):
+        return MVector(self.x - other[0], self.y - other[1], self.z - other[2])
+
+    def __rsub__(self, other):
+        return MVector(other[0] - self.x, other[1] - self.y, other[2] - self.z)
+
+    def __mul__(self, other):
+        if isinstance(other, MVector):
+            return self.x * other.x + self.y * other.y + self.z * other.z
+        if isinstance(other, MMatrix):
+            m = other.values
+            return MVector(*[self.x * m[c] + self.y * m[4 + c] + self.z * m[8 + c] for c in range(3)])
+        return MVector(self.x * other, self.y * other, self.z * other)
+
+    def __rmul__(self, other):
+        return self * other
+
+    def __truediv__(self, other):
+        return MVector(self.x / other, self.y / other, self.z / other)
+
+    def __xor__(self, other):
+        return MVector(self.y * other[2] - self.z * other[1],
+                       self.z * other[0] - self.x * other[2],
+                       self.x * other[1] - self.y * other[0])
+
+    def length(self):
+        return math.sqrt(self.x * self.x + self.y * self.y + self.z * self.z)
+
+    def normal(self):
+        length = self.length()
+        if length < self.kTolerance:
+            return MVector(self)
+        return self / length
+
+    def normalize(self):
+        self.x, self.y, self.z = self.normal()
+        return self
+
+    def angle(self, other):
+        return math.atan2((self ^ other).length(), self * MVector(other))
+
+    def rotateBy(self, rotation):
+        return self * MMatrix(rotation.asMatrix())
+
+    def rotateTo(self, other):
+        return MQuaternion(self, MVector(other))
+
+    def isEquivalent(self, other, tolerance=kTolerance):
+        return all(abs(a - b) <= tolerance for a, b in zip(self, other))
+
+    def isParallel(self, other, tolerance=kTolerance):
+        return (self.normal() ^ MVector(other).normal()).length() <= tolerance
+
+
+MVector.kZeroVector = MVector(0, 0, 0)
+MVector.kOneVector = MVector(1, 1, 1)
+MVector.kXaxisVector = MVector(1, 0, 0)
+MVector.kYaxisVector = MVector(0, 1, 0)
+MVector.kZaxisVector = MVector(0, 0, 1)
+MVector.kXnegAxisVector = MVector(-1, 0, 0)
+MVector.kYnegAxisVector = MVector(0, -1, 0)
+MVector.kZnegAxisVector = MVector(0, 0, -1)
+
+
+class MPoint:
+    kTolerance = 1e-10
+
+    def __init__(self, *args):
+        if not args:
+            values = (0.0, 0.0, 0.0, 1.0)
+        elif len(args) == 1:
+            values = list(args[0])
+        else:
+            values = list(args)
+        values = [float(x) for x in values]
+        if len(values) == 3:
+            values.append(1.0)
+        self.x, self.y, self.z, self.w = values
+
+    def __repr__(self):
+        return "maya.api.OpenMaya.MPoint({0}, {1}, {2}, {3})".format(self.x, self.y, self.z, self.w)
+
+    def __len__(self):
+        return 4
+
+    def __iter__(self):
+        return iter((self.x, self.y, self.z, self.w))
+
+    def __getitem__(self, index):
+        return (self.x, self.y, self.z, self.w)[index]
+
+    def __add__(self, other):
+        return MPoint(self.x + other[0], self.y + other[1], self.z + other[2])
+
+    def __sub__(self, other):
+        if isinstance(other, MPoint):
+            return MVector(self.x - other.x, self.y - other.y, self.z - other.z)
+        return MPoint(self.x - other[0], self.y - other[1], self.z - other[2])
+
+    def __mul__(self, other):
+        if isinstance(other, MMatrix):
+            m = other.values
+            return MPoint(*[self.x * m[c] + self.y * m[4 + c] + self.z * m[8 + c] + self.w * m[12 + c]
+                            for c in range(4)])
+        return MPoint(self.x * other, self.y * other, self.z * other, self.w)
+
+    def distanceTo(self, other):
+        return (self - MPoint(other)).length()
+
+    def isEquivalent(self, other, tolerance=kTolerance):
+        return all(abs(a - b) <= tolerance for a, b in zip(self, other))
+
+
+MPoint.kOrigin = MPoint()
+
+
+class MMatrix:
+    kTolerance = 1e-10
+
+    def __init__(self, values=None):
+        if values is None:
+            self.values = _identity()
+        elif isinstance(values, MMatrix):
+            self.values = list(values.values)
+        else:
+            values = list(values)
+            if len(values) == 4:
+                values = [float(x) for row in values for x in row]
+            self.values = [float(x) for x in values]
+
+    def __repr__(self):
+        return "maya.api.OpenMaya.MMatrix({0})".format(
+            [tuple(self.values[r * 4:r * 4 + 4]) for r in range(4)])
+
+    def __len__(self):
+        return 16
+
+    def __iter__(self):
+        return iter(self.values)
+
+    def __getitem__(self, index):
+        if isinstance(index, tuple):
+            return self.values[index[0] * 4 + index[1]]
+        return self.values[index]
+
+    def __setitem__(self, index, value):
+        if isinstance(index, tuple):
+            index = index[0] * 4 + index[1]
+        self.values[index] = float(value)
+
+    def __eq__(self, other):
+        return isinstance(other, MMatrix) and self.values == other.values
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __hash__(self):
+        return hash(tuple(self.values))
+
+    def __mul__(self, other):
+        if isinstance(other, MMatrix):
+            return MMatrix(_multiply(self.values, other.values))
+        return MMatrix([x * other for x in self.values])
+
+    def __rmul__(self, other):
+        return MMatrix([x * other for x in self.values])
+
+    def __add__(self, other):
+        return MMatrix([a + b for a, b in zip(self.values, other)])
+
+    def __sub__(self, other):
+        return MMatrix([a - b for a, b in zip(self.values, other)])
+
+    def getElement(self, row, column):
+        return self.values[row * 4 + column]
+
+    def setElement(self, row, column, value):
+        self.values[row * 4 + column] = float(value)
+        return self
+
+    def inverse(self):
+        return MMatrix(_inverse(self.values))
+
+    def transpose(self):
+        return MMatrix([self.values[c * 4 + r] for r in range(4) for c in range(4)])
+
+    def homogenize(self):
+        return MMatrix(self)
+
+    def det3x3(self):
+        m = self.values
+        return (m[0] * (m[5] * m[10] - m[6] * m[9])
+                - m[1] * (m[4] * m[10] - m[6] * m[8])
+                + m[2] * (m[4] * m[9] - m[5] * m[8]))
+
+    def det4x4(self):
+        m = self.values
+        total = 0.0
+        for c in range(4):
+            minor = [m[r * 4 + k] for r in range(1, 4) for k in range(4) if k != c]
+            det = (minor[0] * (minor[4] * minor[8] - minor[5] * minor[7])
+                   - minor[1] * (minor[3] * minor[8] - minor[5] * minor[6])
+                   + minor[2] * (minor[3] * minor[7] - minor[4] * minor[6]))
+            total += (-1) ** c * m[c] * det
+        return total
+
+    def isEquivalent(self, other, tolerance=kTolerance):
+        return all(abs(a - b) <= tolerance for a, b in zip(self.values, MMatrix(other).values))
+
+    def isSingular(self):
+        return abs(self.det4x4()) < self.kTolerance
+
+
+MMatrix.kIdentity = MMatrix()
+
+
+class MEulerRotation:
+    kXYZ = 0
+    kYZX = 1
+    kZXY = 2
+    kXZY = 3
+    kYXZ = 4
+    kZYX = 5
+    kTolerance = 1e-10
+
+    def __init__(self, *args):
+        order = self.kXYZ
+        if not args:
+            values = (0.0, 0.0, 0.0)
+        elif isinstance(args[0], MEulerRotation):
+            values = tuple(args[0])
+            order = args[0].order
+        elif isinstance(args[0], (int, float)):
+            values = args[:3]
+            if len(args) > 3:
+                order = args[3]
+        else:
+            values = list(args[0])[:3]
+            if len(args) > 1:
+                order = args[1]
+        self.x, self.y, self.z = [float(x) for x in values]
+        self.order = order
+
+    def __repr__(self):
+        return "maya.api.OpenMaya.MEulerRotation({0}, {1}, {2}, {3})".format(self.x, self.y, self.z, self.order)
+
+    def __len__(self):
+        return 3
+
+    def __iter__(self):
+        return iter((self.x, self.y, self.z))
+
+    def __getitem__(self, index):
+        return (self.x, self.y, self.z)[index]
+
+    def __setitem__(self, index, value):
+        setattr(self, "xyz"[index], float(value))
+
+    def __eq__(self, other):
+        return isinstance(other, MEulerRotation) and tuple(self) == tuple(other) and self.order == other.order
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __neg__(self):
+        return MEulerRotation(-self.x, -self.y, -self.z, self.order)
+
+    def __add__(self, other):
+        return MEulerRotation(self.x + other[0], self.y + other[1], self.z + other[2], self.order)
+
+    def __sub__(self, other):
+        return MEulerRotation(self.x - other[0], self.y - other[1], self.z - other[2], self.order)
+
+    def __mul__(self, other):
+        if isinstance(other, (int, float)):
+            return MEulerRotation(self.x * other, self.y * other, self.z * other, self.order)
+        return MEulerRotation.decompose(MMatrix(_multiply(self.asMatrix().values, other.asMatrix().values)),
+                                        self.order)
+
+    def asMatrix(self):
+        return MMatrix(compose_rotation((self.x, self.y, self.z), self.order))
+
+    def asQuaternion(self):
+        return MQuaternion(*_matrix_to_quaternion(self.asMatrix().values))
+
+    def asVector(self):
+        return MVector(self.x, self.y, self.z)
+
+    def reorder(self, order):
+        return MEulerRotation.decompose(self.asMatrix(), order)
+
+    def reorderIt(self, order):
+        self.x, self.y, self.z = self.reorder(order)
+        self.order = order
+        return self
+
+    def boundIt(self):
+        self.x, self.y, self.z = [math.atan2(math.sin(a), math.cos(a)) for a in self]
+        return self
+
+    def bound(self):
+        return MEulerRotation(self).boundIt()
+
+    def isEquivalent(self, other, tolerance=kTolerance):
+        return all(abs(a - b) <= tolerance for a, b in zip(self, other))
+
+    def isZero(self, tolerance=kTolerance):
+        return all(abs(a) <= tolerance for a in self)
+
+    @staticmethod
+    def decompose(matrix, order):
+        m = MMatrix(matrix).values
+        rows = [m[r * 4:r * 4 + 3] for r in range(3)]
+        scales = [math.sqrt(sum(x * x for x in row)) or 1.0 for row in rows]
+        normalized = _identity()
+        for r in range(3):
+            for c in range(3):
+                normalized[r * 4 + c] = rows[r][c] / scales[r]
+        return MEulerRotation(decompose_rotation(normalized, order), order)
+
+
+class MQuaternion:
+    kTolerance = 1e-10
+
+    def __init__(self, *args):
+        if not args:
+            values = (0.0, 0.0, 0.0, 1.0)
+        elif isinstance(args[0], MQuaternion):
+            values = tuple(args[0])
+        elif isinstance(args[0], MVector) and len(args) > 1 and isinstance(args[1], MVector):
+            values = self._between(args[0], args[1], args[2] if len(args) > 2 else 1.0)
+        elif isinstance(args[0], (int, float)) and len(args) == 2:
+            axis = MVector(args[1]).normal()
+            s = math.sin(args[0] / 2.0)
+            values = (axis.x * s, axis.y * s, axis.z * s, math.cos(args[0] / 2.0))
+        elif len(args) == 1:
+            values = list(args[0])
+        else:
+            values = args
+        self.x, self.y, self.z, self.w = [float(x) for x in values]
+
+    @staticmethod
+    def _between(v0, v1, factor):
+        v0 = v0.normal()
+        v1 = v1.normal()
+        axis = v0 ^ v1
+        angle = v0.angle(v1) * factor
+        if axis.length() < 1e-10:
+            if v0 * v1 > 0:
+                return 0.0, 0.0, 0.0, 1.0
+            axis = v0 ^ MVector(1, 0, 0)
+            if axis.length() < 1e-10:
+                axis = v0 ^ MVector(0, 1, 0)
+        axis = axis.normal()
+        s = math.sin(angle / 2.0)
+        return axis.x * s, axis.y * s, axis.z * s, math.cos(angle / 2.0)
+
+    def __repr__(self):
+        return "maya.api.OpenMaya.MQuaternion({0}, {1}, {2}, {3})".format(self.x, self.y, self.z, self.w)
+
+    def __len__(self):
+        return 4
+
+    def __iter__(self):
+        return iter((self.x, self.y, self.z, self.w))
+
+    def __getitem__(self, index):
+        return (self.x, self.y, self.z, self.w)[index]
+
+    def __eq__(self, other):
+        return isinstance(other, MQuaternion) and tuple(self) == tuple(other)
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __neg__(self):
+        return MQuaternion(-self.x, -self.y, -self.z, -self.w)
+
+    def __add__(self, other):
+        return MQuaternion(*[a + b for a, b in zip(self, other)])
+
+    def __sub__(self, other):
+        return MQuaternion(*[a - b for a, b in zip(self, other)])
+
+    def __mul__(self, other):
+        if isinstance(other, (int, float)):
+            return MQuaternion(*[a * other for a in self])
+        x0, y0, z0, w0 = self
+        x1, y1, z1, w1 = other
+        return MQuaternion(w0 * x1 + x0 * w1 + y0 * z1 - z0 * y1,
+                           w0 * y1 - x0 * z1 + y0 * w1 + z0 * x1,
+                           w0 * z1 + x0 * y1 - y0 * x1 + z0 * w1,
+                           w0 * w1 - x0 * x1 - y0 * y1 - z0 * z1)
+
+    def length(self):
+        return math.sqrt(sum(a * a for a in self))
+
+    def normal(self):
+        length = self.length() or 1.0
+        return MQuaternion(*[a / length for a in self])
+
+    def normalizeIt(self):
+        self.x, self.y, self.z, self.w = self.normal()
+        return self
+
+    def conjugate(self):
+        return MQuaternion(-self.x, -self.y, -self.z, self.w)
+
+    def conjugateIt(self):
+        self.x, self.y, self.z, self.w = self.conjugate()
+        return self
+
+    def inverse(self):
+        length = sum(a * a for a in self) or 1.0
+        return MQuaternion(*[a / length for a in self.conjugate()])
+
+    def invertIt(self):
+        self.x, self.y, self.z, self.w = self.inverse()
+        return self
+
+    def negateIt(self):
+        self.x, self.y, self.z, self.w = -self
+        return self
+
+    def asMatrix(self):
+        return MMatrix(_quaternion_to_matrix(*self.normal()))
+
+    def asEulerRotation(self):
+        return MEulerRotation.decompose(self.asMatrix(), MEulerRotation.kXYZ)
+
+    def asAxisAngle(self):
+        q = self.normal()
+        angle = 2 * math.acos(max(-1.0, min(1.0, q.w)))
+        s = math.sqrt(max(0.0, 1 - q.w * q.w))
+        if s < 1e-10:
+            return MVector(1, 0, 0), angle
+        return MVector(q.x / s, q.y / s, q.z / s), angle
+
+    def isEquivalent(self, other, tolerance=kTolerance):
+        return all(abs(a - b) <= tolerance for a, b in zip(self, other))
+
+    @staticmethod
+    def slerp(p, q, t, spin=0):
+        dot = sum(a * b for a, b in zip(p, q))
+        if dot < 0:
+            q = -q
+            dot = -dot
+        if dot > 0.9995:
+            return MQuaternion(*[a + (b - a) * t for a, b in zip(p, q)]).normal()
+        theta = math.acos(dot)
+        s0 = math.sin((1 - t) * theta) / math.sin(theta)
+        s1 = math.sin(t * theta) / math.sin(theta)
+        return MQuaternion(*[a * s0 + b * s1 for a, b in zip(p, q)])
+
+
+MQuaternion.kIdentity = MQuaternion()
+
+
+class MTransformationMatrix:
+
+    def __init__(self, matrix=None):
+        self._translation = [0.0, 0.0, 0.0]
+        self._rotation = MQuaternion()
+        self._scale = [1.0, 1.0, 1.0]
+        self._order = MEulerRotation.kXYZ
+        if isinstance(matrix, MTransformationMatrix):
+            self._translation = list(matrix._translation)
+            self._rotation = MQuaternion(matrix._rotation)
+            self._scale = list(matrix._scale)
+            self._order = matrix._order
+        elif matrix is not None:
+            self._decompose(MMatrix(matrix).values)
+
+    def _decompose(self, m):
+        rows = [m[r * 4:r * 4 + 3] for r in range(3)]
+        scale = [math.sqrt(sum(x * x for x in row)) for row in rows]
+        det = MMatrix(m).det3x3()
+        if det < 0:
+            scale[2] = -scale[2]
+        rotation = _identity()
+        for r in range(3):
+            for c in range(3):
+                rotation[r * 4 + c] = rows[r][c] / scale[r] if scale[r] else float(r == c)
+        self._translation = [float(x) for x in m[12:15]]
+        self._rotation = MQuaternion(*_matrix_to_quaternion(rotation))
+        self._scale = scale
+
+    def asMatrix(self, percent=1.0):
+        sx, sy, sz = self._scale
+        m = [sx, 0, 0, 0, 0, sy, 0, 0, 0, 0, sz, 0, 0, 0, 0, 1]
+        m = _multiply(m, self._rotation.asMatrix().values)
+        m[12:15] = self._translation
+        return MMatrix(m)
+
+    def asMatrixInverse(self):
+        return self.asMatrix().inverse()
+
+    def asRotateMatrix(self):
+        return self._rotation.asMatrix()
+
+    def asScaleMatrix(self):
+        sx, sy, sz = self._scale
+        return MMatrix([sx, 0, 0, 0, 0, sy, 0, 0, 0, 0, sz, 0, 0, 0, 0, 1])
+
+    def translation(self, space=MSpace.kTransform):
+        return MVector(self._translation)
+
+    def setTranslation(self, vector, space=MSpace.kTransform):
+        self._translation = list(MVector(vector))
+        return self
+
+    def translateBy(self, vector, space=MSpace.kTransform):
+        self._translation = list(MVector(self._translation) + MVector(vector))
+        return self
+
+    def rotation(self, asQuaternion=False):
+        if asQuaternion:
+            return MQuaternion(self._rotation)
+        return MEulerRotation.decompose(self._rotation.asMatrix(), self._order)
+
+    def setRotation(self, rotation):
+        if isinstance(rotation, MEulerRotation):
+            self._order = rotation.order
+            self._rotation = rotation.asQuaternion()
+        else:
+            self._rotation = MQuaternion(rotation)
+        return self
+
+    def rotateBy(self, rotation, space=MSpace.kTransform):
+        if isinstance(rotation, MEulerRotation):
+            rotation = rotation.asQuaternion()
+        if space == MSpace.kObject:
+            m = _multiply(rotation.asMatrix().values, self._rotation.asMatrix().values)
+        else:
+            m = _multiply(self._rotation.asMatrix().values, rotation.asMatrix().values)
+        self._rotation = MQuaternion(*_matrix_to_quaternion(m))
+        return self
+
+    def rotationOrder(self):
+        return self._order
+
+    def reorderRotation(self, order):
+        self._order = order
+        return self
+
+    def rotationComponents(self, asQuaternion=False):
+        return list(self.rotation(asQuaternion))
+
+    def scale(self, space=MSpace.kTransform):
+        return list(self._scale)
+
+    def setScale(self, scale, space=MSpace.kTransform):
+        self._scale = [float(x) for x in list(scale)[:3]]
+        return self
+
+    def scaleBy(self, scale, space=MSpace.kTransform):
+        self._scale = [a * float(b) for a, b in zip(self._scale, scale)]
+        return self
+
+    def shear(self, space=MSpace.kTransform):
+        return [0.0, 0.0, 0.0]
+
+    def setShear(self, shear, space=MSpace.kTransform):
+        return self
+
+    def isEquivalent(self, other, tolerance=MMatrix.kTolerance):
+        return self.asMatrix().isEquivalent(MTransformationMatrix(other).asMatrix(), tolerance)
+
+
+class MColor:
+
+    def __init__(self, *args):
+        if not args:
+            values = [0.0, 0.0, 0.0]
+        elif len(args) == 1:
+            values = list(args[0])
+        else:
+            values = list(args)
+        values = [float(x) for x in values]
+        if len(values) == 3:
+            values.append(1.0)
+        self.r, self.g, self.b, self.a = values
+
+    def __repr__(self):
+        return "maya.api.OpenMaya.MColor({0}, {1}, {2}, {3})".format(self.r, self.g, self.b, self.a)
+
+    def __len__(self):
+        return 4
+
+    def __iter__(self):
+        return iter((self.r, self.g, self.b, self.a))
+
+    def __getitem__(self, index):
+        return (self.r, self.g, self.b, self.a)[index]
+
+    def __eq__(self, other):
+        return isinstance(other, MColor) and tuple(self) == tuple(other)
+
+    def __add__(self, other):
+        return MColor(self.r + other.r, self.g + other.g, self.b + other.b, self.a + other.a)
+
+    def __mul__(self, other):
+        return MColor(self.r * other, self.g * other, self.b * other, self.a)
+
+
+class MAngle:
+    kInvalid = 0
+    kRadians = 1
+    kDegrees = 2
+    kAngMinutes = 3
+    kAngSeconds = 4
+
+    def __init__(self, value=0.0, unit=kRadians):
+        self.value = float(value)
+        self.unit = unit
+
+    @staticmethod
+    def uiUnit():
+        return MAngle.kDegrees
+
+    def asRadians(self):
+        return math.radians(self.value) if self.unit == self.kDegrees else self.value
+
+    def asDegrees(self):
+        return self.value if self.unit == self.kDegrees else math.degrees(self.value)
+
+    def asUnits(self, unit):
+        return self.asDegrees() if unit == self.kDegrees else self.asRadians()
+
+
+class MDistance:
+    kInvalid = 0
+    kInches = 1
+    kFeet = 2
+    kYards = 3
+    kMiles = 4
+    kMillimeters = 5
+    kCentimeters = 6
+    kKilometers = 7
+    kMeters = 8
+
+    def __init__(self, value=0.0, unit=kCentimeters):
+        self.value = float(value)
+        self.unit = unit
+
+    @staticmethod
+    def uiUnit():
+        return MDistance.kCentimeters
+
+    def asCentimeters(self):
+        return self.value
+
+    def asUnits(self, unit):
+        return self.value
+
+
+class MTime:
+    kInvalid = 0
+    kSeconds = 2
+    kFilm = 6
+
+    def __init__(self, value=0.0, unit=kFilm):
+        self.value = float(value)
+        self.unit = unit
+
+    @staticmethod
+    def uiUnit():
+        return MTime.kFilm
+
+    def asUnits(self, unit):
+        return self.value
+
+    def __eq__(self, other):
+        return isinstance(other, MTime) and self.value == other.value
+
+    def __hash__(self):
+        return hash(self.value)
+
+
+class MDGContext:
+
+    def __init__(self, time=None):
+        # None is the normal context, the current time
+        self._time = time
+
+    def isNormal(self):
+        return self._time is None
+
+    def getTime(self):
+        return MTime(_graph.current().evaluation_time()) if self._time is None else self._time
+
+    def makeCurrent(self):
+        g = _graph.current()
+        previous = MDGContext(None if g.context_time is None else MTime(g.context_time))
+        g.set_time(None if self._time is None else self._time.value, context=True)
+        return previous
+
+    @staticmethod
+    def current():
+        g = _graph.current()
+        return MDGContext(None if g.context_time is None else MTime(g.context_time))
+
+
+MDGContext.kNormal = MDGContext()
+
+
+class MUuid:
+
+    def __init__(self, value=""):
+        self._value = value
+
+    def asString(self):
+        return self._value
+
+    def valid(self):
+        return bool(self._value)
+
+    def __eq__(self, other):
+        return isinstance(other, MUuid) and self._value == other._value
+
+    def __hash__(self):
+        return hash(self._value)
+
+
+class MFn:
+    kInvalid = 0
+    kBase = 1
+    kNamedObject = 2
+    kDependencyNode = 4
+    kDagNode = 107
+    kTransform = 110
+    kJoint = 121
+    kShape = 248
+    kNurbsCurve = 267
+    kNurbsSurface = 294
+    kMesh = 296
+    kLocator = 281
+    kContainer = 1000
+    kDagContainer = 1001
+    kSet = 460
+    kAnimCurve = 7
+    kConstraint = 927
+    kAttribute = 558
+    kNumericAttribute = 563
+    kUnitAttribute = 564
+    kEnumAttribute = 565
+    kTypedAttribute = 566
+    kMessageAttribute = 567
+    kMatrixAttribute = 568
+    kCompoundAttribute = 569
+    kGenericAttribute = 570
+
+
+# {node type: function set} node types not listed are plain dependency nodes.
+NODE_FN_TYPES = {
+    "transform": (MFn.kDagNode, MFn.kTransform),
+    "joint": (MFn.kDagNode, MFn.kTransform, MFn.kJoint),
+    "ikHandle": (MFn.kDagNode, MFn.kTransform),
+    "ikEffector": (MFn.kDagNode, MFn.kTransform),
+    "dagContainer": (MFn.kDagNode, MFn.kTransform, MFn.kContainer, MFn.kDagContainer),
+    "container": (MFn.kContainer,),
+    "objectSet": (MFn.kSet,),
+    "nurbsCurve": (MFn.kDagNode, MFn.kShape, MFn.kNurbsCurve),
+    "nurbsSurface": (MFn.kDagNode, MFn.kShape, MFn.kNurbsSurface),
+    "mesh": (MFn.kDagNode, MFn.kShape, MFn.kMesh),
+    "locator": (MFn.kDagNode, MFn.kShape, MFn.kLocator),
+}
+ATTRIBUTE_FN_TYPES = {
+    "numeric": MFn.kNumericAttribute,
+    "unit": MFn.kUnitAttribute,
+    "enum": MFn.kEnumAttribute,
+    "typed": MFn.kTypedAttribute,
+    "message": MFn.kMessageAttribute,
+    "matrix": MFn.kMatrixAttribute,
+    "compound": MFn.kCompoundAttribute,
+}
+
+
+class MFnNumericData:
+    kInvalidType = 0
+    kBoolean = 1
+    kByte = 2
+    kChar = 3
+    kShort = 4
+    k2Short = 5
+    k3Short = 6
+    kInt = 7
+    kLong = 7
+    k2Int = 8
+    k3Int = 9
+    kFloat = 10
+    k2Float = 11
+    k3Float = 12
+    kDouble = 13
+    k2Double = 14
+    k3Double = 15
+    k4Double = 16
+    kAddr = 17
+
+
+class MFnData:
+    kInvalid = 0
+    kNumeric = 1
+    kPlugin = 2
+    kPluginGeometry = 3
+    kString = 4
+    kMatrix = 5
+    kStringArray = 6
+    kDoubleArray = 7
+    kFloatArray = 8
+    kIntArray = 9
+    kPointArray = 10
+    kVectorArray = 11
+    kMatrixArray = 12
+    kComponentList = 13
+    kMesh = 14
+    kLattice = 15
+    kNurbsCurve = 16
+    kNurbsSurface = 17
+
+
+# numeric / unit / data type -> addAttr type name
+NUMERIC_TYPE_NAMES = {
+    MFnNumericData.kBoolean: "bool",
+    MFnNumericData.kByte: "byte",
+    MFnNumericData.kChar: "char",
+    MFnNumericData.kShort: "short",
+    MFnNumericData.kInt: "long",
+    MFnNumericData.kFloat: "float",
+    MFnNumericData.kDouble: "double",
+    MFnNumericData.k3Float: "float3",
+    MFnNumericData.k3Double: "double3",
+}
+DATA_TYPE_NAMES = {
+    MFnData.kString: "string",
+    MFnData.kMatrix: "matrix",
+    MFnData.kStringArray: "stringArray",
+    MFnData.kDoubleArray: "doubleArray",
+    MFnData.kIntArray: "Int32Array",
+    MFnData.kPointArray: "pointArray",
+    MFnData.kVectorArray: "vectorArray",
+    MFnData.kMesh: "mesh",
+    MFnData.kLattice: "lattice",
+    MFnData.kNurbsCurve: "nurbsCurve",
+    MFnData.kNurbsSurface: "nurbsSurface",
+}
+
+
+class MObject:
+
+    def __init__(self, item=None):
+        # item is a graph.Node, a graph.Attribute or None
+        self._item = item
+
+    def isNull(self):
+        if isinstance(self._item, _graph.Node):
+            return not self._item.alive
+        return self._item is None
+
+    def hasFn(self, fn_type):
+        item = self._item
+        if isinstance(item, _graph.Node):
+            if fn_type in (MFn.kBase, MFn.kNamedObject, MFn.kDependencyNode):
+                return True
+            if item.type.startswith("animCurve"):
+                return fn_type == MFn.kAnimCurve
+            if item.type.endswith("Constraint"):
+                return fn_type in (MFn.kConstraint, MFn.kDagNode, MFn.kTransform)
+            return fn_type in NODE_FN_TYPES.get(item.type, (MFn.kDagNode,) if item.is_dag else ())
+        if isinstance(item, _graph.Attribute):
+            return fn_type in (MFn.kAttribute, ATTRIBUTE_FN_TYPES.get(item.kind))
+        return False
+
+    def apiTypeStr(self):
+        return self._item.type if isinstance(self._item, _graph.Node) else "kInvalid"
+
+    def __eq__(self, other):
+        return isinstance(other, MObject) and self._item is other._item
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __hash__(self):
+        return id(self._item)
+
+
+MObject.kNullObj = MObject()
+
+
+def _node(obj):
+    if isinstance(obj, MDagPath):
+        return obj._node
+    if isinstance(obj, MObject):
+        return obj._item
+    if isinstance(obj, str):
+        return _graph.current().find(obj)
+    return obj
+
+
+class MObjectHandle:
+
+    def __init__(self, obj=None):
+        self._obj = obj if obj is not None else MObject()
+
+    def object(self):
+        return self._obj
+
+    def hashCode(self):
+        return id(self._obj._item)
+
+    def isValid(self):
+        return not self._obj.isNull()
+
+    def isAlive(self):
+        return not self._obj.isNull()
+
+    def __eq__(self, other):
+        return isinstance(other, MObjectHandle) and self._obj == other._obj
+
+    def __hash__(self):
+        return self.hashCode()
+
+
+class MDagPath:
+
+    def __init__(self, node=None):
+        if isinstance(node, MDagPath):
+            node = node._node
+        self._node = node
+
+    @staticmethod
+    def getAPathTo(obj):
+        node = _node(obj)
+        if not node.is_dag:
+            raise RuntimeError("(kInvalidParameter): Object is incompatible with this method")
+        return MDagPath(node)
+
+    def isValid(self):
+        return self._node is not None and self._node.alive
+
+    def node(self):
+        return MObject(self._node)
+
+    def transform(self):
+        node = self._node
+        if node.is_shape and node.parent is not None:
+            node = node.parent
+        return MObject(node)
+
+    def fullPathName(self):
+        return self._node.full_path()
+
+    def partialPathName(self):
+        return self._node.partial_path()
+
+    def length(self):
+        return self._node.full_path().count("|")
+
+    def childCount(self):
+        return len(self._node.children)
+
+    def child(self, index):
+        return MObject(self._node.children[index])
+
+    def pop(self, num=1):
+        for _ in range(num):
+            self._node = self._node.parent
+        return self
+
+    def extendToShape(self):
+        shapes = [x for x in self._node.children if x.is_shape]
+        if shapes:
+            self._node = shapes[0]
+        return self
+
+    def inclusiveMatrix(self):
+        return MMatrix(self._node.graph.world_matrix(self._node))
+
+    def inclusiveMatrixInverse(self):
+        return self.inclusiveMatrix().inverse()
+
+    def exclusiveMatrix(self):
+        parent = self._node.parent
+        return MMatrix(self._node.graph.world_matrix(parent)) if parent else MMatrix()
+
+    def exclusiveMatrixInverse(self):
+        return self.exclusiveMatrix().inverse()
+
+    def apiType(self):
+        return self._node.type
+
+    def hasFn(self, fn_type):
+        return MObject(self._node).hasFn(fn_type)
+
+    def __eq__(self, other):
+        return isinstance(other, MDagPath) and self._node is other._node
+
+    def __hash__(self):
+        return id(self._node)
+
+    def __str__(self):
+        return self.fullPathName()
+
+
+class MItDag:
+    kDepthFirst = 1
+    kBreadthFirst = 2
+
+    def __init__(self, traversalType=kDepthFirst, filterType=MFn.kInvalid):
+        self.reset(None, traversalType, filterType)
+
+    def reset(self, root=None, traversalType=kDepthFirst, filterType=MFn.kInvalid):
+        # the world when root is not given. its children are the first items
+        root_node = _node(root) if root is not None else None
+        if root_node is None:
+            self._items = [x for x in _graph.current().nodes.values() if x.is_dag and x.parent is None]
+        else:
+            self._items = [root_node]
+        self._traversal = traversalType
+        self._filter = filterType
+        self._current = None
+        self._advance()
+        return self
+
+    def _matches(self, node):
+        return self._filter == MFn.kInvalid or MObject(node).hasFn(self._filter)
+
+    def _advance(self, prune=False):
+        # children of the current item are queued unless pruned. non matching items are walked through
+        while True:
+            if self._current is not None and not prune:
+                children = list(self._current.children)
+                if self._traversal == MItDag.kDepthFirst:
+                    self._items[:0] = children
+                else:
+                    self._items.extend(children)
+            prune = False
+            if not self._items:
+                self._current = None
+                return
+            self._current = self._items.pop(0)
+            if self._matches(self._current):
+                return
+
+    def isDone(self):
+        return self._current is None
+
+    def next(self):
+        self._advance()
+        return self
+
+    def prune(self):
+        self._advance(prune=True)
+        return self
+
+    def currentItem(self):
+        return MObject(self._current)
+
+    def getPath(self):
+        return MDagPath(self._current)
+
+    def fullPathName(self):
+        return self._current.full_path()
+
+    def partialPathName(self):
+        return self._current.partial_path()
+
+    def depth(self):
+        return self._current.full_path().count("|")
+
+
+class MPlug:
+
+    def __init__(self, node=None, attr=None):
+        # node graph.Node, attr attribute path "name", "name[0]", "name[0].child"
+        if isinstance(node, MPlug):
+            node, attr = node._node, node._attr
+        elif isinstance(node, MObject):
+            node = node._item
+            if isinstance(attr, MObject):
+                attr = attr._item.long_name
+        self._node = node
+        self._attr = attr
+
+    @property
+    def isNull(self):
+        return self._node is None
+
+    def _graph(self):
+        return self._node.graph
+
+    def node(self):
+        return MObject(self._node)
+
+    def attribute(self):
+        return MObject(self._graph().attribute(self._node, _graph.strip_index(self._attr)))
+
+    def name(self):
+        return self._node.partial_path() + "." + self._attr
+
+    def partialName(self, includeNodeName=False, includeNonMandatoryIndices=False,
+                    includeInstancedIndices=False, useAlias=False, useFullAttributePath=False, useLongNames=False):
+        name = self._attr if useLongNames else self._graph().short_attr_name(self._node, self._attr)
+        if includeNodeName:
+            return self._node.partial_path() + "." + name
+        return name
+
+    def info(self):
+        return self.name()
+
+    @property
+    def isLocked(self):
+        return self._graph().is_locked(self._node, self._attr)
+
+    @isLocked.setter
+    def isLocked(self, value):
+        self._graph().set_flag(self._node, self._attr, "lock", bool(value))
+
+    @property
+    def isKeyable(self):
+        return self._graph().get_flag(self._node, self._attr, "keyable")
+
+    @isKeyable.setter
+    def isKeyable(self, value):
+        self._graph().set_flag(self._node, self._attr, "keyable", bool(value))
+
+    @property
+    def isChannelBox(self):
+        return self._graph().get_flag(self._node, self._attr, "channelBox")
+
+    @isChannelBox.setter
+    def isChannelBox(self, value):
+        self._graph().set_flag(self._node, self._attr, "channelBox", bool(value))
+
+    @property
+    def isCompound(self):
+        return bool(self._graph().children_attrs(self._node, self._attr))
+
+    def numChildren(self):
+        return len(self._graph().children_attrs(self._node, self._attr))
+
+    def child(self, index):
+        return MPlug(self._node, self._graph().children_attrs(self._node, self._attr)[index])
+
+    @property
+    def isArray(self):
+        attr = self._graph().attribute(self._node, _graph.strip_index(self._attr))
+        return bool(attr and attr.multi) and not self._attr.endswith("]")
+
+    @property
+    def isElement(self):
+        return self._attr.endswith("]")
+
+    @property
+    def isChild(self):
+        return not self._attr.endswith("]") and self._graph().parent_attr(self._node, self._attr) is not None
+
+    @property
+    def isConnected(self):
+        return bool(self._graph().connections_of(self._node, self._attr, True, True))
+
+    @property
+    def isDestination(self):
+        return bool(self._graph().connections_of(self._node, self._attr, True, False))
+
+    @property
+    def isSource(self):
+        return bool(self._graph().connections_of(self._node, self._attr, False, True))
+
+    def logicalIndex(self):
+        return int(self._attr.rsplit("[", 1)[1].rstrip("]"))
+
+    def getExistingArrayAttributeIndices(self):
+        return self._graph().element_indices(self._node, self._attr)
+
+    def numElements(self):
+        return len(self._graph().element_indices(self._node, self._attr))
+
+    def numConnectedElements(self):
+        indices = self._graph().element_indices(self._node, self._attr)
+        return len([i for i in indices
+                    if self._graph().connections_of(self._node, "{0}[{1}]".format(self._attr, i), True, True)])
+
+    def elementByLogicalIndex(self, index):
+        return MPlug(self._node, "{0}[{1}]".format(self._attr, index))
+
+    def elementByPhysicalIndex(self, index):
+        return self.elementByLogicalIndex(self._graph().element_indices(self._node, self._attr)[index])
+
+    def array(self):
+        return MPlug(self._node, self._attr.rsplit("[", 1)[0])
+
+    def parent(self):
+        return MPlug(self._node, self._graph().parent_attr(self._node, self._attr))
+
+    def source(self):
+        sources = self._graph().connections_of(self._node, self._attr, True, False)
+        if not sources:
+            return MPlug()
+        return MPlug(sources[0][0], sources[0][1])
+
+    def destinations(self):
+        return [MPlug(node, attr) for node, attr in self._graph().connections_of(self._node, self._attr, False, True)]
+
+    def connectedTo(self, asDst, asSrc):
+        return [MPlug(node, attr) for node, attr in self._graph().connections_of(self._node, self._attr, asDst, asSrc)]
+
+    def _value(self):
+        return self._graph().get_value(self._node, self._attr)
+
+    def asDouble(self):
+        return float(self._value() or 0)
+
+    asFloat = asDouble
+
+    def asInt(self):
+        return int(self._value() or 0)
+
+    asShort = asInt
+    asChar = asInt
+
+    def asBool(self):
+        return bool(self._value())
+
+    def asString(self):
+        value = self._value()
+        return "" if value is None else str(value)
+
+    def asMAngle(self):
+        return MAngle(self.asDouble(), MAngle.kDegrees)
+
+    def asMDistance(self):
+        return MDistance(self.asDouble())
+
+    def asMObject(self):
+        return MObject(_Data(self._value()))
+
+    def _set(self, value):
+        self._graph().set_value(self._node, self._attr, value)
+
+    def setDouble(self, value):
+        self._set(float(value))
+
+    setFloat = setDouble
+
+    def setInt(self, value):
+        self._set(int(value))
+
+    setShort = setInt
+
+    def setBool(self, value):
+        self._set(bool(value))
+
+    def setString(self, value):
+        self._set(str(value))
+
+    def setMAngle(self, value):
+        self._set(value.asDegrees())
+
+    def setMDistance(self, value):
+        self._set(value.value)
+
+    def __eq__(self, other):
+        return isinstance(other, MPlug) and self._node is other._node and self._attr == other._attr
+
+    def __hash__(self):
+        return hash((id(self._node), self._attr))
+
+    def __str__(self):
+        return self.name()
+
+
+class MPlugArray(list):
+    pass
+
+
+class MObjectArray(list):
+    pass
+
+
+class MDagPathArray(list):
+    pass
+
+
+class MDoubleArray(list):
+    pass
+
+
+class MIntArray(list):
+    pass
+
+
+class MPointArray(list):
+    pass
+
+
+class MVectorArray(list):
+    pass
+
+
+class MMatrixArray(list):
+    pass
+
+
+class MTimeArray(list):
+    pass
+
+
+class MStringArray(list):
+    pass
+
+
+class MSelectionList:
+
+    def __init__(self, other=None):
+        self._items = list(other._items) if isinstance(other, MSelectionList) else []
+
+    def add(self, item, mergeWithExisting=True):
+        if isinstance(item, str):
+            g = _graph.current()
+            if "." in item.split("|")[-1]:
+                node, attr = g.find_plug(item)
+                self._items.append(MPlug(node, attr))
+            else:
+                nodes = g.ls(item)
+                if not nodes:
+                    raise RuntimeError("(kInvalidParameter): Object does not exist")
+                self._items.extend(nodes)
+        elif isinstance(item, MObject):
+            self._items.append(item._item)
+        elif isinstance(item, MDagPath):
+            self._items.append(item._node)
+        elif isinstance(item, MPlug):
+            self._items.append(item)
+        return self
+
+    def length(self):
+        return len(self._items)
+
+    def isEmpty(self):
+        return not self._items
+
+    def clear(self):
+        self._items = []
+        return self
+
+    def _item_node(self, index):
+        item = self._items[index]
+        return item._node if isinstance(item, MPlug) else item
+
+    def getDependNode(self, index):
+        return MObject(self._item_node(index))
+
+    def getDagPath(self, index):
+        node = self._item_node(index)
+        if not node.is_dag:
+            raise TypeError("item is not a DAG path")
+        return MDagPath(node)
+
+    def getPlug(self, index):
+        item = self._items[index]
+        if not isinstance(item, MPlug):
+            raise TypeError("item is not a plug")
+        return item
+
+    def getSelectionStrings(self, index=None):
+        items = self._items if index is None else [self._items[index]]
+        return [x.name() if isinstance(x, MPlug) else x.partial_path() for x in items]
+
+
+class MGlobal:
+    kReplaceList = 0
+    kAddToList = 2
+
+    @staticmethod
+    def getSelectionListByName(name):
+        return MSelectionList().add(name)
+
+    @staticmethod
+    def getActiveSelectionList(orderedSelectionIfAvailable=False):
+        selection_list = MSelectionList()
+        for node in _graph.current().selection:
+            selection_list.add(MObject(node))
+        return selection_list
+
+    @staticmethod
+    def setActiveSelectionList(selection_list, listAdjustment=kReplaceList):
+        _graph.current().selection = [selection_list._item_node(i) for i in range(selection_list.length())]
+
+    @staticmethod
+    def displayInfo(message):
+        print(message)
+
+    @staticmethod
+    def displayWarning(message):
+        print("Warning: " + message)
+
+    @staticmethod
+    def displayError(message):
+        print("Error: " + message)
+
+    @staticmethod
+    def mayaState():
+        return 1
+
+
+class MFnBase:
+
+    def __init__(self, obj=None):
+        self._item = None
+        if obj is not None:
+            self.setObject(obj)
+
+    def setObject(self, obj):
+        self._item = _node(obj)
+        return self
+
+    def object(self):
+        return MObject(self._item)
+
+
+class MFnDependencyNode(MFnBase):
+
+    def name(self):
+        return self._item.name
+
+    def absoluteName(self):
+        return ":" + self._item.name
+
+    def setName(self, name):
+        return self._item.graph.rename(self._item, name)
+
+    @property
+    def typeName(self):
+        return self._item.type
+
+    @property
+    def isLocked(self):
+        return self._item.locked
+
+    def uuid(self):
+        return MUuid(self._item.uuid)
+
+    def hasAttribute(self, name):
+        return self._item.graph.has_attribute(self._item, name)
+
+    def _attribute_names(self):
+        graph = self._item.graph
+        return graph.static_attributes(self._item) + [x.long_name for x in self._item.attributes.values()]
+
+    def attributeCount(self):
+        return len(self._attribute_names())
+
+    def attribute(self, name):
+        if isinstance(name, int):
+            name = self._attribute_names()[name]
+        return MObject(self._item.graph.attribute(self._item, name))
+
+    def findPlug(self, attr, wantNetworkedPlug=True):
+        if isinstance(attr, MObject):
+            attr = attr._item.long_name
+        # static attributes of arbitrary node types are not known up front, any name resolves.
+        return MPlug(self._item, self._item.graph.long_attr_name(self._item, attr))
+
+    def getConnections(self):
+        return [MPlug(self._item, attr) for attr in self._item.graph.connected_attrs(self._item)]
+
+    def addAttribute(self, attr):
+        self._item.graph.add_attribute(self._item, attr._item)
+
+    def removeAttribute(self, attr):
+        self._item.graph.remove_attribute(self._item, attr._item.long_name)
+
+
+class MAnimCurveChange:
+    # key edits of MFnAnimCurve. [(curve node, keys before, keys after)]
+
+    def __init__(self):
+        self._edits = []
+
+    def undoIt(self):
+        for node, before, _ in reversed(self._edits):
+            node.data["keys"] = dict(before)
+            node.graph.dirty(node)
+
+    def redoIt(self):
+        for node, _, after in self._edits:
+            node.data["keys"] = dict(after)
+            node.graph.dirty(node)
+
+
+class MFnAnimCurve(MFnDependencyNode):
+    kAnimCurveTA = 0
+    kAnimCurveTL = 1
+    kAnimCurveTT = 2
+    kAnimCurveTU = 3
+    kAnimCurveUA = 4
+    kAnimCurveUL = 5
+    kAnimCurveUT = 6
+    kAnimCurveUU = 7
+    kAnimCurveUnknown = 8
+
+    kTangentGlobal = 0
+    kTangentFixed = 1
+    kTangentLinear = 2
+    kTangentFlat = 3
+    kTangentSmooth = 4
+    kTangentStep = 5
+    kTangentClamped = 8
+    kTangentAuto = 18
+
+    TYPE_NAMES = ["animCurveTA", "animCurveTL", "animCurveTT", "animCurveTU",
+                  "animCurveUA", "animCurveUL", "animCurveUT", "animCurveUU"]
+
+    def create(self, plug, animCurveType=None, modifier=None):
+        if animCurveType is None or animCurveType == self.kAnimCurveUnknown:
+            attr = plug.attribute()
+            animCurveType = self.kAnimCurveTU
+            if attr.hasFn(MFn.kUnitAttribute):
+                unit_type = MFnUnitAttribute(attr).unitType()
+                animCurveType = {MFnUnitAttribute.kAngle: self.kAnimCurveTA,
+                                 MFnUnitAttribute.kDistance: self.kAnimCurveTL,
+                                 MFnUnitAttribute.kTime: self.kAnimCurveTT}.get(unit_type, self.kAnimCurveTU)
+        node_type = self.TYPE_NAMES[animCurveType]
+        if modifier is None:
+            g = _graph.current()
+            node = g.create_node(node_type, name="{0}_{1}".format(plug._node.name, plug._attr))
+            g.connect(node, "output", plug._node, plug._attr)
+            obj = MObject(node)
+        else:
+            obj = modifier.createNode(node_type)
+            modifier.renameNode(obj, "{0}_{1}".format(plug._node.name, plug._attr))
+            modifier.connect(MPlug(obj, "output"), plug)
+        self.setObject(obj)
+        return obj
+
+    def animCurveType(self):
+        return self.TYPE_NAMES.index(self._item.type)
+
+    def numKeys(self):
+        return len(self._item.data.get("keys", {}))
+
+    def input(self, index):
+        return MTime(sorted(self._item.data.get("keys", {}))[index])
+
+    def value(self, index):
+        keys = self._item.data.get("keys", {})
+        value = keys[sorted(keys)[index]]
+        return math.radians(value) if self.animCurveType() in (self.kAnimCurveTA, self.kAnimCurveUA) else value
+
+    def addKeys(self, times, values, tangentInType=kTangentGlobal, tangentOutType=kTangentGlobal,
+                keepExistingKeys=False, change=None):
+        node = self._item
+        before = dict(node.data.get("keys", {}))
+        keys = dict(before) if keepExistingKeys else {}
+        # angles are radians like maya, the graph keeps degrees
+        angular = self.animCurveType() in (self.kAnimCurveTA, self.kAnimCurveUA)
+        for time, value in zip(times, values):
+            keys[float(time.value)] = math.degrees(value) if angular else float(value)
+        node.data["keys"] = keys
+        node.graph.dirty(node)
+        if change is not None:
+            change._edits.append((node, before, dict(keys)))
+
+
+class _Data:
+    # typed attribute value behind MPlug.asMObject. MFn*Data reads it
+
+    def __init__(self, value):
+        self.value = value
+
+
+class MFnMatrixData(MFnBase):
+
+    def matrix(self):
+        return MMatrix(self._item.value) if self._item.value is not None else MMatrix()
+
+    def create(self, matrix):
+        self._item = _Data(list(MMatrix(matrix).values))
+        return MObject(self._item)
+
+
+class MFnDagNode(MFnDependencyNode):
+
+    def setObject(self, obj):
+        super(MFnDagNode, self).setObject(obj)
+        if not self._item.is_dag:
+            raise RuntimeError("(kInvalidParameter): Object is incompatible with this method")
+        return self
+
+    def fullPathName(self):
+        return self._item.full_path()
+
+    def partialPathName(self):
+        return self._item.partial_path()
+
+    def getPath(self):
+        return MDagPath(self._item)
+
+    def dagPath(self):
+        return MDagPath(self._item)
+
+    def parentCount(self):
+        return 1 if self._item.parent else 0
+
+    def parent(self, index=0):
+        return MObject(self._item.parent)
+
+    def childCount(self):
+        return len(self._item.children)
+
+    def child(self, index):
+        return MObject(self._item.children[index])
+
+    def transformationMatrix(self):
+        return MMatrix(self._item.graph.local_matrix(self._item))
+
+
+class MFnTransform(MFnDagNode):
+
+    def translation(self, space=MSpace.kTransform):
+        if space == MSpace.kWorld:
+            return MVector(self._item.graph.world_matrix(self._item)[12:15])
+        return MVector(self._item.graph.get_value(self._item, "translate"))
+
+    def setTranslation(self, vector, space=MSpace.kTransform):
+        self._item.graph.set_value(self._item, "translate", tuple(MVector(vector)))
+
+
+class MFnNurbsCurve(MFnDagNode):
+    kInvalid = 0
+    kOpen = 1
+    kClosed = 2
+    kPeriodic = 3
+
+    def setObject(self, obj):
+        node = _node(obj)
+        if node.type != "nurbsCurve":
+            shapes = [x for x in node.children if x.type == "nurbsCurve"]
+            if not shapes:
+                raise RuntimeError("(kInvalidParameter): Object is incompatible with this method")
+            node = shapes[0]
+        self._item = node
+        return self
+
+    def _curve(self):
+        return self._item.data.setdefault("curve", {"points": [], "knots": [], "degree": 1, "form": 1})
+
+    @property
+    def degree(self):
+        return self._curve()["degree"]
+
+    @property
+    def form(self):
+        return self._curve()["form"]
+
+    @property
+    def numCVs(self):
+        return len(self._curve()["points"])
+
+    @property
+    def numSpans(self):
+        curve = self._curve()
+        if curve["form"] == self.kPeriodic:
+            return len(curve["points"]) - curve["degree"]
+        return len(curve["points"]) - curve["degree"]
+
+    @property
+    def numKnots(self):
+        return len(self._curve()["knots"])
+
+    def knots(self):
+        return MDoubleArray(self._curve()["knots"])
+
+    def cvPositions(self, space=MSpace.kObject):
+        points = [MPoint(p) for p in self._curve()["points"]]
+        if space == MSpace.kWorld:
+            m = MMatrix(self._item.graph.world_matrix(self._item))
+            points = [p * m for p in points]
+        return MPointArray(points)
+
+    def cvPosition(self, index, space=MSpace.kObject):
+        return self.cvPositions(space)[index]
+
+    def setCVPositions(self, points, space=MSpace.kObject):
+        self._curve()["points"] = [tuple(MPoint(p))[:3] for p in points]
+        self._item.graph.dirty(self._item)
+
+    def length(self, tolerance=1e-3):
+        points = [MVector(p[:3]) for p in self._curve()["points"]]
+        return sum((b - a).length() for a, b in zip(points, points[1:]))
+
+    def create(self, cvs, knots, degree, form, is2D=False, rational=False, parent=MObject.kNullObj):
+        g = _graph.current()
+        parent_node = _node(parent) if parent is not None and not parent.isNull() else None
+        shape = g.create_node("nurbsCurve", parent=parent_node)
+        shape.data["curve"] = {"points": [tuple(MPoint(p))[:3] for p in cvs],
+                               "knots": list(knots),
+                               "degree": degree,
+                               "form": form}
+        self._item = shape
+        return MObject(shape if parent_node else shape.parent)
+
+
+class MFnAttribute(MFnBase):
+
+    def _attr(self):
+        return self._item
+
+    @property
+    def name(self):
+        return self._item.long_name
+
+    @property
+    def shortName(self):
+        return self._item.short_name
+
+    def _flag(name):
+        def getter(self):
+            return getattr(self._item, name)
+
+        def setter(self, value):
+            setattr(self._item, name, value)
+
+        return property(getter, setter)
+
+    keyable = _flag("keyable")
+    channelBox = _flag("channel_box")
+    array = _flag("multi")
+    hidden = _flag("hidden")
+    storable = _flag("storable")
+    readable = _flag("readable")
+    writable = _flag("writable")
+    connectable = _flag("connectable")
+    usedAsColor = _flag("used_as_color")
+    del _flag
+
+    def setNiceNameOverride(self, name):
+        self._item.nice_name = name
+
+    def _create(self, long_name, short_name, kind, type_name, default=None):
+        self._item = _graph.Attribute(long_name, short_name, kind, type_name, default)
+        return MObject(self._item)
+
+
+class MFnNumericAttribute(MFnAttribute):
+
+    def create(self, long_name, short_name, numeric_type, default=0, *args):
+        if isinstance(numeric_type, MObject):
+            # numeric compound of 2 or 3 children. float3, double3...
+            children = [x._item for x in (numeric_type, default) + args if isinstance(x, MObject) and not x.isNull()]
+            attr = self._create(long_name, short_name, "compound", children[0].type + str(len(children)))
+            for child in children:
+                child.parent = self._item
+                self._item.children.append(child)
+            return attr
+        return self._create(long_name, short_name, "numeric", NUMERIC_TYPE_NAMES.get(numeric_type, "double"),
+                            default)
+
+    def numericType(self):
+        for key, value in NUMERIC_TYPE_NAMES.items():
+            if value == self._item.type:
+                return key
+        return MFnNumericData.kDouble
+
+    def setMin(self, value):
+        self._item.min = value
+
+    def setMax(self, value):
+        self._item.max = value
+
+    def setSoftMin(self, value):
+        self._item.soft_min = value
+
+    def setSoftMax(self, value):
+        self._item.soft_max = value
+
+    @property
+    def default(self):
+        return self._item.default
+
+    @default.setter
+    def default(self, value):
+        self._item.default = value
+
+
+class MFnUnitAttribute(MFnNumericAttribute):
+    kInvalid = 0
+    kAngle = 1
+    kDistance = 2
+    kTime = 3
+
+    def create(self, long_name, short_name, unit_type, default=0):
+        type_name = {self.kAngle: "doubleAngle", self.kDistance: "doubleLinear", self.kTime: "time"}[unit_type]
+        return self._create(long_name, short_name, "unit", type_name, default)
+
+    def unitType(self):
+        return {"doubleAngle": self.kAngle, "doubleLinear": self.kDistance, "time": self.kTime}.get(
+            self._item.type, self.kInvalid)
+
+
+class MFnEnumAttribute(MFnAttribute):
+
+    def create(self, long_name, short_name, default=0):
+        attr = self._create(long_name, short_name, "enum", "enum", default)
+        self._item.enum_names = []
+        return attr
+
+    def addField(self, name, index):
+        self._item.enum_names.append((name, index))
+
+    def fieldName(self, index):
+        return dict((i, n) for n, i in self._item.enum_names)[index]
+
+    def fieldValue(self, name):
+        return dict(self._item.enum_names)[name]
+
+
+class MFnMessageAttribute(MFnAttribute):
+
+    def create(self, long_name, short_name):
+        return self._create(long_name, short_name, "message", "message")
+
+
+class MFnTypedAttribute(MFnAttribute):
+
+    def create(self, long_name, short_name, data_type, default=None):
+        return self._create(long_name, short_name, "typed", DATA_TYPE_NAMES.get(data_type, "string"), default)
+
+
+class MFnMatrixAttribute(MFnAttribute):
+    kFloat = 0
+    kDouble = 1
+
+    def create(self, long_name, short_name, matrix_type=kDouble):
+        return self._create(long_name, short_name, "matrix", "matrix")
+
+
+class MFnCompoundAttribute(MFnAttribute):
+
+    def create(self, long_name, short_name):
+        return self._create(long_name, short_name, "compound", "compound")
+
+    def addChild(self, attr):
+        self._item.children.append(attr._item)
+
+
+class MDGModifier:
+
+    def __init__(self):
+        # [(do, undo)]. doIt after undoIt redoes them
+        self._operations = []
+        self._done = 0
+
+    def _queue(self, do, undo=None):
+        self._operations.append((do, undo))
+        return self
+
+    def createNode(self, node_type):
+        node = _graph.current().create_node(node_type, defer=True)
+        self._queue(lambda: node.graph.insert(node), lambda: node.graph.delete(node))
+        return MObject(node)
+
+    def renameNode(self, obj, name):
+        node = _node(obj)
+        old_name = node.name
+        return self._queue(lambda: node.graph.rename(node, name), lambda: node.graph.rename(node, old_name))
+
+    def deleteNode(self, obj):
+        node = _node(obj)
+        return self._queue(lambda: node.graph.delete(node))
+
+    def addAttribute(self, obj, attr):
+        node = _node(obj)
+        return self._queue(lambda: node.graph.add_attribute(node, attr._item),
+                           lambda: node.graph.remove_attribute(node, attr._item.long_name))
+
+    def removeAttribute(self, obj, attr):
+        node = _node(obj)
+        return self._queue(lambda: node.graph.remove_attribute(node, attr._item.long_name))
+
+    def _set_value(self, plug, value):
+        node, attr = plug._node, plug._attr
+        old_value = []
+
+        def do():
+            old_value[:] = [node.graph.get_value(node, attr)]
+            node.graph.set_value(node, attr, value)
+
+        return self._queue(do, lambda: node.graph.set_value(node, attr, old_value[0]))
+
+    def newPlugValue(self, plug, value):
+        if isinstance(value, MObject) and isinstance(value._item, _Data):
+            value = value._item.value
+        return self._set_value(plug, value)
+
+    def newPlugValueBool(self, plug, value):
+        return self._set_value(plug, bool(value))
+
+    def newPlugValueInt(self, plug, value):
+        return self._set_value(plug, int(value))
+
+    newPlugValueShort = newPlugValueInt
+    newPlugValueChar = newPlugValueInt
+
+    def newPlugValueDouble(self, plug, value):
+        return self._set_value(plug, float(value))
+
+    newPlugValueFloat = newPlugValueDouble
+
+    def newPlugValueString(self, plug, value):
+        return self._set_value(plug, str(value))
+
+    def newPlugValueMAngle(self, plug, value):
+        return self._set_value(plug, value.asDegrees())
+
+    def newPlugValueMDistance(self, plug, value):
+        return self._set_value(plug, value.value)
+
+    def connect(self, *args):
+        if len(args) == 4:
+            source = MPlug(args[0], args[1])
+            destination = MPlug(args[2], args[3])
+        else:
+            source, destination = args
+        g = _graph.current()
+        return self._queue(lambda: g.connect(source._node, source._attr, destination._node, destination._attr),
+                           lambda: g.disconnect(source._node, source._attr, destination._node, destination._attr))
+
+    def disconnect(self, *args):
+        if len(args) == 4:
+            source = MPlug(args[0], args[1])
+            destination = MPlug(args[2], args[3])
+        else:
+            source, destination = args
+        g = _graph.current()
+        return self._queue(lambda: g.disconnect(source._node, source._attr, destination._node, destination._attr),
+                           lambda: g.connect(source._node, source._attr, destination._node, destination._attr))
+
+    def commandToExecute(self, command):
+        return self
+
+    def doIt(self):
+        operations = self._operations[self._done:]
+        self._done = len(self._operations)
+        for do, _ in operations:
+            do()
+        return self
+
+    def undoIt(self):
+        for _, undo in reversed(self._operations[:self._done]):
+            if undo is not None:
+                undo()
+        self._done = 0
+        return self
+
+
+class MDagModifier(MDGModifier):
+
+    def createNode(self, node_type, parent=MObject.kNullObj):
+        parent_node = _node(parent) if parent is not None and not parent.isNull() else None
+        node = _graph.current().create_node(node_type, parent=parent_node, defer=True)
+        self._queue(lambda: node.graph.insert(node), lambda: node.graph.delete(node))
+        return MObject(node)
+
+    def reparentNode(self, obj, parent=MObject.kNullObj):
+        node = _node(obj)
+        parent_node = _node(parent) if parent is not None and not parent.isNull() else None
+        return self._queue(lambda: node.graph.reparent(node, parent_node, relative=True))
+
+
+class MMessage:
+
+    @staticmethod
+    def removeCallback(callback_id):
+        _graph.current().remove_callback(callback_id)
+
+    @staticmethod
+    def removeCallbacks(callback_ids):
+        for callback_id in callback_ids:
+            _graph.current().remove_callback(callback_id)
+
+
+class MDGMessage(MMessage):
+
+    @staticmethod
+    def addNodeAddedCallback(function, nodeType="dependNode", clientData=None):
+        return _graph.current().add_callback("node_added", function, nodeType, clientData)
+
+    @staticmethod
+    def addNodeRemovedCallback(function, nodeType="dependNode", clientData=None):
+        return _graph.current().add_callback("node_removed", function, nodeType, clientData)
+
+
+class MSceneMessage(MMessage):
+    kSceneUpdate = 0
+    kBeforeNew = 1
+    kAfterNew = 2
+    kBeforeImport = 3
+    kAfterImport = 4
+    kBeforeOpen = 5
+    kAfterOpen = 6
+    kAfterRemoveReference = 34
+    kAfterUnloadReference = 38
+
+    @staticmethod
+    def addCallback(message, function, clientData=None):
+        return _graph.current().add_callback("scene", function, message, clientData)
+
+
+class MNodeMessage(MMessage):
+    kConnectionMade = 0x01
+    kConnectionBroken = 0x02
+    kAttributeSet = 0x08
+    kAttributeAdded = 0x40
+
+    @staticmethod
+    def addAttributeChangedCallback(node, function, clientData=None):
+        return _graph.current().add_callback("attribute_changed", function, _node(node), clientData)
+
+    @staticmethod
+    def addNameChangedCallback(node, function, clientData=None):
+        return _graph.current().add_callback("name_changed", function, _node(node), clientData)
+
+
+class MEventMessage(MMessage):
+
+    @staticmethod
+    def addEventCallback(event, function, clientData=None):
+        return _graph.current().add_callback("event", function, event, clientData)
+
+
+class MPxCommand:
+
+    def __init__(self):
+        pass
+
+    def isUndoable(self):
+        return False
+
+
+class MArgList(list):
+    pass
+
+
+class MFnPlugin(MFnBase):
+
+    def __init__(self, obj=None, vendor="", version="", apiVersion="Any"):
+        self._plugin = obj
+
+    def registerCommand(self, name, creator, syntax=None):
+        _graph.register_command(name, creator)
+
+    def deregisterCommand(self, name):
+        _graph.deregister_command(name)
+
+
+def maya_useNewAPI():
+    pass
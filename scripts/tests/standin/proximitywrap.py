@@ -0,0 +1,16 @@
+# standin
+from standin import graph as _graph
+
+# Stand-in for maya.internal.nodes.proximitywrap.node_interface.
+
+
+class NodeInterface:
+
+    def __init__(self, node):
+        self.node = node
+
+    def addDriver(self, driver):
+        g = _graph.current()
+        node = g.find(self.node)
+        index = len(g.element_indices(node, "drivers"))
+        g.connect(g.find(driver), "worldMesh[0]", node, "drivers[{0}].driverGeometry".format(index))
@@ -0,0 +1,149 @@
+# standin
+from standin import cmds as _cmds
+
+# Stand-in for the part of pymel.core that lib.animation.fcurve uses.
+# nodes and plugs are thin name wrappers over the stand-in cmds.
+
+
+class PyNode:
+
+    def __init__(self, name):
+        self._name = str(name)
+
+    def __str__(self):
+        return self._name
+
+    def __repr__(self):
+        return "{0}('{1}')".format(type(self).__name__, self._name)
+
+    def __add__(self, other):
+        return str(self) + str(other)
+
+    def __radd__(self, other):
+        return str(other) + str(self)
+
+    def __eq__(self, other):
+        return str(self) == str(other)
+
+    def __hash__(self):
+        return hash(self._name)
+
+    def __new__(cls, name=None):
+        if cls is PyNode and name is not None and "." in str(name).split("|")[-1]:
+            return object.__new__(Attribute)
+        return object.__new__(cls)
+
+    def name(self):
+        return self._name
+
+    def nodeName(self):
+        return self._name.split(".")[0].split("|")[-1]
+
+    def node(self):
+        return PyNode(self._name.split(".")[0])
+
+    def attr(self, name):
+        return Attribute("{0}.{1}".format(self._name, name))
+
+
+class Attribute(PyNode):
+
+    def __getitem__(self, index):
+        return Attribute("{0}[{1}]".format(self._name, index))
+
+    def index(self):
+        return int(self._name.rsplit("[", 1)[1].rstrip("]"))
+
+    def numConnectedElements(self):
+        node, attr = _cmds._plug(self._name)
+        return len([i for i in node.graph.element_indices(node, attr)
+                    if (node, "{0}[{1}]".format(attr, i)) in node.graph.inputs])
+
+    def outputs(self, plugs=False):
+        return listConnections(self, source=False, destination=True, plugs=plugs)
+
+    def inputs(self, plugs=False):
+        return listConnections(self, source=True, destination=False, plugs=plugs)
+
+    def get(self):
+        return getAttr(self)
+
+    def set(self, *args, **kwargs):
+        return setAttr(self, *args, **kwargs)
+
+
+class _NodeTypes:
+
+    def __getattr__(self, name):
+        node_type = name[0].lower() + name[1:]
+        return type(name, (PyNode,), {"node_type": node_type})
+
+
+class _DataTypes:
+    pass
+
+
+nodetypes = _NodeTypes()
+datatypes = _DataTypes()
+
+
+def _wrap(result):
+    if result is None:
+        return []
+    if isinstance(result, list):
+        return [PyNode(x) for x in result]
+    return PyNode(result)
+
+
+def createNode(node_type, **kwargs):
+    return PyNode(_cmds.createNode(node_type, **kwargs))
+
+
+def listConnections(*args, **kwargs):
+    return _wrap(_cmds.listConnections(*[str(x) for x in args], **kwargs))
+
+
+def connectAttr(source, destination, **kwargs):
+    return _cmds.connectAttr(str(source), str(destination), **kwargs)
+
+
+def disconnectAttr(source, destination=None, **kwargs):
+    return _cmds.disconnectAttr(str(source), str(destination) if destination is not None else None, **kwargs)
+
+
+def nodeType(node, **kwargs):
+    return _cmds.nodeType(str(node), **kwargs)
+
+
+def getAttr(plug, **kwargs):
+    return _cmds.getAttr(str(plug), **kwargs)
+
+
+def setAttr(plug, *args, **kwargs):
+    return _cmds.setAttr(str(plug), *args, **kwargs)
+
+
+def setKeyframe(*args, **kwargs):
+    kwargs.pop("edit", None)
+    return _cmds.setKeyframe(*[str(x) for x in args], **kwargs)
+
+
+def keyframe(*args, **kwargs):
+    return _cmds.keyframe(*[str(x) for x in args], **kwargs)
+
+
+def keyTangent(*args, **kwargs):
+    if kwargs.get("query"):
+        count = _cmds.keyframe(*[str(x) for x in args], query=True, keyframeCount=True) or 0
+        if kwargs.get("weightedTangents"):
+            return [False]
+        if kwargs.get("inTangentType") or kwargs.get("outTangentType"):
+            return ["linear"] * count
+        if kwargs.get("lock"):
+            return [True] * count
+        return [0.0] * count
+    return None
+
+
+def __getattr__(name):
+    return getattr(_cmds, name)
@@ -0,0 +1,46 @@
+# built-ins
+import os
+
+# standin
+import standin
+
+standin.install()
+os.environ.setdefault("DOMINO_DEFAULT_COMPONENT", "domino.assembler.component")
+
+from maya import cmds as mc  # noqa: E402
+from domino import assembler  # noqa: E402
+from domino.lib.animation import pose  # noqa: E402
+
+
+def test_unchanged_channel_without_neutral_keeps_its_value():
+    library = pose.PoseLibrary()
+    library.add_pose("a", {"c": {"tx": 0.0, "ty": 2.0}})
+    library.set_neutral({"c": {"tx": 5.0, "ty": 1.0}})
+    assert library.pose_data("a") == {"c": {"tx": 0.0, "ty": 2.0}}
+
+
+def test_unchanged_channel_without_neutral_survives_a_roundtrip():
+    library = pose.PoseLibrary()
+    library.add_pose("a", {"c": {"tx": 0.0, "ty": 2.0}})
+    library = pose.PoseLibrary.loads(library.dumps())
+    library.set_neutral({"c": {"tx": 5.0, "ty": 1.0}})
+    assert library.pose_data("a") == {"c": {"tx": 0.0, "ty": 2.0}}
+
+
+def _assembly_root():
+    rig = [x for x in mc.ls(type="transform") if mc.attributeQuery("is_rig", node=x, exists=True)][0]
+    return mc.listConnections(rig + ".assembly_node", source=False, destination=True)[0]
+
+
+def test_legacy_poses_survive_extract_and_rebuild():
+    data = dict(assembler.import_component_module("assembly").component_preset(), __children=[])
+    data["json"]["pose_json"] = {"neutral": {}, "smile": {"origin_ctl": {"tx": 1.0}}}
+    with standin.patch():
+        assembler.create_rig(data=data)
+        component = assembler.convert_node_to_component(assembler.get_rig_hierarchy(_assembly_root()))
+        data = assembler.convert_component_to_data(component)
+    with standin.patch():
+        assembler.create_rig(data=data)
+        library = pose.get_library(_assembly_root())
+    assert library.names() == ["neutral", "smile"]
+    assert library.pose_data("smile")["origin_ctl"]["tx"] == 1.0